@@ -1,16 +1,16 @@
+import re
 import pydantic
 import bittensor as bt
 import typing
 import json
 import asyncio
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, ClassVar, Tuple
 from starlette.responses import StreamingResponse
 from pydantic import BaseModel
 from enum import Enum
 from aiohttp import ClientResponse
 import traceback
-from datura.services.twitter_utils import TwitterUtils
-from datura.services.web_search_utils import WebSearchUtils
+from datura.services.link_extraction import extract_links
 import traceback
 from datura.synapse import Synapse, StreamingSynapse
 
@@ -119,6 +119,25 @@ class Model(str, Enum):
     HORIZON = "HORIZON"
 
 
+class StreamLimits(BaseModel):
+    """Limits that bound the memory a single miner stream can take on the validator."""
+
+    max_stream_bytes: int = 8 * 1024 * 1024
+    max_event_bytes: int = 2 * 1024 * 1024
+    max_chunks_per_role: int = 10000
+    max_items_per_event: int = 200
+
+
+SEARCH_EVENT_FIELDS = {
+    "search": "search_results",
+    "wikipedia_search": "wikipedia_search_results",
+    "youtube_search": "youtube_search_results",
+    "arxiv_search": "arxiv_search_results",
+    "reddit_search": "reddit_search_results",
+    "hacker_news_search": "hacker_news_search_results",
+}
+
+
 class ScraperStreamingSynapse(StreamingSynapse):
     prompt: str = pydantic.Field(
         ...,
@@ -256,15 +275,141 @@ class ScraperStreamingSynapse(StreamingSynapse):
         description="A boolean flag to indicate if the prompt is synthetic.",
     )
 
+    is_stream_truncated: Optional[bool] = pydantic.Field(
+        False,
+        title="Is Stream Truncated",
+        description="A boolean flag set by the validator when the miner stream exceeded the stream limits.",
+    )
+
+    # Limits applied by the validator while parsing the miner stream
+    stream_limits: ClassVar[StreamLimits] = StreamLimits()
+
+    # Number of truncated streams since the validator started, used for monitoring
+    truncated_streams_count: ClassVar[int] = 0
+
+    # Counts tokens of text chunks while they are streamed, None disables incremental counting
+    token_counter: ClassVar[Optional[typing.Callable[[str], int]]] = None
+
+    # Joined text per role with the number of chunks it was built from
+    _texts_cache: Dict[str, Tuple[int, str]] = pydantic.PrivateAttr(
+        default_factory=dict
+    )
+
+    # Completions and links derived from texts, keyed by the text chunks version
+    _derived_cache: Dict[str, Tuple[Any, Any]] = pydantic.PrivateAttr(
+        default_factory=dict
+    )
+
+    # Token counts of text chunks per role, filled while streaming when token_counter is set
+    _chunk_token_counts: Dict[str, List[int]] = pydantic.PrivateAttr(
+        default_factory=dict
+    )
+
+    # Share of the usual verification sample that was checked, per reward model
+    _verification_sample_ratios: Dict[str, float] = pydantic.PrivateAttr(
+        default_factory=dict
+    )
+
+    # Links picked for verification, per reward model
+    _verification_samples: Dict[str, List[str]] = pydantic.PrivateAttr(
+        default_factory=dict
+    )
+
+    # Analysis of the final response shared by reward and penalty models
+    _response_analysis: Any = pydantic.PrivateAttr(default=None)
+
     @property
     def texts(self) -> Dict[str, str]:
-        """Returns a dictionary of texts, containing a role (twitter summary, search summary, reddit summary, hacker news summary, final summary) and content."""
-        texts = {}
+        """Returns a dictionary of texts, containing a role (twitter summary, search summary, reddit summary, hacker news summary, final summary) and content.
+        Only roles that received new chunks since the last access are joined again.
+        """
+        texts_cache = {}
+
+        for key, chunks in self.text_chunks.items():
+            cached = self._texts_cache.get(key)
+
+            if cached is not None and cached[0] == len(chunks):
+                texts_cache[key] = cached
+            else:
+                texts_cache[key] = (len(chunks), "".join(chunks))
+
+        self._texts_cache = texts_cache
+
+        return {key: text for key, (_, text) in texts_cache.items()}
+
+    def get_text_chunks_version(self) -> Tuple:
+        """Returns a cheap fingerprint of text chunks that changes whenever new chunks land."""
+        return tuple((key, len(chunks)) for key, chunks in self.text_chunks.items())
+
+    def get_cached(self, name: str, compute: typing.Callable[[], Any]) -> Any:
+        """Memoizes a value derived from texts until new chunks land or tools change."""
+        version = (self.get_text_chunks_version(), tuple(self.tools or []))
+        cached = self._derived_cache.get(name)
 
-        for key in self.text_chunks:
-            texts[key] = "".join(self.text_chunks[key])
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
-        return texts
+        value = compute()
+        self.set_cached(name, value)
+
+        return value
+
+    def set_cached(self, name: str, value: Any) -> None:
+        """Stores a derived value for the current texts, replacing any previous one."""
+        version = (self.get_text_chunks_version(), tuple(self.tools or []))
+        self._derived_cache = {**self._derived_cache, name: (version, value)}
+
+    def clear_cached(self) -> None:
+        """Drops joined texts, derived values and the response analysis.
+        Called once the final synapse is assigned, as fields and chunks may have changed in place.
+        """
+        self._texts_cache = {}
+        self._derived_cache = {}
+        self._response_analysis = None
+
+    def get_response_analysis(self) -> Any:
+        return self._response_analysis
+
+    def set_response_analysis(self, analysis: Any) -> None:
+        self._response_analysis = analysis
+
+    def get_chunk_token_counts(self) -> Optional[Tuple[int, ...]]:
+        """Returns token counts of all text chunks counted while streaming, None if any chunk was not counted."""
+        token_counts = []
+
+        for role, chunks in self.text_chunks.items():
+            role_token_counts = self._chunk_token_counts.get(role, [])
+
+            if len(role_token_counts) != len(chunks):
+                return None
+
+            token_counts.extend(role_token_counts)
+
+        return tuple(token_counts)
+
+    def count_chunk_tokens(self, role: str, chunk: Optional[str]) -> None:
+        try:
+            token_count = ScraperStreamingSynapse.token_counter(chunk) if chunk else 0
+        except Exception:
+            # Role stays incomplete and its chunks are counted again after the stream
+            return
+
+        self._chunk_token_counts.setdefault(role, []).append(token_count)
+
+    def get_verification_sample_ratio(self, name: str) -> float:
+        return self._verification_sample_ratios.get(name, 1.0)
+
+    def set_verification_sample_ratio(self, name: str, ratio: float) -> None:
+        self._verification_sample_ratios = {
+            **self._verification_sample_ratios,
+            name: ratio,
+        }
+
+    def get_verification_sample(self, name: str) -> Optional[List[str]]:
+        return self._verification_samples.get(name)
+
+    def set_verification_sample(self, name: str, links: List[str]) -> None:
+        self._verification_samples = {**self._verification_samples, name: links}
 
     response_order: Optional[str] = pydantic.Field(
         "",
@@ -294,11 +439,20 @@ class ScraperStreamingSynapse(StreamingSynapse):
         self.tweets = data
 
     def get_twitter_completion(self) -> Optional[str]:
+        return self.get_cached("twitter_completion", self.compute_twitter_completion)
+
+    def compute_twitter_completion(self) -> Optional[str]:
         return self.texts.get(ScraperTextRole.TWITTER_SUMMARY.value, "")
 
     def get_search_completion(self) -> Dict[str, str]:
         """Gets the search completion text from the texts dictionary based on tools used."""
+        completions, links_expected = self.get_cached(
+            "search_completion", self.compute_search_completion
+        )
+
+        return dict(completions), links_expected
 
+    def compute_search_completion(self) -> Dict[str, str]:
         completions = {}
 
         if any(
@@ -333,6 +487,9 @@ class ScraperStreamingSynapse(StreamingSynapse):
         return completions, links_expected
 
     def get_all_completions(self) -> Dict[str, str]:
+        return dict(self.get_cached("all_completions", self.compute_all_completions))
+
+    def compute_all_completions(self) -> Dict[str, str]:
         completions, _ = self.get_search_completion()
 
         if "Twitter Search" in self.tools:
@@ -349,56 +506,103 @@ class ScraperStreamingSynapse(StreamingSynapse):
         Otherwise search summary will only look for Wikipedia, ArXiv, Youtube links.
         Returns list of all links and links per each summary role.
         """
+        all_links, links_per_summary = self.get_cached(
+            "search_links", self.compute_search_links
+        )
 
+        return list(all_links), {
+            key: list(links) for key, links in links_per_summary.items()
+        }
+
+    def compute_search_links(self) -> Tuple[List[str], Dict[str, List[str]]]:
         completions, _ = self.get_search_completion()
         all_links = []
         links_per_summary = {}
 
         for key, value in completions.items():
+            extracted_links = extract_links(value)
             links = []
 
             if key == ScraperTextRole.REDDIT_SUMMARY.value:
-                links.extend(WebSearchUtils.find_links_by_domain(value, "reddit.com"))
+                links.extend(extracted_links.links_by_domain("reddit.com"))
             elif key == ScraperTextRole.HACKER_NEWS_SUMMARY.value:
-                links.extend(
-                    WebSearchUtils.find_links_by_domain(value, "news.ycombinator.com")
-                )
+                links.extend(extracted_links.links_by_domain("news.ycombinator.com"))
             elif key == ScraperTextRole.SEARCH_SUMMARY.value:
                 if any(tool in self.tools for tool in ["Web Search"]):
-                    links.extend(WebSearchUtils.find_links(value))
+                    links.extend(extracted_links.links)
                 else:
                     if "Wikipedia Search" in self.tools:
-                        links.extend(
-                            WebSearchUtils.find_links_by_domain(value, "wikipedia.org")
-                        )
+                        links.extend(extracted_links.links_by_domain("wikipedia.org"))
                     if "ArXiv Search" in self.tools:
-                        links.extend(
-                            WebSearchUtils.find_links_by_domain(value, "arxiv.org")
-                        )
+                        links.extend(extracted_links.links_by_domain("arxiv.org"))
                     if "Youtube Search" in self.tools:
-                        links.extend(
-                            WebSearchUtils.find_links_by_domain(value, "youtube.com")
-                        )
+                        links.extend(extracted_links.links_by_domain("youtube.com"))
 
             all_links.extend(links)
             links_per_summary[key] = links
 
         return all_links, links_per_summary
 
+    def mark_stream_truncated(self, reason: str):
+        """Marks the stream as truncated and counts it for monitoring."""
+        if self.is_stream_truncated:
+            return
+
+        self.is_stream_truncated = True
+        ScraperStreamingSynapse.truncated_streams_count += 1
+
+        bt.logging.debug(
+            f"Stream truncated for hotkey: {self.axon.hotkey}, reason: {reason}"
+        )
+
+    def limit_event_items(self, content_type: str, content: Any):
+        """Caps the number of tweets or search results kept from a single event."""
+        max_items = self.stream_limits.max_items_per_event
+        is_limited = False
+
+        if isinstance(content, list) and len(content) > max_items:
+            content = content[:max_items]
+            is_limited = True
+        elif isinstance(content, dict):
+            for key, value in content.items():
+                if isinstance(value, list) and len(value) > max_items:
+                    content[key] = value[:max_items]
+                    is_limited = True
+
+        if is_limited:
+            self.mark_stream_truncated(
+                f"{content_type} event exceeded {max_items} items"
+            )
+
+        return content
+
     async def process_streaming_response(self, response: StreamingResponse):
         if self.completion is None:
             self.completion = ""
 
-        buffer = ""  # Initialize an empty buffer to accumulate data across chunks
+        limits = self.stream_limits
+
+        # Single framer per stream, keeps incomplete JSON data across chunks
+        framer = JSONStreamFramer(
+            response=response,
+            hotkey=self.axon.hotkey,
+            max_frame_bytes=limits.max_event_bytes,
+        )
+        received_bytes = 0
+        is_aborted = False
 
         try:
             async for chunk in response.content.iter_any():
-                chunk_str = chunk.decode("utf-8", errors="ignore")
+                received_bytes += len(chunk)
+
+                if received_bytes > limits.max_stream_bytes:
+                    self.mark_stream_truncated(
+                        f"stream exceeded {limits.max_stream_bytes} bytes"
+                    )
+                    break
+
+                json_objects = framer.feed(chunk)
 
-                # Attempt to parse the chunk as JSON, updating the buffer with remaining incomplete JSON data
-                json_objects, buffer = extract_json_chunk(
-                    chunk_str, response, self.axon.hotkey, buffer
-                )
                 for json_data in json_objects:
                     content_type = json_data.get("type")
 
@@ -409,8 +613,18 @@ class ScraperStreamingSynapse(StreamingSynapse):
                         if role not in self.text_chunks:
                             self.text_chunks[role] = []
 
+                        if len(self.text_chunks[role]) >= limits.max_chunks_per_role:
+                            self.mark_stream_truncated(
+                                f"role {role} exceeded {limits.max_chunks_per_role} chunks"
+                            )
+                            is_aborted = True
+                            break
+
                         self.text_chunks[role].append(text_content)
 
+                        if ScraperStreamingSynapse.token_counter is not None:
+                            self.count_chunk_tokens(role, text_content)
+
                         yield json.dumps(
                             {"type": "text", "role": role, "content": text_content}
                         )
@@ -422,49 +636,27 @@ class ScraperStreamingSynapse(StreamingSynapse):
                         yield json.dumps({"type": "completion", "content": completion})
 
                     elif content_type == "tweets":
-                        tweets_json = json_data.get("content", "[]")
+                        tweets_json = self.limit_event_items(
+                            content_type, json_data.get("content", "[]")
+                        )
                         self.miner_tweets = tweets_json
                         yield json.dumps({"type": "tweets", "content": tweets_json})
 
-                    elif content_type == "search":
-                        search_json = json_data.get("content", "{}")
-                        self.search_results = search_json
-                        yield json.dumps({"type": "search", "content": search_json})
-
-                    elif content_type == "wikipedia_search":
-                        search_json = json_data.get("content", "{}")
-                        self.wikipedia_search_results = search_json
-                        yield json.dumps(
-                            {"type": "wikipedia_search", "content": search_json}
+                    elif content_type in SEARCH_EVENT_FIELDS:
+                        search_json = self.limit_event_items(
+                            content_type, json_data.get("content", "{}")
                         )
-
-                    elif content_type == "youtube_search":
-                        search_json = json_data.get("content", "{}")
-                        self.youtube_search_results = search_json
+                        setattr(self, SEARCH_EVENT_FIELDS[content_type], search_json)
                         yield json.dumps(
-                            {"type": "youtube_search", "content": search_json}
+                            {"type": content_type, "content": search_json}
                         )
 
-                    elif content_type == "arxiv_search":
-                        search_json = json_data.get("content", "{}")
-                        self.arxiv_search_results = search_json
-                        yield json.dumps(
-                            {"type": "arxiv_search", "content": search_json}
-                        )
+                if framer.limit_exceeded:
+                    self.mark_stream_truncated(framer.limit_exceeded)
+                    is_aborted = True
 
-                    elif content_type == "reddit_search":
-                        search_json = json_data.get("content", "{}")
-                        self.reddit_search_results = search_json
-                        yield json.dumps(
-                            {"type": "reddit_search", "content": search_json}
-                        )
-
-                    elif content_type == "hacker_news_search":
-                        search_json = json_data.get("content", "{}")
-                        self.hacker_news_search_results = search_json
-                        yield json.dumps(
-                            {"type": "hacker_news_search", "content": search_json}
-                        )
+                if is_aborted:
+                    break
 
         except json.JSONDecodeError as e:
             port = response.real_url.port
@@ -505,7 +697,7 @@ class ScraperStreamingSynapse(StreamingSynapse):
                 if key.startswith(prefix)
             }
 
-        completion_links = TwitterUtils().find_twitter_links(self.completion)
+        completion_links = extract_links(self.completion).twitter_urls
         search_completion_links, _ = self.get_search_links()
 
         return {
@@ -546,40 +738,155 @@ class ScraperStreamingSynapse(StreamingSynapse):
         arbitrary_types_allowed = True
 
 
-def extract_json_chunk(chunk, response, hotkey, buffer=""):
+class JSONStreamFramer:
     """
-    Extracts JSON objects from a chunk of data, handling cases where JSON objects are split across multiple chunks.
+    Incrementally frames concatenated JSON objects streamed by a miner.
 
-    :param chunk: The current chunk of data to process.
-    :param response: The response object, used for logging.
-    :param buffer: A buffer holding incomplete JSON data from previous chunks.
-    :return: A tuple containing a list of extracted JSON objects and the updated buffer.
+    Incoming bytes are appended to a single buffer and scanned only once: the framer
+    remembers the offset, nesting depth and string state where the previous chunk
+    stopped, so a large object split across many small chunks costs linear time.
+    Only complete frames are decoded, which also keeps multi-byte UTF-8 characters
+    that are split across chunks intact.
     """
-    buffer += chunk  # Add the current chunk to the buffer
-    json_objects = []
 
-    while True:
-        try:
-            json_obj, end = json.JSONDecoder(strict=False).raw_decode(buffer)
-            json_objects.append(json_obj)
-            buffer = buffer[end:]
-        except json.JSONDecodeError as e:
-            if e.pos == len(buffer):
-                # Reached the end of the buffer without finding a complete JSON object
+    TOKEN_PATTERN = re.compile(rb'[{}\[\]"]')
+    STRING_TOKEN_PATTERN = re.compile(rb'["\\]')
+
+    def __init__(self, response=None, hotkey=None, max_frame_bytes=None):
+        self.response = response
+        self.hotkey = hotkey
+        self.max_frame_bytes = max_frame_bytes
+        self.decoder = json.JSONDecoder(strict=False)
+        self.buffer = bytearray()
+
+        # Reason of exceeding the frame size limit, framer stops parsing once set
+        self.limit_exceeded = None
+
+        # Scan state, kept between chunks
+        self.position = 0
+        self.frame_start = None
+        self.depth = 0
+        self.in_string = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Appends a chunk of raw bytes and returns all JSON objects completed by it.
+
+        :param chunk: The raw bytes received from the stream.
+        :return: A list of decoded JSON objects, in stream order.
+        """
+        if self.limit_exceeded:
+            return []
+
+        self.buffer += chunk
+        json_objects = []
+
+        for start, end in self._scan_frames():
+            if self._is_frame_too_large(end - start):
                 break
-            elif e.msg.startswith("Unterminated string"):
-                # Incomplete JSON object at the end of the chunk
+
+            json_obj = self._decode_frame(start, end)
+
+            if json_obj is not None:
+                json_objects.append(json_obj)
+
+        # Stop early instead of buffering an oversized incomplete frame
+        if self.frame_start is not None:
+            self._is_frame_too_large(len(self.buffer) - self.frame_start)
+
+        self._compact()
+
+        return json_objects
+
+    def _scan_frames(self):
+        buffer = self.buffer
+        length = len(buffer)
+
+        while self.position < length:
+            if self.in_string:
+                match = self.STRING_TOKEN_PATTERN.search(buffer, self.position)
+
+                if match is None:
+                    self.position = length
+                    break
+
+                if match.group() == b"\\":
+                    if match.end() >= length:
+                        # Escaped character has not arrived yet, resume from the backslash
+                        self.position = match.start()
+                        break
+
+                    self.position = match.end() + 1
+                    continue
+
+                self.in_string = False
+                self.position = match.end()
+                continue
+
+            match = self.TOKEN_PATTERN.search(buffer, self.position)
+
+            if match is None:
+                self.position = length
                 break
+
+            token = match.group()
+            self.position = match.end()
+
+            if self.depth == 0:
+                # Anything between top-level frames (whitespace, stray data) is skipped
+                if token in (b"{", b"["):
+                    self.frame_start = match.start()
+                    self.depth = 1
+                continue
+
+            if token == b'"':
+                self.in_string = True
+            elif token in (b"{", b"["):
+                self.depth += 1
             else:
-                # Invalid JSON data encountered
-                port = response.real_url.port
-                host = response.real_url.host
-                bt.logging.debug(
-                    f"Host: {host}:{port}; hotkey: {hotkey}; Failed to decode JSON object: {e} from {buffer}"
-                )
-                break
+                self.depth -= 1
+
+                if self.depth == 0:
+                    start = self.frame_start
+                    self.frame_start = None
+                    yield start, self.position
+
+    def _is_frame_too_large(self, frame_size: int) -> bool:
+        if self.max_frame_bytes is None or frame_size <= self.max_frame_bytes:
+            return False
+
+        self.limit_exceeded = f"event exceeded {self.max_frame_bytes} bytes"
+        return True
+
+    def _decode_frame(self, start: int, end: int):
+        frame = self.buffer[start:end].decode("utf-8", errors="ignore")
+
+        try:
+            json_obj, _ = self.decoder.raw_decode(frame)
+            return json_obj
+        except json.JSONDecodeError as e:
+            # Invalid frame, skip it and keep parsing the rest of the stream
+            host, port = None, None
+
+            if self.response is not None:
+                port = self.response.real_url.port
+                host = self.response.real_url.host
+
+            bt.logging.debug(
+                f"Host: {host}:{port}; hotkey: {self.hotkey}; Failed to decode JSON object: {e} from {frame}"
+            )
+            return None
+
+    def _compact(self):
+        """Drops bytes that can no longer be part of an incomplete frame."""
+        consumed = self.frame_start if self.frame_start is not None else self.position
+
+        if consumed:
+            del self.buffer[:consumed]
+            self.position -= consumed
 
-    return json_objects, buffer
+            if self.frame_start is not None:
+                self.frame_start = 0
 
 
 class WebSearchResult(BaseModel):
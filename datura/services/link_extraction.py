@@ -0,0 +1,157 @@
+import re
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+TWITTER_DOMAINS = ["x.com"]
+
+markdown_link_regex = re.compile(r"\[(.*?)\]\((https?://[^\s\)]+)\)")
+
+twitter_link_regex = re.compile(
+    r"https?://(?:"
+    + "|".join(re.escape(domain) for domain in TWITTER_DOMAINS)
+    + r")/(?![^/]*?(?:Twitter|Admin)[^/]*?/)"
+    r"(?P<username>[a-zA-Z0-9_]{1,15})/status/(?P<id>\d+)",
+    re.IGNORECASE,
+)
+
+tweet_id_regex = re.compile(r"/status(?:es)?/(\d+)")
+
+description_brackets_regex = re.compile(r"\[|\]|\(|\)")
+description_dash_regex = re.compile(r"^-\s*")
+
+
+@dataclass(frozen=True)
+class MarkdownLink:
+    url: str
+    description: str
+    # Lowercased host of the link, e.g. www.reddit.com
+    host: str
+    # Last two labels of the host, e.g. reddit.com. Naive, multi-part public suffixes are
+    # not handled: bbc.co.uk gives co.uk. Use links_by_domain to match links by domain.
+    two_label_domain: Optional[str]
+
+
+@dataclass(frozen=True)
+class TwitterLink:
+    url: str
+    username: str
+    tweet_id: str
+
+
+@dataclass(frozen=True)
+class ExtractedLinks:
+    markdown_links: Tuple[MarkdownLink, ...]
+    twitter_links: Tuple[TwitterLink, ...]
+    # First Twitter link of every line with the rest of the line as its description
+    twitter_link_descriptions: Tuple[Tuple[str, str], ...]
+
+    @property
+    def links(self) -> List[str]:
+        return [link.url for link in self.markdown_links]
+
+    @property
+    def links_with_descriptions(self) -> List[Tuple[str, str]]:
+        return [(link.url, link.description) for link in self.markdown_links]
+
+    @property
+    def twitter_urls(self) -> List[str]:
+        return [link.url for link in self.twitter_links]
+
+    @property
+    def tweet_ids(self) -> Dict[str, str]:
+        return {link.url: link.tweet_id for link in self.twitter_links}
+
+    @property
+    def usernames(self) -> List[str]:
+        return list(dict.fromkeys(link.username for link in self.twitter_links))
+
+    def links_by_domain(self, domain: str) -> List[str]:
+        """Returns markdown links hosted on the domain or any of its subdomains."""
+        domain = domain.lower()
+
+        return [
+            link.url
+            for link in self.markdown_links
+            if link.host == domain or link.host.endswith(f".{domain}")
+        ]
+
+
+def get_tweet_id(url: str) -> Optional[str]:
+    match = tweet_id_regex.search(url)
+    return match.group(1) if match else None
+
+
+def get_host(url: str) -> str:
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+def get_two_label_domain(host: str) -> Optional[str]:
+    """Returns last two labels of the host, e.g. www.reddit.com -> reddit.com"""
+    if not host:
+        return None
+
+    return ".".join(host.split(".")[-2:])
+
+
+def get_twitter_link_description(text: str, start: int, end: int) -> str:
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", end)
+    line = text[line_start:] if line_end == -1 else text[line_start:line_end]
+
+    # Remove the link, any surrounding brackets and leading "-"
+    description = description_brackets_regex.sub(
+        "", line.replace(text[start:end], "")
+    ).strip()
+
+    return description_dash_regex.sub("", description)
+
+
+@lru_cache(maxsize=2048)
+def extract_links(text: str) -> ExtractedLinks:
+    """Extracts markdown links, Twitter links and their descriptions from the text.
+    Results are cached by text, so the protocol and reward models share the work done on a completion.
+    """
+    markdown_links = []
+
+    for match in markdown_link_regex.finditer(text):
+        url = match.group(2)
+        host = get_host(url)
+        markdown_links.append(
+            MarkdownLink(
+                url=url,
+                description=match.group(1),
+                host=host,
+                two_label_domain=get_two_label_domain(host),
+            )
+        )
+
+    twitter_links = []
+    twitter_link_descriptions = []
+    last_line_start = -1
+
+    for match in twitter_link_regex.finditer(text):
+        url = match.group()
+        twitter_links.append(
+            TwitterLink(
+                url=url, username=match.group("username"), tweet_id=match.group("id")
+            )
+        )
+
+        line_start = text.rfind("\n", 0, match.start()) + 1
+
+        if line_start != last_line_start:
+            last_line_start = line_start
+            twitter_link_descriptions.append(
+                (url, get_twitter_link_description(text, match.start(), match.end()))
+            )
+
+    return ExtractedLinks(
+        markdown_links=tuple(markdown_links),
+        twitter_links=tuple(twitter_links),
+        twitter_link_descriptions=tuple(twitter_link_descriptions),
+    )
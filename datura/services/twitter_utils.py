@@ -1,19 +1,18 @@
-import re
 from typing import List, Tuple
 from urllib.parse import urlparse
+from datura.services.link_extraction import (
+    TWITTER_DOMAINS,
+    extract_links,
+    get_tweet_id,
+    twitter_link_regex,
+)
 
-VALID_DOMAINS = ["x.com"]
+VALID_DOMAINS = TWITTER_DOMAINS
 
 
 class TwitterUtils:
     def __init__(self):
-        self.twitter_link_regex = re.compile(
-            r"https?://(?:"
-            + "|".join(re.escape(domain) for domain in VALID_DOMAINS)
-            + r")/(?![^/]*?(?:Twitter|Admin)[^/]*?/)"
-            r"(?P<username>[a-zA-Z0-9_]{1,15})/status/(?P<id>\d+)",
-            re.IGNORECASE,
-        )
+        self.twitter_link_regex = twitter_link_regex
 
     @staticmethod
     def extract_tweet_id(url: str) -> str:
@@ -26,8 +25,7 @@ class TwitterUtils:
         Returns:
             The extracted tweet ID.
         """
-        match = re.search(r"/status(?:es)?/(\d+)", url)
-        return match.group(1) if match else None
+        return get_tweet_id(url)
 
     @staticmethod
     def is_valid_twitter_link(self, url: str) -> bool:
@@ -53,7 +51,7 @@ class TwitterUtils:
         Returns:
             A list of found Twitter links.
         """
-        return [match.group() for match in self.twitter_link_regex.finditer(text)]
+        return extract_links(text).twitter_urls
 
     def find_twitter_link_with_descriptions(self, text: str) -> List[Tuple[str, str]]:
         """
@@ -65,16 +63,4 @@ class TwitterUtils:
         Returns:
         A list of tuples, each containing a Twitter link and its description.
         """
-        results = []
-        lines = text.split("\n")
-        for line in lines:
-            match = self.twitter_link_regex.search(line)
-            if match:
-                link = match.group()
-                # Extract description by removing the link, any surrounding brackets, and leading "-"
-                description = re.sub(r"\[|\]|\(|\)", "", line.replace(link, "")).strip()
-                description = re.sub(
-                    r"^-\s*", "", description
-                )  # Remove leading "-" and any following whitespace
-                results.append((link, description))
-        return results
+        return list(extract_links(text).twitter_link_descriptions)
@@ -1,26 +1,16 @@
-import re
-
 from typing import List, Tuple
+from urllib.parse import urlsplit, urlunsplit
+from datura.services.link_extraction import extract_links
 
 
 class WebSearchUtils:
     @staticmethod
     def find_links(text: str) -> List[str]:
-        link_regex = r"\[.*?\]\((https?://[^\s\)]+)\)"
-        links = []
-        for match in re.finditer(link_regex, text):
-            link = match.group(1)
-            links.append(link)
-        return links
+        return extract_links(text).links
 
     @staticmethod
     def find_links_by_domain(text: str, domain: str) -> List[str]:
-        link_regex = rf"\[.*?\]\((https?://(?:[a-zA-Z0-9-]+\.)*{re.escape(domain)}(?:/[^\s\)]+)?)\)"
-        links = []
-        for match in re.finditer(link_regex, text):
-            link = match.group(1)
-            links.append(link)
-        return links
+        return extract_links(text).links_by_domain(domain)
 
     @staticmethod
     def find_links_with_descriptions(text: str) -> List[Tuple[str, str]]:
@@ -33,15 +23,7 @@ class WebSearchUtils:
         Returns:
         A list of tuples, each containing a link and its description.
         """
-        link_regex = r"\[(.*?)\]\((https?://[^\s\)]+)\)"
-        results = []
-
-        for match in re.finditer(link_regex, text):
-            description = match.group(1)
-            link = match.group(2)
-            results.append((link, description))
-
-        return results
+        return extract_links(text).links_with_descriptions
 
     @staticmethod
     def remove_trailing_slash(url: str) -> str:
@@ -58,3 +40,27 @@ class WebSearchUtils:
             return url[:-1]
 
         return url
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """
+        Normalize a URL so that variants of the same page compare equal.
+
+        Lowercases scheme and host, drops the fragment and the trailing slash.
+
+        Args:
+        url: The URL to normalize.
+
+        Returns:
+        The normalized URL.
+        """
+        try:
+            parts = urlsplit(url.strip())
+        except ValueError:
+            return WebSearchUtils.remove_trailing_slash(url)
+
+        normalized = urlunsplit(
+            (parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, "")
+        )
+
+        return WebSearchUtils.remove_trailing_slash(normalized)
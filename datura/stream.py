@@ -1,12 +1,19 @@
+import json
 import asyncio
 import random
 import time
+from collections import deque
 import bittensor as bt
 from datura.protocol import ScraperStreamingSynapse
 
 
-async def collect_response(response: ScraperStreamingSynapse, uid, start_time):
+async def collect_response(
+    response: ScraperStreamingSynapse, uid, start_time, on_chunk=None
+):
     async for chunk in response:
+        if on_chunk:
+            on_chunk(uid, chunk)
+
         if isinstance(chunk, bt.Synapse):
             end_time = time.time()
             duration = end_time - start_time
@@ -23,44 +30,317 @@ async def collect_response(response: ScraperStreamingSynapse, uid, start_time):
     return None
 
 
-async def collect_responses(async_responses, uids, start_time):
+async def collect_responses(async_responses, uids, start_time, on_chunk=None):
     tasks = [
-        asyncio.create_task(collect_response(resp, uid, start_time))
+        asyncio.create_task(collect_response(resp, uid, start_time, on_chunk))
         for resp, uid in zip(async_responses, uids)
     ]
 
     return await asyncio.gather(*tasks)
 
 
-async def collect_final_synapses(
-    async_responses, uids, start_time, max_execution_time, group_size=15
+class CollectorGauges:
+    """Counts of miner streams waiting for a collector slot and being drained."""
+
+    def __init__(self):
+        self.queued = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.collected = 0
+
+    def get_metrics(self):
+        return {
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "collected": self.collected,
+        }
+
+
+async def collect_response_with_limit(
+    response: ScraperStreamingSynapse,
+    uid,
+    start_time,
+    semaphore,
+    gauges: CollectorGauges,
+    on_chunk=None,
 ):
-    final_synapses = [None] * len(async_responses)
+    gauges.queued += 1
+    is_queued = True
 
-    if max_execution_time <= 60:
-        # Process all async_responses in sequence of groups
+    try:
+        async with semaphore:
+            gauges.queued -= 1
+            is_queued = False
+            gauges.in_flight += 1
+            gauges.max_in_flight = max(gauges.max_in_flight, gauges.in_flight)
 
-        # Split the async_responses into groups of size group_size
-        async_responses_groups = [
-            async_responses[i : i + group_size]
-            for i in range(0, len(async_responses), group_size)
-        ]
+            try:
+                return await collect_response(response, uid, start_time, on_chunk)
+            finally:
+                gauges.in_flight -= 1
+                gauges.collected += 1
+    finally:
+        # Cancelled while waiting for a slot
+        if is_queued:
+            gauges.queued -= 1
 
-        group_indices = list(range(len(async_responses_groups)))
-        random.shuffle(group_indices)
 
-        for group_index in group_indices:
-            async_responses_group = async_responses_groups[group_index]
-            group_uids = uids[group_index * group_size : (group_index + 1) * group_size]
+async def collect_final_synapses(
+    async_responses,
+    uids,
+    start_time,
+    max_execution_time,
+    max_concurrency=15,
+    on_chunk=None,
+    gauges=None,
+):
+    if max_execution_time <= 60:
+        # Drain at most max_concurrency streams at a time, next stream starts as soon as one finishes
+        semaphore = asyncio.Semaphore(max_concurrency)
+        gauges = gauges or CollectorGauges()
+
+        # Random start order, so the same miners are not always drained last
+        indices = list(range(len(async_responses)))
+        random.shuffle(indices)
 
-            group_final_synapses = await collect_responses(
-                async_responses_group, group_uids, start_time
+        tasks = {
+            index: asyncio.create_task(
+                collect_response_with_limit(
+                    async_responses[index],
+                    uids[index],
+                    start_time,
+                    semaphore,
+                    gauges,
+                    on_chunk,
+                )
             )
+            for index in indices
+        }
+
+        final_synapses = await asyncio.gather(
+            *[tasks[index] for index in range(len(async_responses))]
+        )
 
-            for i, synapse in enumerate(group_final_synapses):
-                final_synapses[group_index * group_size + i] = synapse
+        bt.logging.debug(f"Stream collector: {gauges.get_metrics()}")
     else:
         # Process all async_responses in parallel
-        final_synapses = await collect_responses(async_responses, uids, start_time)
+        final_synapses = await collect_responses(
+            async_responses, uids, start_time, on_chunk
+        )
 
     return final_synapses
+
+
+async def collect_final_synapses_with_quorum(
+    async_responses,
+    uids,
+    start_time,
+    max_execution_time,
+    quorum,
+    soft_deadline,
+    max_concurrency=15,
+):
+    """Waits until quorum successful final synapses arrive or soft_deadline seconds pass since start_time.
+    Returns synapses that arrived so far and the task still collecting all final synapses.
+    """
+    arrived_synapses = []
+    quorum_reached = asyncio.Event()
+
+    def on_chunk(uid, chunk):
+        if isinstance(chunk, bt.Synapse) and chunk.dendrite.status_code == 200:
+            arrived_synapses.append(chunk)
+
+            if len(arrived_synapses) >= quorum:
+                quorum_reached.set()
+
+    collect_task = asyncio.create_task(
+        collect_final_synapses(
+            async_responses,
+            uids,
+            start_time,
+            max_execution_time,
+            max_concurrency=max_concurrency,
+            on_chunk=on_chunk,
+        )
+    )
+    quorum_task = asyncio.create_task(quorum_reached.wait())
+
+    await asyncio.wait(
+        [collect_task, quorum_task],
+        timeout=max(0, start_time + soft_deadline - time.time()),
+        return_when=asyncio.FIRST_COMPLETED,
+    )
+    quorum_task.cancel()
+
+    return list(arrived_synapses), collect_task
+
+
+class HedgeMetrics:
+    """Time to first token and hedge rate of hedged organic streams."""
+
+    def __init__(self, window: int = 1000):
+        self.streams = 0
+        self.hedged_streams = 0
+        self.hedge_wins = 0
+        self.times_to_first_token = deque(maxlen=window)
+
+    def observe(self, time_to_first_token, is_hedged: bool, is_hedge_win: bool):
+        self.streams += 1
+        self.hedged_streams += int(is_hedged)
+        self.hedge_wins += int(is_hedge_win)
+
+        if time_to_first_token is not None:
+            self.times_to_first_token.append(time_to_first_token)
+
+    def get_percentile(self, percentile: float):
+        if not self.times_to_first_token:
+            return None
+
+        values = sorted(self.times_to_first_token)
+        return values[min(len(values) - 1, int(len(values) * percentile))]
+
+    def get_metrics(self):
+        return {
+            "streams": self.streams,
+            "hedge_rate": self.hedged_streams / self.streams if self.streams else 0,
+            "hedge_win_rate": self.hedge_wins / self.streams if self.streams else 0,
+            "ttft_p50": self.get_percentile(0.5),
+            "ttft_p95": self.get_percentile(0.95),
+        }
+
+
+hedge_metrics = HedgeMetrics()
+
+
+def is_text_chunk(chunk) -> bool:
+    """Whether a streamed chunk carries summary text, search results and other events do not."""
+    try:
+        return json.loads(chunk).get("type") == "text"
+    except (TypeError, ValueError, AttributeError):
+        return False
+
+
+class StreamPump:
+    """Reads a miner stream in the background, chunks are queued and the final synapse is kept."""
+
+    def __init__(self, response: ScraperStreamingSynapse):
+        self.response = response
+        self.queue = asyncio.Queue()
+        self.final_synapse = None
+        self.has_chunks = False
+        self.first_text_time = None
+        # Set on the first text chunk and when the stream ends
+        self.updated = asyncio.Event()
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        try:
+            async for chunk in self.response:
+                if isinstance(chunk, bt.Synapse):
+                    self.final_synapse = chunk
+                    continue
+
+                self.queue.put_nowait(chunk)
+
+                # Events sent before any text, e.g. search results, are not first tokens
+                if not self.has_chunks and is_text_chunk(chunk):
+                    self.has_chunks = True
+                    self.first_text_time = time.time()
+                    self.updated.set()
+        finally:
+            self.queue.put_nowait(None)
+            self.updated.set()
+
+
+class HedgedStream:
+    """Streams the primary miner and starts a hedge miner if the primary has no tokens after hedge_delay seconds.
+    Chunks of the miner that produces tokens first are streamed, the other miner is collected for scoring only.
+    start_hedge is an async callable returning the hedge stream, or None if no other miner is available.
+    """
+
+    def __init__(self, response, start_hedge, hedge_delay: float):
+        self.start_hedge = start_hedge
+        self.hedge_delay = hedge_delay
+        self.pumps = [StreamPump(response)]
+        self.is_hedge_attempted = False
+        self.start_time = time.time()
+
+    async def hedge(self):
+        self.is_hedge_attempted = True
+        response = await self.start_hedge()
+
+        if response is not None:
+            self.pumps.append(StreamPump(response))
+
+    async def wait_first_tokens(self):
+        """Returns the pump that produced text chunks first, None if all streams ended without any."""
+        while True:
+            for pump in self.pumps:
+                if pump.has_chunks:
+                    return pump
+
+            if all(pump.task.done() for pump in self.pumps):
+                if self.is_hedge_attempted:
+                    return None
+
+                # Primary failed without tokens, do not wait for the hedge delay
+                await self.hedge()
+                continue
+
+            waiters = [
+                asyncio.create_task(pump.updated.wait())
+                for pump in self.pumps
+                if not pump.task.done()
+            ]
+            done, _ = await asyncio.wait(
+                waiters,
+                timeout=None if self.is_hedge_attempted else self.hedge_delay,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            for waiter in waiters:
+                waiter.cancel()
+
+            if not done:
+                await self.hedge()
+
+    async def stream(self):
+        pump = await self.wait_first_tokens()
+
+        hedge_metrics.observe(
+            pump.first_text_time - self.start_time if pump else None,
+            is_hedged=len(self.pumps) > 1,
+            is_hedge_win=pump is not None and pump is not self.pumps[0],
+        )
+
+        if pump is None:
+            return
+
+        while True:
+            chunk = await pump.queue.get()
+
+            if chunk is None:
+                break
+
+            yield chunk
+
+    async def aclose(self):
+        """Stops all started streams, e.g. when the client disconnects, so miner connections are released."""
+        for pump in self.pumps:
+            pump.task.cancel()
+
+        await asyncio.gather(
+            *[pump.task for pump in self.pumps], return_exceptions=True
+        )
+
+        for pump in self.pumps:
+            await pump.response.aclose()
+
+    async def get_final_synapses(self):
+        """Waits for all started streams and returns their final synapses, primary first."""
+        await asyncio.gather(
+            *[pump.task for pump in self.pumps], return_exceptions=True
+        )
+
+        return [pump.final_synapse for pump in self.pumps]
@@ -8,6 +8,7 @@ import wandb
 import base64
 import random
 import asyncio
+import time
 import datura
 import copy
 import torch
@@ -18,6 +19,7 @@ import threading
 import multiprocessing
 import aiohttp
 from . import client
+from openai import RateLimitError
 from collections import deque
 from datetime import datetime
 from datura.misc import ttl_get_block
@@ -26,7 +28,8 @@ import html
 import unicodedata
 from datura.protocol import Model, TwitterScraperTweet
 from neurons.validators.apify.twitter_scraper_actor import TwitterScraperActor
-from typing import List
+from neurons.validators.utils.tweet_cache import tweet_cache
+from typing import Callable, List, Optional
 from datura.services.twitter_utils import TwitterUtils
 from sentence_transformers import util
 from neurons.validators.env import EXPECTED_ACCESS_KEY, PORT
@@ -222,7 +225,13 @@ def extract_python_list(text: str):
 
 
 async def call_openai(
-    messages, temperature, model, seed=1234, response_format=None, top_p=None
+    messages,
+    temperature,
+    model,
+    seed=1234,
+    response_format=None,
+    top_p=None,
+    on_rate_limit=None,
 ):
     api_key = os.environ.get("OPENAI_API_KEY")
 
@@ -249,6 +258,10 @@ async def call_openai(
 
         except Exception as e:
             bt.logging.error(f"Error when calling OpenAI: {e}")
+
+            if on_rate_limit and isinstance(e, RateLimitError):
+                on_rate_limit()
+
             await asyncio.sleep(0.5)
 
     return None
@@ -656,54 +669,115 @@ def format_text_for_match(text):
 
 
 async def scrape_tweets_with_retries(
-    urls: List[str], group_size: int, max_attempts: int
+    urls: List[str],
+    group_size: int,
+    max_attempts: int,
+    on_fetched: Optional[Callable[[List[TwitterScraperTweet]], None]] = None,
 ):
-    fetched_tweets = []
-    non_fetched_links = urls.copy()
-    attempt = 1
+    """Fetches tweets of the links with Apify, retrying links that were not fetched.
+    on_fetched is called with every batch of tweets as soon as it is available.
+    """
+
+    def notify(tweets):
+        if on_fetched:
+            on_fetched(tweets)
+
+    # Tweets fetched in previous rounds are served from the cache, only misses go to Apify
+    fetched_tweets, non_fetched_links = await tweet_cache.get_tweets(urls)
+    tweet_cache.observe_cache_lookup(len(urls), len(non_fetched_links), group_size)
 
-    while attempt <= max_attempts and non_fetched_links:
+    if len(fetched_tweets):
         bt.logging.info(
-            f"Attempt {attempt}/{max_attempts}, processing {len(non_fetched_links)} links."
+            f"Found {len(fetched_tweets)} tweets in the cache, fetching {len(non_fetched_links)} links. "
+            f"Tweet cache stats: {tweet_cache.get_metrics()}"
+        )
+        notify(list(fetched_tweets))
+
+    # Tweets other scoring tasks are fetching right now are awaited instead of fetched again
+    link_to_tweet_id = {
+        link: TwitterUtils.extract_tweet_id(link) for link in non_fetched_links
+    }
+    claimed_tweet_ids, in_flight = tweet_cache.in_flight.claim(
+        tweet_id for tweet_id in link_to_tweet_id.values() if tweet_id
+    )
+    in_flight_links = [
+        link for link, tweet_id in link_to_tweet_id.items() if tweet_id in in_flight
+    ]
+    non_fetched_links = [
+        link
+        for link, tweet_id in link_to_tweet_id.items()
+        if tweet_id not in in_flight
+    ]
+
+    if in_flight_links:
+        bt.logging.info(
+            f"Waiting for {len(in_flight_links)} tweets already being fetched."
         )
 
-        url_groups = [
-            non_fetched_links[i : i + group_size]
-            for i in range(0, len(non_fetched_links), group_size)
-        ]
+    cached_tweets_count = len(fetched_tweets)
+    attempt = 1
 
-        tasks = [
-            asyncio.create_task(TwitterScraperActor().get_tweets(urls=group))
-            for group in url_groups
-        ]
+    async def get_tweets(group):
+        start_time = time.time()
+        tweets = await TwitterScraperActor().get_tweets(urls=group)
+        tweet_cache.observe_actor_run(time.time() - start_time)
+        notify(tweets)
+        return tweets
 
-        # Wait for tasks to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        while attempt <= max_attempts and non_fetched_links:
+            bt.logging.info(
+                f"Attempt {attempt}/{max_attempts}, processing {len(non_fetched_links)} links."
+            )
 
-        # Combine results and handle exceptions
-        for result in results:
-            if isinstance(result, Exception):
-                bt.logging.error(
-                    f"Error in TwitterScraperActor attempt {attempt}: {str(result)}"
+            url_groups = [
+                non_fetched_links[i : i + group_size]
+                for i in range(0, len(non_fetched_links), group_size)
+            ]
+
+            tasks = [asyncio.create_task(get_tweets(group)) for group in url_groups]
+
+            # Wait for tasks to complete
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            # Combine results and handle exceptions
+            for result in results:
+                if isinstance(result, Exception):
+                    bt.logging.error(
+                        f"Error in TwitterScraperActor attempt {attempt}: {str(result)}"
+                    )
+                    continue
+                fetched_tweets.extend(result)
+
+            # Update non_fetched_links
+            fetched_tweet_ids = {tweet.id for tweet in fetched_tweets}
+            non_fetched_links = [
+                link
+                for link in non_fetched_links
+                if TwitterUtils.extract_tweet_id(link) not in fetched_tweet_ids
+            ]
+
+            if non_fetched_links:
+                bt.logging.info(
+                    f"Retrying fetching non-fetched {len(non_fetched_links)} tweets. Retries left: {max_attempts - attempt}"
                 )
-                continue
-            fetched_tweets.extend(result)
-
-        # Update non_fetched_links
-        fetched_tweet_ids = {tweet.id for tweet in fetched_tweets}
-        non_fetched_links = [
-            link
-            for link in non_fetched_links
-            if TwitterUtils.extract_tweet_id(link) not in fetched_tweet_ids
-        ]
+                await asyncio.sleep(3)
 
-        if non_fetched_links:
-            bt.logging.info(
-                f"Retrying fetching non-fetched {len(non_fetched_links)} tweets. Retries left: {max_attempts - attempt}"
-            )
-            await asyncio.sleep(3)
+            attempt += 1
 
-        attempt += 1
+        await tweet_cache.set_tweets(fetched_tweets[cached_tweets_count:])
+    finally:
+        tweet_cache.in_flight.resolve(
+            claimed_tweet_ids,
+            {tweet.id: tweet for tweet in fetched_tweets[cached_tweets_count:]},
+        )
+
+    shared_tweets = await tweet_cache.in_flight.wait(in_flight)
+    fetched_tweets.extend(shared_tweets.values())
+    notify(list(shared_tweets.values()))
+    non_fetched_links.extend(
+        link for link in in_flight_links if link_to_tweet_id[link] not in shared_tweets
+    )
 
     return fetched_tweets, non_fetched_links
 
@@ -4,7 +4,12 @@ import asyncio
 import time
 from typing import List, Optional
 import bittensor as bt
-from datura.stream import collect_final_synapses
+from datura.stream import (
+    collect_final_synapses,
+    collect_final_synapses_with_quorum,
+    hedge_metrics,
+    HedgedStream,
+)
 from reward import RewardModelType, RewardScoringType
 from utils.mock import MockRewardModel
 
@@ -21,13 +26,23 @@ from datura.utils import get_max_execution_time
 from neurons.validators.base_validator import AbstractNeuron
 from neurons.validators.reward.summary_relevance import SummaryRelevanceRewardModel
 from neurons.validators.reward.twitter_content_relevance import (
+    APIFY_LINK_SCRAPE_AMOUNT,
     TwitterContentRelevanceModel,
 )
 from neurons.validators.reward.search_content_relevance import (
     WebSearchContentRelevanceModel,
 )
 from neurons.validators.reward.performance_reward import PerformanceRewardModel
+from neurons.validators.reward.reward import apply_reward_functions
+from neurons.validators.utils.llm_scheduler import (
+    RequestPriority,
+    llm_request_priority,
+)
 from neurons.validators.reward.reward_llm import RewardLLM
+from neurons.validators.reward.response_analysis import analyze_responses
+from neurons.validators.utils.speculative_verification import (
+    SpeculativeTweetVerifier,
+)
 from neurons.validators.utils.tasks import TwitterTask
 from neurons.validators.organic_query_state import OrganicQueryState
 from neurons.validators.penalty.streaming_penalty import StreamingPenaltyModel
@@ -215,31 +230,20 @@ class AdvancedScraperValidator:
             for task in tasks
         ]
 
-        axon_groups = [axons[:80], axons[80:160], axons[160:]]
-        synapse_groups = [synapses[:80], synapses[80:160], synapses[160:]]
-        dendrites = [
-            self.neuron.dendrite1,
-            self.neuron.dendrite2,
-            self.neuron.dendrite3,
-        ]
+        dendrite_pool = self.neuron.dendrite_pool
+        dendrite_pool.resize(len(axons))
 
-        async_responses = []
         timeout = max_execution_time + 5
 
-        for dendrite, axon_group, synapse_group in zip(
-            dendrites, axon_groups, synapse_groups
-        ):
-            async_responses.extend(
-                [
-                    dendrite.call_stream(
-                        target_axon=axon,
-                        synapse=synapse.copy(),
-                        timeout=timeout,
-                        deserialize=False,
-                    )
-                    for axon, synapse in zip(axon_group, synapse_group)
-                ]
+        async_responses = [
+            dendrite_pool.call_stream(
+                target_axon=axon,
+                synapse=synapse.copy(),
+                timeout=timeout,
+                deserialize=False,
             )
+            for axon, synapse in zip(axons, synapses)
+        ]
 
         return async_responses, uids, event, start_time
 
@@ -258,6 +262,9 @@ class AdvancedScraperValidator:
                 bt.logging.warning("No UIDs provided for logging event.")
                 return
 
+            # Query outcomes keep liveness fresh without extra IsAlive probes
+            self.neuron.liveness_tracker.observe_responses(uids.tolist(), responses)
+
             bt.logging.info("Computing rewards and penalties")
 
             rewards = torch.zeros(len(responses), dtype=torch.float32).to(
@@ -294,16 +301,51 @@ class AdvancedScraperValidator:
 
             query_type = "synthetic" if is_synthetic else "organic"
 
-            for weight_i, reward_fn_i in zip(
-                self.reward_weights, self.reward_functions
+            truncated_uids = [
+                uid
+                for uid, response in zip(uids.tolist(), responses)
+                if response.is_stream_truncated
+            ]
+
+            if truncated_uids:
+                bt.logging.info(
+                    f"Following UIDs exceeded stream limits and were truncated: {truncated_uids}. "
+                    f"Total truncated streams: {ScraperStreamingSynapse.truncated_streams_count}"
+                )
+
+            # Derive shared facts of each response once, reward and penalty models read them
+            analysis_start_time = time.time()
+            analyze_responses(responses)
+            bt.logging.info(
+                f"Analyzed {len(responses)} responses in {time.time() - analysis_start_time:.2f} seconds"
+            )
+
+            # LLM requests of organic scoring are served before synthetic ones
+            priority_token = llm_request_priority.set(
+                RequestPriority.SYNTHETIC if is_synthetic else RequestPriority.ORGANIC
+            )
+
+            # Reward functions run concurrently, scoring takes as long as the slowest dependency chain
+            rewards_start_time = time.time()
+            try:
+                reward_results = await apply_reward_functions(
+                    self.reward_functions, responses, uids, organic_penalties
+                )
+            finally:
+                llm_request_priority.reset(priority_token)
+            bt.logging.info(
+                f"Applied all reward functions in {(time.time() - rewards_start_time) / 60:.2f} minutes"
+            )
+
+            for weight_i, reward_fn_i, (reward_result, execution_time) in zip(
+                self.reward_weights, self.reward_functions, reward_results
             ):
-                start_time = time.time()
                 (
                     reward_i_normalized,
                     reward_event,
                     val_score_responses,
                     original_rewards,
-                ) = await reward_fn_i.apply(responses, uids, organic_penalties)
+                ) = reward_result
 
                 all_rewards.append(reward_i_normalized)
                 all_original_rewards.append(original_rewards)
@@ -314,7 +356,7 @@ class AdvancedScraperValidator:
                 )
                 if not self.neuron.config.neuron.disable_log_rewards:
                     event = {**event, **reward_event}
-                execution_time = time.time() - start_time
+                    event[reward_fn_i.name + "_execution_time"] = execution_time
                 bt.logging.trace(str(reward_fn_i.name), reward_i_normalized.tolist())
                 bt.logging.info(
                     f"Applied reward function: {reward_fn_i.name} in {execution_time / 60:.2f} minutes"
@@ -495,18 +537,44 @@ class AdvancedScraperValidator:
                 is_synthetic=True,
             )
 
+            speculative_verifier = None
+
+            if self.neuron.config.neuron.speculative_verification:
+                speculative_verifier = SpeculativeTweetVerifier(
+                    name=RewardModelType.twitter_content_relevance.value,
+                    sample_size=APIFY_LINK_SCRAPE_AMOUNT,
+                )
+
             final_synapses = await collect_final_synapses(
-                async_responses, uids, start_time, max_execution_time
+                async_responses,
+                uids,
+                start_time,
+                max_execution_time,
+                max_concurrency=self.neuron.config.neuron.stream_concurrency,
+                on_chunk=(
+                    speculative_verifier.on_chunk if speculative_verifier else None
+                ),
             )
 
-            await self.compute_rewards_and_penalties(
-                event=event,
-                tasks=tasks,
-                responses=final_synapses,
-                uids=uids,
-                start_time=start_time,
-                is_synthetic=True,
-            )
+            if speculative_verifier:
+                # Samples of the last miners do not wait for the batch delay
+                speculative_verifier.flush()
+                bt.logging.info(
+                    f"Speculative verification: {speculative_verifier.get_metrics()}"
+                )
+
+            try:
+                await self.compute_rewards_and_penalties(
+                    event=event,
+                    tasks=tasks,
+                    responses=final_synapses,
+                    uids=uids,
+                    start_time=start_time,
+                    is_synthetic=True,
+                )
+            finally:
+                if speculative_verifier:
+                    await speculative_verifier.close()
         except Exception as e:
             bt.logging.error(f"Error in query_and_score: {e}")
             raise e
@@ -540,6 +608,8 @@ class AdvancedScraperValidator:
                 date_filter_type = DateFilterType(date_filter)
                 date_filter = get_specified_date_filter(date_filter_type)
 
+            is_only_allowed_miner = self.neuron.config.subtensor.network != "finney"
+
             tasks = [
                 TwitterTask(
                     base_text=prompt,
@@ -552,7 +622,7 @@ class AdvancedScraperValidator:
             async_responses, uids, event, start_time = await self.run_task_and_score(
                 tasks=tasks,
                 strategy=QUERY_MINERS.ALL if specified_uids else QUERY_MINERS.RANDOM,
-                is_only_allowed_miner=self.neuron.config.subtensor.network != "finney",
+                is_only_allowed_miner=is_only_allowed_miner,
                 tools=tools,
                 language=self.language,
                 region=self.region,
@@ -565,26 +635,120 @@ class AdvancedScraperValidator:
             )
 
             final_synapses = []
+            collect_task = None
+            quorum = self.neuron.config.neuron.organic_quorum
+            hedge_delay = self.neuron.config.neuron.organic_hedge_delay
+
+            if is_collect_final_synapses and quorum > 0:
+                # Return to the caller with the first successful synapses,
+                # the rest of the miners are collected in the background for scoring only
+                quorum_synapses, collect_task = await collect_final_synapses_with_quorum(
+                    async_responses,
+                    uids,
+                    start_time,
+                    max_execution_time,
+                    quorum=quorum,
+                    soft_deadline=(
+                        self.neuron.config.neuron.organic_quorum_deadline
+                        or max_execution_time
+                    ),
+                    max_concurrency=self.neuron.config.neuron.stream_concurrency,
+                )
+
+                bt.logging.info(
+                    f"Organic quorum returned {len(quorum_synapses)} of {len(uids)} synapses "
+                    f"after {time.time() - start_time:.2f}s"
+                )
 
-            if specified_uids or is_collect_final_synapses:
+                for synapse in quorum_synapses:
+                    yield synapse
+            elif specified_uids or is_collect_final_synapses:
                 # Collect specified uids from responses and score
                 final_synapses = await collect_final_synapses(
-                    async_responses, uids, start_time, max_execution_time
+                    async_responses,
+                    uids,
+                    start_time,
+                    max_execution_time,
+                    max_concurrency=self.neuron.config.neuron.stream_concurrency,
                 )
 
                 if is_collect_final_synapses:
                     for synapse in final_synapses:
                         yield synapse
+            elif hedge_delay > 0 and not is_interval_query and len(uids) == 1:
+                hedge_uids = None
+
+                async def start_hedge():
+                    nonlocal hedge_uids
+
+                    hedge_responses, hedge_uids, _, _ = await self.run_task_and_score(
+                        tasks=tasks,
+                        strategy=QUERY_MINERS.RANDOM,
+                        is_only_allowed_miner=is_only_allowed_miner,
+                        tools=tools,
+                        language=self.language,
+                        region=self.region,
+                        date_filter=date_filter,
+                        google_date_filter=self.date_filter,
+                        response_order=response_order,
+                        model=model,
+                        result_type=result_type,
+                    )
+
+                    if not hedge_responses or torch.equal(hedge_uids, uids):
+                        return None
+
+                    bt.logging.info(
+                        f"UID {uids[0].item()} has no tokens yet, hedging with UID {hedge_uids[0].item()}"
+                    )
+                    return hedge_responses[0]
+
+                # Stream whichever of the random miner and the hedge miner produces tokens first
+                hedged_stream = HedgedStream(async_responses[0], start_hedge, hedge_delay)
+
+                try:
+                    async for value in hedged_stream.stream():
+                        yield value
+                except (GeneratorExit, asyncio.CancelledError):
+                    # Client disconnected, started miner streams release their dendrites
+                    await hedged_stream.aclose()
+                    raise
+
+                bt.logging.info(f"Hedged streaming: {hedge_metrics.get_metrics()}")
+
+                hedged_synapses = await hedged_stream.get_final_synapses()
+                hedged_uids = uids.tolist() + (
+                    hedge_uids.tolist() if len(hedged_synapses) > 1 else []
+                )
+
+                # Both miners are scored
+                final_synapses = [
+                    synapse for synapse in hedged_synapses if synapse is not None
+                ]
+                uids = torch.tensor(
+                    [
+                        uid
+                        for uid, synapse in zip(hedged_uids, hedged_synapses)
+                        if synapse is not None
+                    ]
+                ).to(uids.device)
             else:
                 # Stream random miner to the UI
                 for response in async_responses:
-                    async for value in response:
-                        if isinstance(value, bt.Synapse):
-                            final_synapses.append(value)
-                        else:
-                            yield value
+                    try:
+                        async for value in response:
+                            if isinstance(value, bt.Synapse):
+                                final_synapses.append(value)
+                            else:
+                                yield value
+                    finally:
+                        # Releases the dendrite when the client disconnects mid-stream
+                        await response.aclose()
 
             async def process_and_score_responses(uids):
+                if collect_task is not None:
+                    final_synapses.extend(await collect_task)
+
                 if is_interval_query:
                     # Add the random_synapse to final_synapses and its UID to uids
                     final_synapses.append(random_synapse)
@@ -21,6 +21,11 @@ from neurons.validators.reward.twitter_basic_search_content_relevance import (
     TwitterBasicSearchContentRelevanceModel,
 )
 from neurons.validators.reward.performance_reward import PerformanceRewardModel
+from neurons.validators.reward.reward import apply_reward_functions
+from neurons.validators.utils.llm_scheduler import (
+    RequestPriority,
+    llm_request_priority,
+)
 from neurons.validators.utils.tasks import SearchTask
 from neurons.validators.basic_organic_query_state import BasicOrganicQueryState
 from neurons.validators.penalty.exponential_penalty import ExponentialTimePenaltyModel
@@ -114,30 +119,20 @@ class BasicScraperValidator:
             for task, params in zip(tasks, params_list)
         ]
 
-        dendrites = [
-            self.neuron.dendrite1,
-            self.neuron.dendrite2,
-            self.neuron.dendrite3,
-        ]
-
-        axon_groups = [axons[:80], axons[80:160], axons[160:]]
-        synapse_groups = [synapses[:80], synapses[80:160], synapses[160:]]
+        dendrite_pool = self.neuron.dendrite_pool
+        dendrite_pool.resize(len(axons))
 
-        all_tasks = []  # List to collect all asyncio tasks
         timeout = self.max_execution_time + 5
 
-        for dendrite, axon_group, synapse_group in zip(
-            dendrites, axon_groups, synapse_groups
-        ):
-            for axon, syn in zip(axon_group, synapse_group):
-                # Create a task for each dendrite call
-                task = dendrite.call(
-                    target_axon=axon,
-                    synapse=syn.copy(),
-                    timeout=timeout,
-                    deserialize=False,
-                )
-                all_tasks.append(task)
+        all_tasks = [
+            dendrite_pool.call(
+                target_axon=axon,
+                synapse=syn.copy(),
+                timeout=timeout,
+                deserialize=False,
+            )
+            for axon, syn in zip(axons, synapses)
+        ]
 
         # Await all tasks concurrently
         all_responses = await asyncio.gather(*all_tasks, return_exceptions=True)
@@ -158,6 +153,9 @@ class BasicScraperValidator:
                 bt.logging.warning("No UIDs provided for logging event.")
                 return
 
+            # Query outcomes keep liveness fresh without extra IsAlive probes
+            self.neuron.liveness_tracker.observe_responses(uids.tolist(), responses)
+
             bt.logging.info("Computing rewards and penalties")
 
             rewards = torch.zeros(len(responses), dtype=torch.float32).to(
@@ -191,16 +189,32 @@ class BasicScraperValidator:
             else:
                 organic_penalties = [False] * len(uids)
 
-            for weight_i, reward_fn_i in zip(
-                self.reward_weights, self.reward_functions
+            # LLM requests of organic scoring are served before synthetic ones
+            priority_token = llm_request_priority.set(
+                RequestPriority.SYNTHETIC if is_synthetic else RequestPriority.ORGANIC
+            )
+
+            # Reward functions run concurrently, scoring takes as long as the slowest dependency chain
+            rewards_start_time = time.time()
+            try:
+                reward_results = await apply_reward_functions(
+                    self.reward_functions, responses, uids, organic_penalties
+                )
+            finally:
+                llm_request_priority.reset(priority_token)
+            bt.logging.info(
+                f"Applied all reward functions in {(time.time() - rewards_start_time) / 60:.2f} minutes"
+            )
+
+            for weight_i, reward_fn_i, (reward_result, execution_time) in zip(
+                self.reward_weights, self.reward_functions, reward_results
             ):
-                start_time = time.time()
                 (
                     reward_i_normalized,
                     reward_event,
                     val_score_responses,
                     original_rewards,
-                ) = await reward_fn_i.apply(responses, uids, organic_penalties)
+                ) = reward_result
 
                 all_rewards.append(reward_i_normalized)
                 all_original_rewards.append(original_rewards)
@@ -211,7 +225,7 @@ class BasicScraperValidator:
                 )
                 if not self.neuron.config.neuron.disable_log_rewards:
                     event = {**event, **reward_event}
-                execution_time = time.time() - start_time
+                    event[reward_fn_i.name + "_execution_time"] = execution_time
                 bt.logging.trace(str(reward_fn_i.name), reward_i_normalized.tolist())
                 bt.logging.info(
                     f"Applied reward function: {reward_fn_i.name} in {execution_time / 60:.2f} minutes"
@@ -22,6 +22,7 @@ import argparse
 import bittensor as bt
 from loguru import logger
 from reward import DefaultRewardFrameworkConfig
+from datura.protocol import StreamLimits
 from distutils.util import strtobool
 
 
@@ -198,6 +199,118 @@ def add_args(cls, parser):
         default=False,
     )
 
+    parser.add_argument(
+        "--neuron.max_stream_bytes",
+        type=int,
+        help="Maximum number of bytes read from a single miner stream before it is truncated.",
+        default=StreamLimits().max_stream_bytes,
+    )
+
+    parser.add_argument(
+        "--neuron.max_event_bytes",
+        type=int,
+        help="Maximum size in bytes of a single streamed event (text, tweets, search results).",
+        default=StreamLimits().max_event_bytes,
+    )
+
+    parser.add_argument(
+        "--neuron.max_chunks_per_role",
+        type=int,
+        help="Maximum number of streamed text chunks kept per summary role.",
+        default=StreamLimits().max_chunks_per_role,
+    )
+
+    parser.add_argument(
+        "--neuron.max_items_per_event",
+        type=int,
+        help="Maximum number of tweets or search results kept from a single streamed event.",
+        default=StreamLimits().max_items_per_event,
+    )
+
+    parser.add_argument(
+        "--neuron.incremental_token_counting",
+        action="store_true",
+        help="Counts tokens of streamed text chunks as they arrive, so the streaming penalty is ready when a stream closes.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.speculative_verification",
+        action="store_true",
+        help="Draws and starts fetching the tweet verification sample of every miner as soon as it finishes streaming.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--neuron.stream_concurrency",
+        type=int,
+        help="Maximum number of miner streams drained at the same time for models with short execution time.",
+        default=15,
+    )
+
+    parser.add_argument(
+        "--neuron.organic_quorum",
+        type=int,
+        help="Number of successful miner responses after which organic link searches return, the rest are collected for scoring only. A value of 0 waits for all miners.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--neuron.organic_quorum_deadline",
+        type=float,
+        help="Seconds after which organic link searches return with the responses received so far when quorum is enabled. Defaults to the model execution time.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--neuron.organic_hedge_delay",
+        type=float,
+        help="Seconds without tokens from the organic miner after which a second miner is queried, whichever streams tokens first is returned to the user. A value of 0 disables hedging.",
+        default=0,
+    )
+
+    parser.add_argument(
+        "--neuron.dendrite_pool_size",
+        type=int,
+        help="Maximum number of dendrites used to query miners, each dendrite has its own connection pool.",
+        default=3,
+    )
+
+    parser.add_argument(
+        "--neuron.axons_per_dendrite",
+        type=int,
+        help="Number of queried miners per dendrite, the dendrite pool grows with the number of miners up to its maximum size.",
+        default=80,
+    )
+
+    parser.add_argument(
+        "--neuron.dendrite_connection_limit",
+        type=int,
+        help="Maximum number of open connections of a dendrite.",
+        default=100,
+    )
+
+    parser.add_argument(
+        "--neuron.dendrite_keepalive_timeout",
+        type=float,
+        help="Seconds an idle dendrite connection is kept open for reuse.",
+        default=15,
+    )
+
+    parser.add_argument(
+        "--neuron.liveness_ttl",
+        type=float,
+        help="Seconds after which a responsive miner is probed with IsAlive again, queries answered by the miner reset the timer. Capped at the available UIDs update interval.",
+        default=600,
+    )
+
+    parser.add_argument(
+        "--neuron.liveness_probe_concurrency",
+        type=int,
+        help="Maximum number of IsAlive probes in flight at the same time.",
+        default=64,
+    )
+
     # parser.add_argument(
     #     "--neuron.save_logs",
     #     type=str2bool,
@@ -4,7 +4,7 @@ from neurons.validators.utils.tasks import Task
 from neurons.validators.penalty.penalty import BasePenaltyModel, PenaltyModelType
 import bittensor as bt
 from datura.protocol import ScraperStreamingSynapse
-import tiktoken
+from neurons.validators.reward.response_analysis import get_response_analysis
 
 
 MAX_TOKENS_PER_CHUNK = 2
@@ -20,23 +20,14 @@ class StreamingPenaltyModel(BasePenaltyModel):
         self, responses: List[ScraperStreamingSynapse], tasks: List[Task]
     ) -> torch.FloatTensor:
         accumulated_penalties = torch.zeros(len(responses), dtype=torch.float32)
-        encoding = tiktoken.get_encoding("cl100k_base")
 
         for index, response in enumerate(responses):
-            streamed_text_chunks = []
+            token_counts = get_response_analysis(response).chunk_token_counts
 
-            for chunks in response.text_chunks.values():
-                streamed_text_chunks.extend(chunks)
-
-            if not streamed_text_chunks:
+            if not token_counts:
                 accumulated_penalties[index] = 1
                 continue
 
-            token_counts = [
-                (len(encoding.encode(chunk)) if chunk is not None else 0)
-                for chunk in streamed_text_chunks
-            ]
-
             # Apply penalty for exceeding max tokens per chunk
             for token_count in token_counts:
                 if token_count > MAX_TOKENS_PER_CHUNK:
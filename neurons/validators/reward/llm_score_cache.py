@@ -0,0 +1,44 @@
+import os
+import json
+import hashlib
+from typing import Dict, List, Optional
+from neurons.validators.utils.cache import TieredCache
+
+
+LLM_SCORE_CACHE_PATH = os.environ.get("LLM_SCORE_CACHE_PATH", "")
+LLM_SCORE_CACHE_TTL = int(os.environ.get("LLM_SCORE_CACHE_TTL", 7 * 24 * 60 * 60))
+LLM_SCORE_CACHE_SIZE = int(os.environ.get("LLM_SCORE_CACHE_SIZE", 20000))
+LLM_SCORE_CACHE_DISK_SIZE = int(os.environ.get("LLM_SCORE_CACHE_DISK_SIZE", 500000))
+
+
+class LLMScoreCache(TieredCache):
+    """Content addressed cache of LLM scoring responses.
+    Keys are hashes of the full message list together with model and sampling parameters,
+    so the same content scored with the same prompt is sent to the LLM only once per TTL.
+    In-memory LRU is checked first, then the SQLite store shared across validator restarts
+    when disk persistence is enabled by LLM_SCORE_CACHE_PATH.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = LLM_SCORE_CACHE_PATH,
+        ttl: int = LLM_SCORE_CACHE_TTL,
+        maxsize: int = LLM_SCORE_CACHE_SIZE,
+        max_disk_entries: int = LLM_SCORE_CACHE_DISK_SIZE,
+    ):
+        super().__init__(
+            name="llm_scores",
+            path=path,
+            ttl=ttl,
+            maxsize=maxsize,
+            max_disk_entries=max_disk_entries,
+        )
+
+    @staticmethod
+    def make_key(messages: List[Dict[str, str]], **params) -> str:
+        payload = json.dumps(
+            {"messages": messages, **params},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
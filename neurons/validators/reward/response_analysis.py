@@ -0,0 +1,229 @@
+import re
+import bisect
+import pytz
+import tiktoken
+import bittensor as bt
+from datetime import datetime
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional, Tuple
+from datura.protocol import ScraperStreamingSynapse
+from datura.services.web_search_utils import WebSearchUtils
+
+
+pattern_to_check = r"<(?:Question|/Question|Answer|/Answer|Score|/Score)>|SM(?:[-_ ]SCS)?[-_ ]?(?:RDD|PNK|BLE|GRY|GRN)"
+pattern_to_check_regex = re.compile(pattern_to_check, flags=re.IGNORECASE)
+
+url_regex = re.compile(r"https?://[^\s'\"<>]+")
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+_encoding = None
+
+
+def get_encoding():
+    """Loads the tokenizer used by the streaming penalty only once per process."""
+    global _encoding
+
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding("cl100k_base")
+
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    return len(get_encoding().encode(text))
+
+
+def count_chunks_tokens(chunks: List[Optional[str]]) -> Tuple[int, ...]:
+    """Counts tokens of every chunk, encoding all non-empty chunks in one batch."""
+    texts = [chunk for chunk in chunks if chunk]
+    token_counts = iter(
+        [len(tokens) for tokens in get_encoding().encode_batch(texts)] if texts else []
+    )
+
+    return tuple(next(token_counts) if chunk else 0 for chunk in chunks)
+
+
+def has_invalid_pattern(text: str) -> bool:
+    return pattern_to_check_regex.search(text) is not None
+
+
+def get_link_domain(url: str) -> Optional[str]:
+    """Returns main domain of the link, e.g. www.reddit.com/r/... -> reddit.com"""
+    try:
+        domain_parts = url.split("/")[2].split(".")
+        return ".".join(domain_parts[-2:])
+    except IndexError:
+        return None
+
+
+def collect_urls(payload: Any) -> Tuple[str, ...]:
+    """Returns sorted normalized URLs found in any string of a search results payload."""
+    urls = set()
+    values = [payload]
+
+    while values:
+        value = values.pop()
+
+        if isinstance(value, str):
+            if value.startswith("http") and len(value.split()) == 1:
+                urls.add(WebSearchUtils.normalize_url(value))
+            elif "http" in value:
+                urls.update(
+                    WebSearchUtils.normalize_url(url.rstrip(".,;"))
+                    for url in url_regex.findall(value)
+                )
+        elif isinstance(value, dict):
+            values.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            values.extend(value)
+
+    return tuple(sorted(urls))
+
+
+def contains_url(urls: Tuple[str, ...], url: str) -> bool:
+    """Checks if the normalized URL is contained in any of the sorted URLs.
+    URLs containing it as a substring start with it, so a binary search for the prefix is enough.
+    """
+    url = WebSearchUtils.normalize_url(url)
+    index = bisect.bisect_left(urls, url)
+
+    return index < len(urls) and urls[index].startswith(url)
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, DATE_FORMAT).replace(tzinfo=pytz.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class ResponseAnalysis:
+    """Facts derived once from a final miner response and shared by all reward and penalty models."""
+
+    is_successful: bool
+    successful_completion: Optional[str]
+    successful_twitter_completion: Optional[str]
+    successful_search_summary_completion: Optional[str]
+    completions: Mapping[str, str]
+    search_completion: Mapping[str, str]
+    links_expected: int
+    completion_links: Tuple[str, ...]
+    search_links: Tuple[str, ...]
+    search_links_per_summary: Mapping[str, Tuple[str, ...]]
+    link_domains: Mapping[str, Optional[str]]
+    search_result_urls: Tuple[str, ...]
+    domain_search_result_urls: Mapping[str, Tuple[str, ...]]
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    chunk_token_counts: Tuple[int, ...]
+
+
+def validate_completion(
+    response: ScraperStreamingSynapse, completion: Optional[str]
+) -> Optional[str]:
+    if not completion:
+        return None
+
+    completion = completion.strip()
+
+    if has_invalid_pattern(completion):
+        bt.logging.info(f"Pattern validation issue Hotkey ID: {response.axon.hotkey}.")
+        return None
+
+    return completion
+
+
+def analyze_response(response: ScraperStreamingSynapse) -> ResponseAnalysis:
+    is_successful = response.dendrite.status_code == 200
+
+    completions = response.get_all_completions()
+    search_completion, links_expected = response.get_search_completion()
+    search_links, search_links_per_summary = response.get_search_links()
+    search_summary = "\n".join(search_completion.values())
+
+    successful_completion = None
+    successful_twitter_completion = None
+    successful_search_summary_completion = None
+
+    if is_successful:
+        successful_completion = validate_completion(
+            response, response.completion or ""
+        )
+
+        if response.completion_links:
+            successful_twitter_completion = validate_completion(
+                response, response.get_twitter_completion()
+            )
+
+        if search_summary.strip() and response.completion:
+            successful_search_summary_completion = validate_completion(
+                response, search_summary
+            )
+
+    # Counted while streaming when enabled, otherwise all chunks are encoded in one batch
+    chunk_token_counts = response.get_chunk_token_counts()
+
+    if chunk_token_counts is None:
+        chunk_token_counts = count_chunks_tokens(
+            [chunk for chunks in response.text_chunks.values() for chunk in chunks]
+        )
+
+    domain_search_result_urls = {
+        "arxiv.org": collect_urls(response.arxiv_search_results),
+        "wikipedia.org": collect_urls(response.wikipedia_search_results),
+        "reddit.com": collect_urls(response.reddit_search_results),
+        "ycombinator.com": collect_urls(response.hacker_news_search_results),
+        "youtube.com": collect_urls(response.youtube_search_results),
+    }
+
+    return ResponseAnalysis(
+        is_successful=is_successful,
+        successful_completion=successful_completion,
+        successful_twitter_completion=successful_twitter_completion,
+        successful_search_summary_completion=successful_search_summary_completion,
+        completions=MappingProxyType(completions),
+        search_completion=MappingProxyType(search_completion),
+        links_expected=links_expected,
+        completion_links=tuple(response.completion_links or []),
+        search_links=tuple(search_links),
+        search_links_per_summary=MappingProxyType(
+            {key: tuple(links) for key, links in search_links_per_summary.items()}
+        ),
+        link_domains=MappingProxyType(
+            {link: get_link_domain(link) for link in search_links}
+        ),
+        search_result_urls=collect_urls(response.search_results),
+        domain_search_result_urls=MappingProxyType(domain_search_result_urls),
+        start_date=parse_date(response.start_date),
+        end_date=parse_date(response.end_date),
+        chunk_token_counts=chunk_token_counts,
+    )
+
+
+def get_response_analysis(response: ScraperStreamingSynapse) -> ResponseAnalysis:
+    """Returns the analysis stored by analyze_responses, responses not analyzed yet are analyzed without storing."""
+    analysis = response.get_response_analysis()
+
+    if analysis is None:
+        analysis = analyze_response(response)
+
+    return analysis
+
+
+def analyze_responses(
+    responses: List[ScraperStreamingSynapse],
+) -> List[ResponseAnalysis]:
+    """Pre-scoring pass, builds analysis of final responses before reward and penalty models run."""
+    analyses = []
+
+    for response in responses:
+        # Fields of the final synapse are assigned in place, values derived while streaming are stale
+        response.clear_cached()
+        analysis = analyze_response(response)
+        response.set_response_analysis(analysis)
+        analyses.append(analysis)
+
+    return analyses
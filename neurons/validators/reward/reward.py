@@ -18,11 +18,13 @@
 
 import torch
 import bittensor as bt
-from typing import List, Union
+import time
+from typing import Dict, List, Tuple, Union
 from abc import abstractmethod
 from dataclasses import dataclass, asdict, fields
 from datura.protocol import ScraperStreamingSynapse, TwitterSearchSynapse
-import re
+from .config import RewardModelType
+from .response_analysis import get_response_analysis, validate_completion
 import numpy as np  # Ensure numpy is imported
 import asyncio
 from itertools import islice
@@ -35,23 +37,24 @@ class BaseRewardEvent:
 
     @staticmethod
     def parse_reward_events(reward_events):
+        """Converts reward events to columns, one list of values per field."""
         if reward_events == None or len(reward_events) == 0:
             field_names = [field.name for field in fields(BaseRewardEvent())]
             empty_reward_event = dict(zip(field_names, [[]] * len(field_names)))
             return empty_reward_event
 
         field_names = [field.name for field in fields(reward_events[0])]
-        reward_events = [
-            asdict(reward_event).values() for reward_event in reward_events
-        ]
-        reward_event = dict(zip(field_names, list(zip(*reward_events))))
-        return reward_event
-
 
-pattern_to_check = r"<(?:Question|/Question|Answer|/Answer|Score|/Score)>|SM(?:[-_ ]SCS)?[-_ ]?(?:RDD|PNK|BLE|GRY|GRN)"
+        return {
+            name: [getattr(reward_event, name) for reward_event in reward_events]
+            for name in field_names
+        }
 
 
 class BaseRewardModel:
+    # Reward models that must be applied first, e.g. to fill validator tweets and links
+    dependencies: List[RewardModelType] = []
+
     @property
     @abstractmethod
     def name(self) -> str: ...
@@ -79,63 +82,46 @@ class BaseRewardModel:
 
         # Identify rewards that are initially 0
         zero_mask = rewards == 0
+        non_zero_mask = ~zero_mask
 
-        # Min-max normalize rewards to scale between 0 and 1
-        min_reward = (
-            torch.min(rewards[~zero_mask]) if rewards[~zero_mask].nelement() > 0 else 0
-        )
-        max_reward = (
-            torch.max(rewards[~zero_mask]) if rewards[~zero_mask].nelement() > 0 else 1
-        )
+        # Non-zero rewards are selected once and written back once
+        non_zero_rewards = rewards[non_zero_mask]
 
-        # Check if all non-zero rewards are the same
-        if min_reward == max_reward:
-            rewards[~zero_mask] = 1  # Set all non-zero rewards to 1
-        else:
-            epsilon = 1e-10
-            rewards[~zero_mask] = (rewards[~zero_mask] - min_reward) / (
-                max(max_reward - min_reward, epsilon)
-            )
+        if non_zero_rewards.nelement() > 0:
+            # Min-max normalize rewards to scale between 0 and 1
+            min_reward, max_reward = torch.aminmax(non_zero_rewards)
 
-            # Apply a more aggressive exponential function to exaggerate differences
-            exaggeration_factor = 4
-            rewards[~zero_mask] = torch.pow(
-                rewards[~zero_mask] * exaggeration_factor, exaggeration_factor
-            )
+            # Check if all non-zero rewards are the same
+            if min_reward == max_reward:
+                non_zero_rewards = torch.ones_like(non_zero_rewards)
+            else:
+                epsilon = 1e-10
+                non_zero_rewards = (non_zero_rewards - min_reward) / torch.clamp(
+                    max_reward - min_reward, min=epsilon
+                )
+
+                # Apply a more aggressive exponential function to exaggerate differences
+                exaggeration_factor = 4
+                non_zero_rewards = torch.pow(
+                    non_zero_rewards * exaggeration_factor, exaggeration_factor
+                )
+
+                # Re-scale to ensure the top score is close to 1 after exponential exaggeration
+                non_zero_rewards /= torch.max(non_zero_rewards)
 
-            # Re-scale to ensure the top score is close to 1 after exponential exaggeration
-            if rewards[~zero_mask].nelement() > 0:
-                rewards[~zero_mask] /= torch.max(rewards[~zero_mask])
+            rewards[non_zero_mask] = non_zero_rewards
 
         # Ensure rewards that were initially 0 remain 0
-        rewards[zero_mask] = 0
+        rewards.masked_fill_(zero_mask, 0)
 
         return rewards
 
     def validate_successful_completion(self, response, completion: str):
-        if response.dendrite.status_code == 200 and completion:
-            if re.search(pattern_to_check, completion, flags=re.IGNORECASE):
-                bt.logging.info(
-                    f"Pattern validation issue Hotkey ID: {response.axon.hotkey}."
-                )
-                return None
-
-            return completion.strip()
-
-    def get_successful_completion(self, response: ScraperStreamingSynapse):
-        # Check if the response is successful.
         if response.dendrite.status_code == 200:
-            # Get the completion from the successful response.
-            successful_completion = response.completion.strip()
+            return validate_completion(response, completion)
 
-            if re.search(pattern_to_check, successful_completion, flags=re.IGNORECASE):
-                bt.logging.info(
-                    f"Pattern validation issue Hotkey ID: {response.axon.hotkey}."
-                )
-                return None
-
-            return successful_completion.strip()
-        return None
+    def get_successful_completion(self, response: ScraperStreamingSynapse):
+        return get_response_analysis(response).successful_completion
 
     def get_successful_result(self, response: TwitterSearchSynapse):
         """
@@ -167,19 +153,7 @@ class BaseRewardModel:
         ]
 
     def get_successful_twitter_completion(self, response: ScraperStreamingSynapse):
-        # Check if the response is successful.
-        if response.dendrite.status_code == 200 and response.completion_links:
-            # Get the completion from the successful response.
-            successful_completion = response.get_twitter_completion().strip()
-
-            if re.search(pattern_to_check, successful_completion, flags=re.IGNORECASE):
-                bt.logging.info(
-                    f"Pattern validation issue Hotkey ID: {response.axon.hotkey}."
-                )
-                return None
-
-            return successful_completion.strip()
-        return None
+        return get_response_analysis(response).successful_twitter_completion
 
     def get_successful_completions_for_summary(
         self, responses: List[ScraperStreamingSynapse]
@@ -215,26 +189,7 @@ class BaseRewardModel:
     def get_successful_search_summary_completion(
         self, response: ScraperStreamingSynapse
     ):
-        # Check if the response is successful.
-        search_completion_dict, _ = response.get_search_completion()
-        search_completion = "\n".join(search_completion_dict.values())
-
-        if (
-            response.dendrite.status_code == 200
-            and search_completion
-            and response.completion
-        ):
-            # Get the completion from the successful response.
-            successful_completion = search_completion.strip()
-
-            if re.search(pattern_to_check, successful_completion, flags=re.IGNORECASE):
-                bt.logging.info(
-                    f"Pattern validation issue Hotkey ID: {response.axon.hotkey}."
-                )
-                return None
-
-            return successful_completion.strip()
-        return None
+        return get_response_analysis(response).successful_search_summary_completion
 
     def get_successful_search_completions(
         self, responses: List[ScraperStreamingSynapse]
@@ -268,18 +223,20 @@ class BaseRewardModel:
 
         # Reward each completion.
         reward_events = BaseRewardEvent.parse_reward_events(reward_events)
-        successful_rewards = reward_events
         successful_rewards = torch.tensor(
             reward_events.pop("reward"), dtype=torch.float32
         )
 
         # Penalize responses that failed the organic query.
         if organic_penalties:
-            for idx, (_, has_penalty) in enumerate(
-                zip(successful_rewards, organic_penalties)
-            ):
-                if has_penalty:
-                    successful_rewards[idx] = torch.tensor(0.0, dtype=torch.float32)
+            penalties_count = min(len(successful_rewards), len(organic_penalties))
+            penalty_mask = torch.tensor(
+                [bool(has_penalty) for has_penalty in organic_penalties],
+                dtype=torch.bool,
+            )
+            successful_rewards[:penalties_count].masked_fill_(
+                penalty_mask[:penalties_count], 0.0
+            )
 
         original_rewards = successful_rewards.tolist()
 
@@ -287,22 +244,35 @@ class BaseRewardModel:
         if self.is_default_normalization:
             successful_rewards_normalized = self.normalize_rewards(successful_rewards)
         else:
-            successful_rewards_normalized = original_rewards
+            successful_rewards_normalized = torch.tensor(
+                original_rewards, dtype=torch.float32
+            )
+
+        # Init zero rewards for all calls and scatter rewards of successful calls.
+        indices = torch.tensor(successful_completions_indices, dtype=torch.long)
 
-        # Init zero rewards for all calls.
-        filled_rewards = torch.ones(len(responses), dtype=torch.float32) * torch.nan
+        filled_rewards = torch.full((len(responses),), torch.nan, dtype=torch.float32)
         filled_rewards_normalized = torch.zeros(len(responses), dtype=torch.float32)
 
-        for idx in successful_completions_indices:
-            filled_rewards[idx] = successful_rewards[idx]
-            filled_rewards_normalized[idx] = successful_rewards_normalized[idx]
+        filled_rewards[indices] = successful_rewards[indices]
+        filled_rewards_normalized[indices] = successful_rewards_normalized[indices]
+
+        # Fill every item of the reward_events, values are assigned to successful calls in order
+        positions = [None] * len(responses)
+
+        for position, idx in enumerate(successful_completions_indices):
+            positions[idx] = position
 
-        # Fill every item of the reward_events
         for name, reward_values in reward_events.items():
-            filled_values = [None] * len(responses)
-            for idx, reward_value in zip(successful_completions_indices, reward_values):
-                filled_values[idx] = reward_value
-            reward_events[name] = filled_values
+            values_count = len(reward_values)
+            reward_events[name] = [
+                (
+                    reward_values[position]
+                    if position is not None and position < values_count
+                    else None
+                )
+                for position in positions
+            ]
 
         # Name each item of the reward event with the reward model name.
         reward_events = {f"{self.name}_{k}": v for k, v in reward_events.items()}
@@ -392,3 +362,49 @@ class BaseRewardModel:
             )
             results.extend(batch_results)
         return results
+
+
+async def apply_reward_functions(
+    reward_functions: List[BaseRewardModel],
+    responses: List[ScraperStreamingSynapse],
+    uids,
+    organic_penalties: List[bool] = [],
+) -> List[Tuple[tuple, float]]:
+    """Applies reward functions concurrently, each one waits only for the reward functions it depends on.
+    Returns results of apply in the order of reward functions together with their execution time.
+    Raises ValueError if a dependency is not among reward functions, if any reward function fails
+    the others are cancelled and the error is raised.
+    """
+    names = {reward_fn.name for reward_fn in reward_functions}
+
+    for reward_fn in reward_functions:
+        for dependency in reward_fn.dependencies:
+            if dependency.value not in names:
+                raise ValueError(
+                    f"Reward function {reward_fn.name} depends on {dependency.value}, which is not applied"
+                )
+
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def apply_reward_function(reward_fn: BaseRewardModel):
+        dependencies = [tasks[dependency.value] for dependency in reward_fn.dependencies]
+
+        if dependencies:
+            await asyncio.gather(*dependencies)
+
+        start_time = time.time()
+        result = await reward_fn.apply(responses, uids, organic_penalties)
+        return result, time.time() - start_time
+
+    for reward_fn in reward_functions:
+        tasks[reward_fn.name] = asyncio.create_task(apply_reward_function(reward_fn))
+
+    try:
+        return await asyncio.gather(*tasks.values())
+    except BaseException:
+        # Reward functions still running would keep calling LLMs and scrapers for nothing
+        for task in tasks.values():
+            task.cancel()
+
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
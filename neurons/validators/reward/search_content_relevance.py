@@ -1,13 +1,21 @@
-from typing import List
+from typing import List, Optional
 from .reward import BaseRewardModel, BaseRewardEvent
+from .response_analysis import get_response_analysis, get_link_domain, contains_url
+from .verification_pipeline import VerificationPipeline
 from .config import RewardModelType
 from neurons.validators.reward.reward_llm import RewardLLM
 from datura.protocol import ScraperStreamingSynapse
 import traceback
 import bittensor as bt
 from datura.utils import clean_text
+from datura.services.web_search_utils import WebSearchUtils
 from neurons.validators.apify.cheerio_scraper_actor import CheerioScraperActor
 from neurons.validators.apify.reddit_scraper_actor import RedditScraperActor
+from neurons.validators.utils.link_metadata_cache import link_metadata_cache
+from neurons.validators.utils.verification_trust import (
+    get_sample_average_score,
+    verification_trust,
+)
 import asyncio
 from neurons.validators.utils.prompts import (
     SearchSummaryRelevancePrompt,
@@ -32,13 +40,17 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
 
         self.scoring_type = scoring_type
 
-    async def llm_process_validator_links(self, response: ScraperStreamingSynapse):
-        if not response.validator_links:
-            return {}
+    def get_validator_links_scoring_messages(
+        self,
+        response: ScraperStreamingSynapse,
+        validator_links: Optional[List[dict]] = None,
+    ) -> List[dict]:
+        if validator_links is None:
+            validator_links = response.validator_links
 
         scoring_messages = []
 
-        for validator_link in response.validator_links:
+        for validator_link in validator_links:
             url = validator_link.get("url")
             title = validator_link.get("title", "")
             description = validator_link.get("description", "")
@@ -52,54 +64,142 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
                 _, scoring_text = result
                 scoring_messages.append({url: scoring_text})
 
-        score_responses = await self.reward_llm.llm_processing(scoring_messages)
-        return score_responses
+        return scoring_messages
 
     async def scrape_with_retries(
-        self, urls, scraper_actor_class, group_size, max_attempts
+        self, urls, scraper_actor_class, group_size, max_attempts, on_fetched=None
     ):
-        fetched_links_with_metadata = []
-        non_fetched_links = urls.copy()
-        attempt = 1
+        """Scrapes metadata of the links with the actor, retrying links that were not fetched.
+        on_fetched is called with every batch of links as soon as it is available.
+        """
+
+        def notify(links):
+            if on_fetched:
+                on_fetched([link for link in links if link.get("url")])
+
+        # Links scraped in previous rounds are served from the cache, only misses go to Apify
+        fetched_links_with_metadata, cached_failed_links, non_fetched_links = (
+            await link_metadata_cache.get_links(urls)
+        )
+
+        if fetched_links_with_metadata or cached_failed_links:
+            bt.logging.info(
+                f"Found {len(fetched_links_with_metadata)} links and {len(cached_failed_links)} failed links "
+                f"in the cache for {scraper_actor_class.__name__}, fetching {len(non_fetched_links)} links. "
+                f"Link metadata cache stats: {link_metadata_cache.get_metrics()}"
+            )
+            notify(list(fetched_links_with_metadata))
+
+        # Links other scoring tasks are scraping right now are awaited instead of scraped again
+        url_to_key = {
+            url: WebSearchUtils.normalize_url(url) for url in non_fetched_links
+        }
+        claimed_keys, in_flight = link_metadata_cache.in_flight.claim(
+            url_to_key.values()
+        )
+        in_flight_links = [url for url, key in url_to_key.items() if key in in_flight]
+        non_fetched_links = [
+            url for url, key in url_to_key.items() if key not in in_flight
+        ]
 
-        while attempt <= max_attempts and non_fetched_links:
+        if in_flight_links:
             bt.logging.info(
-                f"Attempt {attempt}/{max_attempts} for {scraper_actor_class.__name__}, processing {len(non_fetched_links)} links."
+                f"Waiting for {len(in_flight_links)} links already being scraped."
             )
 
-            url_groups = [
-                non_fetched_links[i : i + group_size]
-                for i in range(0, len(non_fetched_links), group_size)
-            ]
+        cached_links_count = len(fetched_links_with_metadata)
+        # Actors return [] on any error and do not report failed links, a link is only cached
+        # as failed when it was missing from a run that returned results on every attempt
+        missing_counts = {}
+        attempt = 1
 
-            tasks = [
-                asyncio.create_task(scraper_actor_class().scrape_metadata(urls=group))
-                for group in url_groups
-            ]
+        try:
+            while attempt <= max_attempts and non_fetched_links:
+                bt.logging.info(
+                    f"Attempt {attempt}/{max_attempts} for {scraper_actor_class.__name__}, processing {len(non_fetched_links)} links."
+                )
 
-            # Wait for tasks to complete
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+                url_groups = [
+                    non_fetched_links[i : i + group_size]
+                    for i in range(0, len(non_fetched_links), group_size)
+                ]
 
-            # Combine results and handle exceptions
-            for result in results:
-                if isinstance(result, Exception):
-                    bt.logging.error(
-                        f"Error in {scraper_actor_class.__name__} scraper attempt {attempt}: {str(result)}"
+                tasks = [
+                    asyncio.create_task(
+                        scraper_actor_class().scrape_metadata(urls=group)
                     )
-                    continue
-                fetched_links_with_metadata.extend(result)
+                    for group in url_groups
+                ]
 
-            # Update non-fetched links
-            fetched_urls = {link.get("url") for link in fetched_links_with_metadata}
-            non_fetched_links = [
-                url for url in non_fetched_links if url not in fetched_urls
-            ]
+                # Wait for tasks to complete
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+
+                # Combine results and handle exceptions
+                for group, result in zip(url_groups, results):
+                    if isinstance(result, Exception):
+                        bt.logging.error(
+                            f"Error in {scraper_actor_class.__name__} scraper attempt {attempt}: {str(result)}"
+                        )
+                        continue
+
+                    fetched_links_with_metadata.extend(result)
+                    notify(result)
+
+                    if result:
+                        result_urls = {link.get("url") for link in result}
+
+                        for url in group:
+                            if url not in result_urls:
+                                missing_counts[url] = missing_counts.get(url, 0) + 1
+
+                # Update non-fetched links
+                fetched_urls = {
+                    link.get("url") for link in fetched_links_with_metadata
+                }
+                non_fetched_links = [
+                    url for url in non_fetched_links if url not in fetched_urls
+                ]
+
+                attempt += 1
+
+            await link_metadata_cache.set_links(
+                fetched_links_with_metadata[cached_links_count:],
+                failed_urls=[
+                    url
+                    for url in non_fetched_links
+                    if missing_counts.get(url) == max_attempts
+                ],
+            )
+        finally:
+            link_metadata_cache.in_flight.resolve(
+                claimed_keys,
+                {
+                    WebSearchUtils.normalize_url(link["url"]): link
+                    for link in fetched_links_with_metadata[cached_links_count:]
+                    if link.get("url")
+                },
+            )
+
+        shared_links = await link_metadata_cache.in_flight.wait(
+            {url_to_key[url]: in_flight[url_to_key[url]] for url in in_flight_links}
+        )
 
-            attempt += 1
+        shared_links_with_metadata = []
 
-        return fetched_links_with_metadata, non_fetched_links
+        for url in in_flight_links:
+            link = shared_links.get(url_to_key[url])
+
+            if link:
+                shared_links_with_metadata.append({**link, "url": url})
+            else:
+                non_fetched_links.append(url)
+
+        fetched_links_with_metadata.extend(shared_links_with_metadata)
+        notify(shared_links_with_metadata)
 
-    async def scrape_links_with_retries(self, urls):
+        return fetched_links_with_metadata, non_fetched_links + cached_failed_links
+
+    async def scrape_links_with_retries(self, urls, on_fetched=None):
         # Separate Reddit URLs from other URLs
         reddit_urls = []
         other_urls = []
@@ -110,33 +210,37 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
             else:
                 other_urls.append(url)
 
-        # Scrape Reddit URLs with retries
-        reddit_fetched_links_with_metadata = []
-        reddit_non_fetched_links = []
+        async def no_links():
+            return [], []
 
-        if reddit_urls:
-            reddit_fetched_links_with_metadata, reddit_non_fetched_links = (
-                await self.scrape_with_retries(
+        # Scrape Reddit and other URLs with retries, both actors run at the same time
+        (
+            (reddit_fetched_links_with_metadata, reddit_non_fetched_links),
+            (other_fetched_links_with_metadata, other_non_fetched_links),
+        ) = await asyncio.gather(
+            (
+                self.scrape_with_retries(
                     urls=reddit_urls,
                     scraper_actor_class=RedditScraperActor,
                     group_size=200,
                     max_attempts=2,
+                    on_fetched=on_fetched,
                 )
-            )
-
-        # Scrape other URLs with retries
-        other_fetched_links_with_metadata = []
-        other_non_fetched_links = []
-
-        if other_urls:
-            other_fetched_links_with_metadata, other_non_fetched_links = (
-                await self.scrape_with_retries(
+                if reddit_urls
+                else no_links()
+            ),
+            (
+                self.scrape_with_retries(
                     urls=other_urls,
                     scraper_actor_class=CheerioScraperActor,
                     group_size=100,
                     max_attempts=2,
+                    on_fetched=on_fetched,
                 )
-            )
+                if other_urls
+                else no_links()
+            ),
+        )
 
         # Combine non-fetched links
         non_fetched_links = reddit_non_fetched_links + other_non_fetched_links
@@ -163,12 +267,12 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
 
         for response, random_links in zip(responses, responses_random_links):
             # Extract random links from each summary (Search, Reddit, Hacker News)
-            completion = self.get_successful_search_summary_completion(response)
+            analysis = get_response_analysis(response)
 
-            if not completion:
+            if not analysis.successful_search_summary_completion:
                 continue
 
-            _, links_per_summary = response.get_search_links()
+            links_per_summary = analysis.search_links_per_summary
 
             # If scoring single summary 2 link is selected, for 2 or 3 summaries 1 link is selected from each
             random_links_per_summary = 2 if len(links_per_summary) == 1 else 1
@@ -183,6 +287,16 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
                     )
                 )
 
+            if links:
+                # Trusted miners get smaller samples, rewards are scaled back by the ratio
+                sample_size = verification_trust.get_sample_size(
+                    response.axon.hotkey, len(links)
+                )
+                response.set_verification_sample_ratio(
+                    self.name, sample_size / len(links)
+                )
+                links = random.sample(links, sample_size)
+
             random_links.extend(links)
             all_links.extend(links)
 
@@ -194,22 +308,52 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
 
         bt.logging.info(f"Fetching {len(unique_links)} unique web links.")
 
-        links_with_metadata, non_fetched_links = await self.scrape_links_with_retries(
-            unique_links
-        )
+        fetched_urls = set()
 
-        for response, random_links in zip(responses, responses_random_links):
-            for link_with_metadata in links_with_metadata:
-                url = link_with_metadata.get("url")
+        async def score_links(links_with_metadata: List[dict]):
+            links_with_metadata = list(
+                {
+                    link["url"]: link
+                    for link in links_with_metadata
+                    if link["url"] not in fetched_urls
+                }.values()
+            )
+            fetched_urls.update(link["url"] for link in links_with_metadata)
+
+            validator_links_per_response = []
+
+            for response, random_links in zip(responses, responses_random_links):
+                validator_links = [
+                    link for link in links_with_metadata if link["url"] in random_links
+                ]
+                response.validator_links.extend(validator_links)
+                validator_links_per_response.append(validator_links)
+
+            # Same link cited by several miners for the same prompt is scored once
+            return await self.reward_llm.llm_processing_per_response(
+                [
+                    self.get_validator_links_scoring_messages(response, validator_links)
+                    for response, validator_links in zip(
+                        responses, validator_links_per_response
+                    )
+                ]
+            )
 
-                if url in random_links:
-                    response.validator_links.append(link_with_metadata)
+        # Every batch of links returned by Apify is scored while other batches are fetched
+        pipeline = VerificationPipeline(
+            name=self.name, responses_count=len(responses), score=score_links
+        )
+        _, val_score_responses_list = await pipeline.run(
+            self.scrape_links_with_retries(unique_links, on_fetched=pipeline.submit)
+        )
+
+        non_fetched_links = [link for link in unique_links if link not in fetched_urls]
 
         end_time = time.time()
         bt.logging.info(
-            f"Fetched Web links method took {end_time - start_time} seconds. "
+            f"Fetched and scored Web links method took {end_time - start_time} seconds. "
             f"All links count: {len(all_links)}, Unique links count: {len(unique_links)}, "
-            f"APIFY fetched web links count: {len(links_with_metadata)}"
+            f"APIFY fetched web links count: {len(fetched_urls)}"
         )
 
         bt.logging.info(
@@ -220,21 +364,13 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
                 f"Unique Web Links Amount: {len(unique_links)}; List: {unique_links};"
             )
 
-        val_score_responses_list = await self.process_response_items_in_batches(
-            responses=responses,
-            batch_size=20,
-            process_function=self.llm_process_validator_links,
-        )
-
         return val_score_responses_list
 
     def check_response_random_link(self, response: ScraperStreamingSynapse):
         try:
-            completion = self.get_successful_search_summary_completion(
-                response=response
-            )
+            analysis = get_response_analysis(response)
 
-            if not completion:
+            if not analysis.successful_search_summary_completion:
                 return 0
 
             search_completion_links = response.search_completion_links
@@ -248,15 +384,8 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
                 return 0
 
             # Web search results are separate because they include links with different domains from search
-            web_search_results = str(response.search_results)
-
-            domain_to_search_result = {
-                "arxiv.org": response.arxiv_search_results,
-                "wikipedia.org": response.wikipedia_search_results,
-                "reddit.com": response.reddit_search_results,
-                "ycombinator.com": response.hacker_news_search_results,
-                "youtube.com": response.youtube_search_results,
-            }
+            web_search_urls = analysis.search_result_urls
+            domain_to_search_urls = analysis.domain_search_result_urls
 
             link_scores = []
 
@@ -267,19 +396,17 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
                     link_scores.append(0)
                     continue
 
-                domain_parts = url.split("/")[2].split(".")
-                domain = ".".join(domain_parts[-2:])  # Extract the main domain
-
-                if domain in domain_to_search_result:
-                    if (
-                        url in str(domain_to_search_result[domain])
-                        or url in web_search_results
-                    ):
-                        link_scores.append(1)
-                    else:
-                        link_scores.append(0)
+                if url in analysis.link_domains:
+                    domain = analysis.link_domains[url]
                 else:
-                    link_scores.append(1 if url in web_search_results else 0)
+                    domain = get_link_domain(url)
+
+                if contains_url(web_search_urls, url) or contains_url(
+                    domain_to_search_urls.get(domain, ()), url
+                ):
+                    link_scores.append(1)
+                else:
+                    link_scores.append(0)
 
             if link_scores:
                 return sum(link_scores) / len(link_scores)
@@ -336,6 +463,10 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
                 self.check_response_random_link(response) for response in responses
             ]
 
+            for score, response in zip(scores, responses):
+                if response.validator_links:
+                    verification_trust.observe(response.axon.hotkey, score)
+
             reward_events = []
             scoring_prompt = SearchSummaryRelevancePrompt()
 
@@ -361,9 +492,7 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
                 response_scores = {}
                 total_score = 0
                 num_links = len(response.validator_links)
-                _, links_expected = response.get_search_completion()
-
-                max_links_considered = max(num_links, links_expected)
+                links_expected = get_response_analysis(response).links_expected
 
                 if num_links > 0:
                     for val_link in response.validator_links:
@@ -376,7 +505,13 @@ class WebSearchContentRelevanceModel(BaseRewardModel):
                                 response_scores[val_url] = score
 
                     if total_score > 0:
-                        average_score = total_score / max_links_considered
+                        # Smaller samples of trusted miners count as the full sample
+                        average_score = get_sample_average_score(
+                            total_score,
+                            num_links,
+                            links_expected,
+                            response.get_verification_sample_ratio(self.name),
+                        )
                         reward_event.reward = self.calculate_adjusted_score(
                             links_count=len(response.search_completion_links),
                             score=average_score,
@@ -25,6 +25,7 @@ import re
 from typing import List, Tuple
 from neurons.validators.reward.config import RewardModelType, RewardScoringType
 from neurons.validators.reward.reward import BaseRewardModel, BaseRewardEvent
+from neurons.validators.reward.response_analysis import get_response_analysis
 from neurons.validators.utils.prompts import (
     SummaryRelevancePrompt,
     LinkContentPrompt,
@@ -33,7 +34,7 @@ from neurons.validators.utils.prompts import (
 
 from datura.protocol import ScraperStreamingSynapse, ScraperTextRole
 from neurons.validators.reward.reward_llm import RewardLLM
-from datura.services.twitter_utils import TwitterUtils
+from datura.services.link_extraction import extract_links, get_tweet_id
 from datura.services.web_search_utils import WebSearchUtils
 import json
 from neurons.validators.reward.config import DefaultSummaryRelevanceWeightConfig
@@ -44,6 +45,12 @@ from datura.protocol import ResultType
 class SummaryRelevanceRewardModel(BaseRewardModel):
     reward_model_name: str = "VMware/open-llama-7b-open-instruct"
 
+    # Link descriptions are compared with validator tweets and links fetched by content models
+    dependencies = [
+        RewardModelType.twitter_content_relevance,
+        RewardModelType.search_content_relevance,
+    ]
+
     @property
     def name(self) -> str:
         return RewardModelType.summary_relavance_match.value
@@ -88,7 +95,7 @@ class SummaryRelevanceRewardModel(BaseRewardModel):
                 scoring_prompt = LinkContentAndDescriptionPrompt()
 
                 # Get completions based on tools used
-                completions, links_expected = response.get_search_completion()
+                completions = get_response_analysis(response).search_completion
 
                 # Fetch the final summary from synapse.texts if available
                 final_summary = response.texts.get("summary", "").strip()
@@ -160,20 +167,37 @@ class SummaryRelevanceRewardModel(BaseRewardModel):
                 continue
 
             is_twitter = summary_key == ScraperTextRole.TWITTER_SUMMARY.value
-            link_with_descriptions = []
+            extracted_links = extract_links(completion)
 
             # Parse markdown links with descriptions from completion
             if is_twitter:
-                link_with_descriptions = (
-                    TwitterUtils().find_twitter_link_with_descriptions(completion or "")
-                )
+                link_with_descriptions = extracted_links.twitter_link_descriptions
             else:
-                link_with_descriptions = WebSearchUtils.find_links_with_descriptions(
-                    completion or ""
-                )
+                link_with_descriptions = extracted_links.links_with_descriptions
 
             scoring_keys = []
 
+            # Index validator tweets by ID and links by canonical URL, first item wins
+            validator_tweets_by_id = {}
+            validator_links_by_url = {}
+
+            if is_twitter:
+                for validator_tweet in response.validator_tweets:
+                    validator_tweets_by_id.setdefault(
+                        str(validator_tweet.id), validator_tweet
+                    )
+            else:
+                for validator_link in response.validator_links:
+                    url = validator_link.get("url")
+
+                    if url:
+                        validator_links_by_url.setdefault(
+                            WebSearchUtils.remove_trailing_slash(url), validator_link
+                        )
+
+            # Cleaned once per tweet, the same tweet can be cited several times
+            cleaned_texts = {}
+
             for link, description in link_with_descriptions:
                 link = WebSearchUtils.remove_trailing_slash(link)
                 text = ""
@@ -181,32 +205,23 @@ class SummaryRelevanceRewardModel(BaseRewardModel):
 
                 # Find validator scraped tweet or link to compare with miner's link description
                 if is_twitter:
-                    validator_tweet = next(
-                        (
-                            validator_tweet
-                            for validator_tweet in response.validator_tweets
-                            if f"{validator_tweet.user.username}/status/{validator_tweet.id}"
-                            in link
-                        ),
-                        None,
-                    )
+                    validator_tweet = validator_tweets_by_id.get(get_tweet_id(link))
 
-                    if not validator_tweet:
+                    if (
+                        not validator_tweet
+                        or f"{validator_tweet.user.username}/status/{validator_tweet.id}"
+                        not in link
+                    ):
                         continue
 
-                    text = clean_text(validator_tweet.text)
+                    if validator_tweet.id not in cleaned_texts:
+                        cleaned_texts[validator_tweet.id] = clean_text(
+                            validator_tweet.text
+                        )
+
+                    text = cleaned_texts[validator_tweet.id]
                 else:
-                    validator_link = next(
-                        (
-                            validator_link
-                            for validator_link in response.validator_links
-                            if WebSearchUtils.remove_trailing_slash(
-                                validator_link.get("url")
-                            )
-                            == link
-                        ),
-                        None,
-                    )
+                    validator_link = validator_links_by_url.get(link)
 
                     if not validator_link:
                         continue
@@ -237,21 +252,8 @@ class SummaryRelevanceRewardModel(BaseRewardModel):
         if not scoring_messages:
             return [0 for _ in responses], scoring_keys_list
 
-        # Process scoring messages in groups to avoid the OpenAI timeouts
-        group_size = 200
-
-        scoring_messages_groups = [
-            scoring_messages[i : i + group_size]
-            for i in range(0, len(scoring_messages), group_size)
-        ]
-
-        score_responses = {}
-
-        for scoring_messages_group in scoring_messages_groups:
-            score_responses_group = await self.reward_llm.llm_processing(
-                scoring_messages_group
-            )
-            score_responses.update(score_responses_group)
+        # Requests are paced by the LLM scheduler, all messages are submitted at once
+        score_responses = await self.reward_llm.llm_processing(scoring_messages)
 
         return score_responses, scoring_keys_list
 
@@ -311,7 +313,7 @@ class SummaryRelevanceRewardModel(BaseRewardModel):
 
             # Same random completion will be used for all responses
             random_summary_key = random.choice(
-                list(responses[0].get_all_completions().keys())
+                list(get_response_analysis(responses[0]).completions.keys())
             )
 
             # Choose random toolkit summary to score
@@ -319,7 +321,7 @@ class SummaryRelevanceRewardModel(BaseRewardModel):
 
             for response in responses:
                 # Get all available completions based on the tools used and choose random summary (Twitter, Search, Reddit, Hacker News)
-                completions = response.get_all_completions()
+                completions = get_response_analysis(response).completions
                 random_completion = completions.get(random_summary_key, "")
 
                 # Check if all summaries are returned
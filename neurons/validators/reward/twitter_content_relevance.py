@@ -23,9 +23,11 @@ import asyncio
 import re
 import html
 import random
-from typing import List
+from typing import List, Optional
 from .config import RewardModelType
-from .reward import BaseRewardModel, BaseRewardEvent, pattern_to_check
+from .reward import BaseRewardModel, BaseRewardEvent
+from .response_analysis import get_response_analysis, has_invalid_pattern
+from .verification_pipeline import VerificationPipeline
 from neurons.validators.utils.prompts import (
     LinkContentPrompt,
 )
@@ -36,6 +38,11 @@ from datura.protocol import (
 from neurons.validators.apify.twitter_scraper_actor import TwitterScraperActor
 from datura.services.twitter_api_wrapper import TwitterAPIClient
 from neurons.validators.reward.reward_llm import RewardLLM
+from neurons.validators.utils.verification_trust import (
+    get_sample_average_score,
+    sample_verification_links,
+    verification_trust,
+)
 from neurons.validators.utils.prompts import LinkContentPrompt
 from datura.utils import (
     clean_text,
@@ -70,13 +77,16 @@ class TwitterContentRelevanceModel(BaseRewardModel):
     def clean_text(self, text):
         return clean_text(text)
 
-    async def llm_process_validator_tweets(self, response: ScraperStreamingSynapse):
-        if not response.validator_tweets:
-            return {}
+    def get_validator_tweets_scoring_messages(
+        self,
+        response: ScraperStreamingSynapse,
+        validator_tweets: Optional[List[TwitterScraperTweet]] = None,
+    ) -> List[dict]:
+        if validator_tweets is None:
+            validator_tweets = response.validator_tweets
 
-        start_llm_time = time.time()
         scoring_messages = []
-        for validator_tweet in response.validator_tweets:
+        for validator_tweet in validator_tweets:
             val_text = validator_tweet.text
             val_tweet_id = validator_tweet.id
             result = self.get_scoring_text(
@@ -85,30 +95,52 @@ class TwitterContentRelevanceModel(BaseRewardModel):
             if result:
                 _, scoring_text = result
                 scoring_messages.append({str(val_tweet_id): scoring_text})
-        score_responses = await self.reward_llm.llm_processing(scoring_messages)
+        return scoring_messages
+
+    async def llm_process_validator_tweets(
+        self,
+        responses: List[ScraperStreamingSynapse],
+        validator_tweets_per_response: List[List[TwitterScraperTweet]],
+    ):
+        start_llm_time = time.time()
+
+        # Same tweet cited by several miners for the same prompt is scored once
+        score_responses_list = await self.reward_llm.llm_processing_per_response(
+            [
+                self.get_validator_tweets_scoring_messages(response, validator_tweets)
+                for response, validator_tweets in zip(
+                    responses, validator_tweets_per_response
+                )
+            ]
+        )
 
         end_llm_time = time.time()
         llm_duration_minutes = (end_llm_time - start_llm_time) / 60
         bt.logging.info(
             f"TwitterContentRelevanceModel LLM process validator tweets took {llm_duration_minutes} minutes."
         )
-        return score_responses
+        return score_responses_list
 
     async def process_tweets(self, responses: List[ScraperStreamingSynapse]):
         default_val_score_responses = [{} for _ in responses]
 
         try:
-            non_fetched_links = {}
             start_time = time.time()
 
             responses_random_links = [[] for _ in responses]
             all_links = []
 
             for response, random_links in zip(responses, responses_random_links):
-                if response.completion_links:
-                    sample_links = random.sample(
-                        response.completion_links,
-                        min(APIFY_LINK_SCRAPE_AMOUNT, len(response.completion_links)),
+                completion_links = get_response_analysis(response).completion_links
+
+                if completion_links:
+                    # Trusted miners get smaller samples, rewards are scaled back by the ratio.
+                    # Sample may already be drawn and prefetched when the miner finished streaming
+                    sample_links = sample_verification_links(
+                        response,
+                        self.name,
+                        list(completion_links),
+                        APIFY_LINK_SCRAPE_AMOUNT,
                     )
                     all_links.extend(sample_links)
                     random_links.extend(sample_links)
@@ -120,24 +152,55 @@ class TwitterContentRelevanceModel(BaseRewardModel):
 
             bt.logging.info(f"Fetching {len(unique_links)} unique Twitter links.")
 
-            tweets_list, non_fetched_links = await scrape_tweets_with_retries(
-                unique_links, group_size=200, max_attempts=4
-            )
+            responses_random_ids = [
+                {self.tw_client.utils.extract_tweet_id(link) for link in random_links}
+                for random_links in responses_random_links
+            ]
+            fetched_tweet_ids = set()
 
-            for response, random_links in zip(responses, responses_random_links):
-                ids = [
-                    self.tw_client.utils.extract_tweet_id(link) for link in random_links
+            async def score_tweets(tweets: List[TwitterScraperTweet]):
+                tweets = [
+                    tweet for tweet in tweets if tweet.id not in fetched_tweet_ids
                 ]
+                fetched_tweet_ids.update(tweet.id for tweet in tweets)
+
+                validator_tweets_per_response = []
+
+                for response, random_ids in zip(responses, responses_random_ids):
+                    validator_tweets = [
+                        tweet for tweet in tweets if tweet.id in random_ids
+                    ]
+                    response.validator_tweets.extend(validator_tweets)
+                    validator_tweets_per_response.append(validator_tweets)
+
+                return await self.llm_process_validator_tweets(
+                    responses, validator_tweets_per_response
+                )
 
-                for tweet in tweets_list:
-                    if tweet.id in ids:
-                        response.validator_tweets.append(tweet)
+            # Every batch of tweets returned by Apify is scored while other batches are fetched
+            pipeline = VerificationPipeline(
+                name=self.name, responses_count=len(responses), score=score_tweets
+            )
+            _, val_score_responses_list = await pipeline.run(
+                scrape_tweets_with_retries(
+                    unique_links,
+                    group_size=200,
+                    max_attempts=4,
+                    on_fetched=pipeline.submit,
+                )
+            )
+
+            non_fetched_links = [
+                link
+                for link in unique_links
+                if self.tw_client.utils.extract_tweet_id(link) not in fetched_tweet_ids
+            ]
 
             end_time = time.time()
             bt.logging.info(
-                f"Fetched Twitter links method took {end_time - start_time} seconds. "
+                f"Fetched and scored Twitter links method took {end_time - start_time} seconds. "
                 f"All links count: {len(all_links)}, Unique links count: {len(unique_links)}, "
-                f"APIFY fetched tweets links count: {len(tweets_list)}"
+                f"APIFY fetched tweets links count: {len(fetched_tweet_ids)}"
             )
 
             bt.logging.info(
@@ -148,12 +211,6 @@ class TwitterContentRelevanceModel(BaseRewardModel):
                     f"Unique Twitter Links Amount: {len(unique_links)}; List: {unique_links};"
                 )
 
-            val_score_responses_list = await self.process_response_items_in_batches(
-                responses=responses,
-                batch_size=20,
-                process_function=self.llm_process_validator_tweets,
-            )
-
             return val_score_responses_list
         except Exception as e:
             bt.logging.error(f"Error in process_tweets: {str(e)}")
@@ -163,8 +220,9 @@ class TwitterContentRelevanceModel(BaseRewardModel):
         try:
             tweet_score = 0
 
-            completion = self.get_successful_twitter_completion(response=response)
-            if not completion:
+            analysis = get_response_analysis(response)
+
+            if not analysis.successful_twitter_completion:
                 return 0
 
             tweets_data = response.miner_tweets
@@ -172,13 +230,17 @@ class TwitterContentRelevanceModel(BaseRewardModel):
             tweets_amount = len(tweets_data)
 
             # Assign completion links and validator tweets from the response
-            completion_links = response.completion_links
+            completion_links = analysis.completion_links
+            start_date = analysis.start_date
+            end_date = analysis.end_date
 
             if (
                 not completion_links
                 or len(completion_links) < 2
                 or tweets_amount == 0
                 or not response.validator_tweets
+                or start_date is None
+                or end_date is None
             ):
                 # Ensure there are at least two twitter links provided by miners and check for the presence of miner and validator tweets
                 return 0
@@ -208,9 +270,7 @@ class TwitterContentRelevanceModel(BaseRewardModel):
 
                     tweet_text = tweet["text"]
 
-                    if not tweet_text or re.search(
-                        pattern_to_check, tweet_text, flags=re.IGNORECASE
-                    ):
+                    if not tweet_text or has_invalid_pattern(tweet_text):
                         tweet_scores.append(0)
                         continue
 
@@ -239,16 +299,6 @@ class TwitterContentRelevanceModel(BaseRewardModel):
                         converted_val_tweet_created_at, "%Y-%m-%dT%H:%M:%S.%fZ"
                     ).replace(tzinfo=pytz.UTC, second=0, microsecond=0)
 
-                    start_date = response.start_date
-                    end_date = response.end_date
-
-                    start_date = datetime.strptime(
-                        start_date, "%Y-%m-%dT%H:%M:%SZ"
-                    ).replace(tzinfo=pytz.utc)
-                    end_date = datetime.strptime(
-                        end_date, "%Y-%m-%dT%H:%M:%SZ"
-                    ).replace(tzinfo=pytz.utc)
-
                     if (
                         tweet_created_at_aware < start_date
                         or tweet_created_at_aware > end_date
@@ -316,6 +366,10 @@ class TwitterContentRelevanceModel(BaseRewardModel):
 
             scores = [self.check_tweet_content(response) for response in responses]
 
+            for score, response in zip(scores, responses):
+                if response.validator_tweets:
+                    verification_trust.observe(response.axon.hotkey, score)
+
             reward_events = []
             scoring_prompt = LinkContentPrompt()
 
@@ -342,11 +396,7 @@ class TwitterContentRelevanceModel(BaseRewardModel):
                 score_result = None
                 response_scores = {}
                 total_score = 0
-                max_links_considered = (
-                    len(response.validator_tweets)
-                    if len(response.validator_tweets) > 10
-                    else 10
-                )
+                validator_tweets_count = len(response.validator_tweets)
 
                 unique_tweet_texts = {}
                 for val_tweet in response.validator_tweets:
@@ -374,9 +424,16 @@ class TwitterContentRelevanceModel(BaseRewardModel):
                                 total_score += score / 10.0
                                 response_scores[val_tweet_id] = score
                     if total_score > 0:
+                        # Smaller samples of trusted miners count as the full sample
                         average_score = (
-                            total_score / max_links_considered * apify_score
-                        )  # len(response.validator_tweets)
+                            get_sample_average_score(
+                                total_score,
+                                validator_tweets_count,
+                                10,
+                                response.get_verification_sample_ratio(self.name),
+                            )
+                            * apify_score
+                        )
                         reward_event.reward = self.calculate_adjusted_score(
                             links_count=len(response.completion_links),
                             score=average_score,
@@ -0,0 +1,74 @@
+import os
+import time
+import asyncio
+import bittensor as bt
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+
+VERIFICATION_DEADLINE = float(os.environ.get("VERIFICATION_DEADLINE", 600))
+
+
+class VerificationPipeline:
+    """Scores validator items with the LLM as soon as actors return them.
+    Fetching and retries overlap with scoring, so verification takes about max(fetch, score)
+    instead of fetch + score. Fetching stops at the round deadline, items fetched by then are
+    still scored.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        responses_count: int,
+        score: Callable[[List[Any]], Awaitable[List[dict]]],
+        deadline: float = VERIFICATION_DEADLINE,
+    ):
+        self.name = name
+        self.responses_count = responses_count
+        self.score = score
+        self.deadline = deadline
+        self.tasks: List[asyncio.Task] = []
+        self.items_count = 0
+
+    def submit(self, items: List[Any]) -> None:
+        """Starts scoring of fetched items, called by the fetcher for every actor result."""
+        if not items:
+            return
+
+        self.items_count += len(items)
+        self.tasks.append(asyncio.create_task(self.score(items)))
+
+    async def run(self, fetch: Awaitable) -> Tuple[Optional[Any], List[dict]]:
+        """Runs the fetch with the deadline, then waits for scoring of everything fetched.
+        Returns result of the fetch, None if it did not finish, and scores per response.
+        """
+        start_time = time.time()
+        fetch_result = None
+
+        try:
+            fetch_result = await asyncio.wait_for(fetch, timeout=self.deadline)
+        except asyncio.TimeoutError:
+            bt.logging.warning(
+                f"{self.name}: fetching stopped at the deadline of {self.deadline} seconds, "
+                f"scoring {self.items_count} fetched items."
+            )
+        except Exception as e:
+            bt.logging.error(f"{self.name}: fetching failed: {str(e)}")
+
+        fetch_time = time.time() - start_time
+
+        val_score_responses_list = [{} for _ in range(self.responses_count)]
+
+        for result in await asyncio.gather(*self.tasks, return_exceptions=True):
+            if isinstance(result, Exception):
+                bt.logging.error(f"{self.name}: scoring failed: {str(result)}")
+                continue
+
+            for val_score_responses, scores in zip(val_score_responses_list, result):
+                val_score_responses.update(scores)
+
+        bt.logging.info(
+            f"{self.name}: fetched {self.items_count} items in {fetch_time:.2f} seconds "
+            f"with {len(self.tasks)} scoring batches, verification took {time.time() - start_time:.2f} seconds."
+        )
+
+        return fetch_result, val_score_responses_list
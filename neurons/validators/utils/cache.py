@@ -0,0 +1,304 @@
+import os
+import time
+import json
+import asyncio
+import sqlite3
+import threading
+import bittensor as bt
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class CacheStats:
+    """Counts lookups of a cache, hits are split by the layer that served them."""
+
+    def __init__(self) -> None:
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class TTLCache:
+    """In-memory LRU cache where every entry expires after ttl seconds."""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        entry = self.entries.get(key)
+
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+
+        if expires_at <= time.time():
+            del self.entries[key]
+            return default
+
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+
+        self.entries[key] = (time.time() + ttl, value)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def delete(self, key) -> None:
+        self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+class SQLiteCacheStore:
+    """Persistent key-value store with expiry, bounded to max_entries rows.
+    Values are JSON serialized. Oldest entries are evicted first.
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, path: str, table: str, max_entries: int = 200000) -> None:
+        self.path = os.path.expanduser(path)
+        self.table = table
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} "
+            "(key TEXT PRIMARY KEY, value TEXT, created_at REAL, expires_at REAL)"
+        )
+        self.connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_created_at ON {self.table} (created_at)"
+        )
+        self.connection.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_expires_at ON {self.table} (expires_at)"
+        )
+        self.connection.commit()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        now = time.time()
+        values = {}
+
+        with self.lock:
+            for i in range(0, len(keys), self.BATCH_SIZE):
+                batch = keys[i : i + self.BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self.connection.execute(
+                    f"SELECT key, value FROM {self.table} "
+                    f"WHERE key IN ({placeholders}) AND expires_at > ?",
+                    [*batch, now],
+                ).fetchall()
+
+                for key, value in rows:
+                    values[key] = json.loads(value)
+
+        return values
+
+    def set_many(self, items: Dict[str, Any], ttl: float) -> None:
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (key, json.dumps(value), now, now + ttl) for key, value in items.items()
+        ]
+
+        with self.lock:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self.connection.execute(
+                f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,)
+            )
+            (count,) = self.connection.execute(
+                f"SELECT COUNT(*) FROM {self.table}"
+            ).fetchone()
+
+            if count > self.max_entries:
+                self.connection.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY created_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+            self.connection.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+class TieredCache:
+    """In-memory LRU in front of an optional SQLite store.
+    Values must be JSON serializable when the store is used. TTL of 0 or less disables the cache.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: Optional[str],
+        ttl: float,
+        maxsize: int,
+        max_disk_entries: int,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.stats = CacheStats()
+        self.store = None
+
+        if path and ttl > 0:
+            try:
+                self.store = SQLiteCacheStore(
+                    path, table=name, max_entries=max_disk_entries
+                )
+            except Exception as e:
+                bt.logging.warning(
+                    f"{name} cache is running in memory only, failed to open {path}: {e}"
+                )
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.ttl > 0
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not self.is_enabled:
+            return {}
+
+        values = {}
+        missing_keys = []
+
+        for key in keys:
+            value = self.memory.get(key)
+
+            if value is None:
+                missing_keys.append(key)
+            else:
+                values[key] = value
+                self.stats.memory_hits += 1
+
+        if missing_keys and self.store:
+            try:
+                disk_values = await asyncio.to_thread(
+                    self.store.get_many, missing_keys
+                )
+            except Exception as e:
+                bt.logging.warning(f"Failed to read {self.name} cache: {e}")
+                disk_values = {}
+
+            for key, value in disk_values.items():
+                self.memory.set(key, value)
+                values[key] = value
+
+            self.stats.disk_hits += len(disk_values)
+
+        self.stats.misses += len(keys) - len(values)
+
+        return values
+
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        if not self.is_enabled or not items:
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+
+        for key, value in items.items():
+            self.memory.set(key, value, ttl=ttl)
+
+        if self.store:
+            try:
+                await asyncio.to_thread(self.store.set_many, items, ttl)
+            except Exception as e:
+                bt.logging.warning(f"Failed to write {self.name} cache: {e}")
+
+
+class InFlightRequests:
+    """Registry of keys being fetched, so concurrent callers share one fetch per key.
+    The caller that claims a key must resolve it, keys it did not get a value for resolve to None.
+    """
+
+    def __init__(self) -> None:
+        self.futures: Dict[Hashable, asyncio.Future] = {}
+        self.merged_requests = 0
+
+    def claim(
+        self, keys: Iterable[Hashable]
+    ) -> Tuple[List[Hashable], Dict[Hashable, asyncio.Future]]:
+        """Returns keys the caller must fetch and futures of keys already being fetched."""
+        loop = asyncio.get_running_loop()
+        claimed_keys = []
+        in_flight = {}
+
+        for key in dict.fromkeys(keys):
+            future = self.futures.get(key)
+
+            if future is None:
+                self.futures[key] = loop.create_future()
+                claimed_keys.append(key)
+            else:
+                in_flight[key] = future
+
+        self.merged_requests += len(in_flight)
+
+        return claimed_keys, in_flight
+
+    def resolve(self, keys: Iterable[Hashable], values: Dict[Hashable, Any]) -> None:
+        for key in keys:
+            future = self.futures.pop(key, None)
+
+            if future is not None and not future.done():
+                future.set_result(values.get(key))
+
+    @staticmethod
+    async def wait(in_flight: Dict[Hashable, asyncio.Future]) -> Dict[Hashable, Any]:
+        """Waits for fetches of other callers and returns values that were found."""
+        if not in_flight:
+            return {}
+
+        # Shielded, so a cancelled waiter does not cancel the fetch shared with others
+        results = await asyncio.gather(
+            *[asyncio.shield(future) for future in in_flight.values()]
+        )
+
+        return {
+            key: value
+            for key, value in zip(in_flight.keys(), results)
+            if value is not None
+        }
@@ -0,0 +1,114 @@
+import math
+import aiohttp
+import bittensor as bt
+from typing import Any, Dict, List
+
+
+class PooledDendrite(bt.dendrite):
+    """Dendrite whose session uses a connector tuned for the number of axons it queries."""
+
+    def __init__(
+        self,
+        wallet: "bt.wallet",
+        connection_limit: int = 100,
+        keepalive_timeout: float = 15,
+    ):
+        super().__init__(wallet=wallet)
+        self.connection_limit = connection_limit
+        self.keepalive_timeout = keepalive_timeout
+
+    @property
+    async def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.connection_limit,
+                    keepalive_timeout=self.keepalive_timeout,
+                )
+            )
+
+        return self._session
+
+
+class DendritePool:
+    """Dendrites used to query miners, each with its own connection pool.
+    The pool grows with the number of queried miners, one dendrite per axons_per_dendrite axons up
+    to max_size, and every call goes to the dendrite with the fewest calls in flight.
+    """
+
+    def __init__(
+        self,
+        wallet: "bt.wallet",
+        max_size: int = 3,
+        axons_per_dendrite: int = 80,
+        connection_limit: int = 100,
+        keepalive_timeout: float = 15,
+    ):
+        self.wallet = wallet
+        self.max_size = max(1, max_size)
+        self.axons_per_dendrite = axons_per_dendrite
+        self.connection_limit = connection_limit
+        self.keepalive_timeout = keepalive_timeout
+
+        self.dendrites: List["bt.dendrite"] = []
+        self.in_flight: List[int] = []
+        self.calls: List[int] = []
+
+        self.resize(1)
+
+    def create_dendrite(self) -> "bt.dendrite":
+        return PooledDendrite(
+            wallet=self.wallet,
+            connection_limit=self.connection_limit,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+
+    def resize(self, axons_count: int) -> None:
+        """Adds dendrites for the number of axons about to be queried, the pool never shrinks."""
+        size = min(
+            self.max_size, max(1, math.ceil(axons_count / self.axons_per_dendrite))
+        )
+
+        while len(self.dendrites) < size:
+            self.dendrites.append(self.create_dendrite())
+            self.in_flight.append(0)
+            self.calls.append(0)
+
+    def acquire(self) -> int:
+        index = min(range(len(self.dendrites)), key=self.in_flight.__getitem__)
+        self.in_flight[index] += 1
+        self.calls[index] += 1
+
+        return index
+
+    def release(self, index: int) -> None:
+        self.in_flight[index] -= 1
+
+    async def call(self, **kwargs):
+        index = self.acquire()
+
+        try:
+            return await self.dendrites[index].call(**kwargs)
+        finally:
+            self.release(index)
+
+    async def call_stream(self, **kwargs):
+        """Streams the response of a miner, the dendrite is picked when the stream is started.
+        Streams abandoned by the caller must be closed with aclose to release the dendrite.
+        """
+        index = self.acquire()
+        stream = self.dendrites[index].call_stream(**kwargs)
+
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            self.release(index)
+            await stream.aclose()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "size": len(self.dendrites),
+            "in_flight": list(self.in_flight),
+            "calls": list(self.calls),
+        }
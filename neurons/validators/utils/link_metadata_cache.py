@@ -0,0 +1,130 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from datura.services.web_search_utils import WebSearchUtils
+from neurons.validators.utils.cache import InFlightRequests, TieredCache
+
+
+LINK_METADATA_CACHE_PATH = os.environ.get("LINK_METADATA_CACHE_PATH", "")
+LINK_METADATA_CACHE_TTL = int(os.environ.get("LINK_METADATA_CACHE_TTL", 24 * 60 * 60))
+LINK_METADATA_CACHE_FAILURE_TTL = int(
+    os.environ.get("LINK_METADATA_CACHE_FAILURE_TTL", 60 * 60)
+)
+LINK_METADATA_CACHE_SIZE = int(os.environ.get("LINK_METADATA_CACHE_SIZE", 50000))
+LINK_METADATA_CACHE_DISK_SIZE = int(
+    os.environ.get("LINK_METADATA_CACHE_DISK_SIZE", 500000)
+)
+
+# Pages of these domains rarely change their title and description
+LINK_METADATA_DOMAIN_TTLS = {
+    "wikipedia.org": 7 * 24 * 60 * 60,
+    "arxiv.org": 7 * 24 * 60 * 60,
+    "reddit.com": 6 * 60 * 60,
+    "news.ycombinator.com": 6 * 60 * 60,
+}
+
+FAILED_LINK = {"failed": True}
+
+
+class LinkMetadataCache(TieredCache):
+    """Title and description of web links fetched from Apify, keyed by normalized URL.
+    TTL depends on the domain of the link. Links the actor could not scrape although its run
+    succeeded are cached as failures for a shorter time, so they are not scraped every round.
+    Disk persistence is enabled by LINK_METADATA_CACHE_PATH.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = LINK_METADATA_CACHE_PATH,
+        ttl: int = LINK_METADATA_CACHE_TTL,
+        failure_ttl: int = LINK_METADATA_CACHE_FAILURE_TTL,
+        maxsize: int = LINK_METADATA_CACHE_SIZE,
+        max_disk_entries: int = LINK_METADATA_CACHE_DISK_SIZE,
+        domain_ttls: Dict[str, int] = LINK_METADATA_DOMAIN_TTLS,
+    ):
+        super().__init__(
+            name="link_metadata",
+            path=path,
+            ttl=ttl,
+            maxsize=maxsize,
+            max_disk_entries=max_disk_entries,
+        )
+
+        self.failure_ttl = failure_ttl
+        self.domain_ttls = domain_ttls
+        self.failure_hits = 0
+        self.in_flight = InFlightRequests()
+
+    def get_ttl(self, url: str) -> int:
+        # Cache is disabled
+        if self.ttl <= 0:
+            return 0
+
+        try:
+            host = urlsplit(url).hostname or ""
+        except ValueError:
+            return self.ttl
+
+        for domain, ttl in self.domain_ttls.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return ttl
+
+        return self.ttl
+
+    async def get_links(
+        self, urls: List[str]
+    ) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+        """Returns cached links with metadata, links cached as failed and links that must be fetched."""
+        url_to_key = {url: WebSearchUtils.normalize_url(url) for url in urls}
+        cached = await self.get_many(list(set(url_to_key.values())))
+
+        links_with_metadata = []
+        failed_urls = []
+        missing_urls = []
+
+        for url, key in url_to_key.items():
+            value = cached.get(key)
+
+            if value is None:
+                missing_urls.append(url)
+            elif value.get("failed"):
+                failed_urls.append(url)
+            else:
+                # Callers match metadata by the link miners returned
+                links_with_metadata.append({**value, "url": url})
+
+        self.failure_hits += len(failed_urls)
+
+        return links_with_metadata, failed_urls, missing_urls
+
+    async def set_links(
+        self, links_with_metadata: List[Dict[str, Any]], failed_urls: List[str] = []
+    ) -> None:
+        items_per_ttl: Dict[int, Dict[str, Any]] = {}
+
+        for link in links_with_metadata:
+            url = link.get("url")
+
+            if url:
+                items_per_ttl.setdefault(self.get_ttl(url), {})[
+                    WebSearchUtils.normalize_url(url)
+                ] = link
+
+        if failed_urls and self.failure_ttl > 0:
+            items = items_per_ttl.setdefault(self.failure_ttl, {})
+
+            for url in failed_urls:
+                items[WebSearchUtils.normalize_url(url)] = FAILED_LINK
+
+        for ttl, items in items_per_ttl.items():
+            await self.set_many(items, ttl=ttl)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats.to_dict(),
+            "failure_hits": self.failure_hits,
+            "merged_requests": self.in_flight.merged_requests,
+        }
+
+
+link_metadata_cache = LinkMetadataCache()
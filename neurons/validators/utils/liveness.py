@@ -0,0 +1,147 @@
+import time
+import asyncio
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+# Dendrite status of requests that could not connect to the miner
+CONNECTION_ERROR_STATUS_CODES = {503}
+
+
+class LivenessRecord:
+    def __init__(self, hotkey: Optional[str] = None) -> None:
+        self.hotkey = hotkey
+        # Moving average of probe and query outcomes, 1 means always reachable
+        self.success_rate = 0.0
+        self.observations = 0
+        self.consecutive_failures = 0
+        self.last_seen = 0.0
+        self.next_probe_at = 0.0
+
+
+class LivenessTracker:
+    """Keeps liveness of miners from IsAlive probes and outcomes of regular queries.
+    Only miners never seen, not seen for ttl seconds or failing are probed again, failing miners
+    with exponential backoff, so a sweep does not query the whole metagraph every time.
+    A miner is available until max_consecutive_failures probes or connections fail in a row,
+    a single successful probe or query makes it available again.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 600,
+        alpha: float = 0.3,
+        max_consecutive_failures: int = 1,
+        base_backoff: float = 150,
+        max_backoff: float = 600,
+        max_concurrency: int = 64,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.ttl = ttl
+        self.alpha = alpha
+        self.max_consecutive_failures = max_consecutive_failures
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_concurrency = max_concurrency
+        self.clock = clock
+
+        self.records: Dict[int, LivenessRecord] = {}
+        self.probes_count = 0
+
+    def resync(self, hotkeys: List[str]) -> None:
+        """Forgets miners whose UID was registered by another hotkey or removed."""
+        for uid in list(self.records.keys()):
+            if uid >= len(hotkeys) or self.records[uid].hotkey != hotkeys[uid]:
+                del self.records[uid]
+
+        for uid, hotkey in enumerate(hotkeys):
+            self.records.setdefault(uid, LivenessRecord(hotkey))
+
+    def observe(self, uid: int, is_success: bool) -> None:
+        record = self.records.setdefault(uid, LivenessRecord())
+        now = self.clock()
+        outcome = 1.0 if is_success else 0.0
+
+        if record.observations == 0:
+            record.success_rate = outcome
+        else:
+            record.success_rate += self.alpha * (outcome - record.success_rate)
+
+        record.observations += 1
+
+        if is_success:
+            record.consecutive_failures = 0
+            record.last_seen = now
+            record.next_probe_at = now + self.ttl
+        else:
+            record.consecutive_failures += 1
+            backoff = self.base_backoff * 2 ** (record.consecutive_failures - 1)
+            record.next_probe_at = now + min(self.max_backoff, backoff)
+
+    def observe_responses(self, uids: Iterable, responses: List) -> None:
+        """Uses outcomes of regular queries as liveness signals.
+        Only failures to reach the miner count, slow or invalid answers are ignored.
+        """
+        for uid, response in zip(uids, responses):
+            dendrite = getattr(response, "dendrite", None)
+
+            if (
+                dendrite is None
+                or dendrite.status_code in CONNECTION_ERROR_STATUS_CODES
+            ):
+                self.observe(int(uid), False)
+            elif dendrite.status_code == 200:
+                self.observe(int(uid), True)
+
+    def is_alive(self, uid: int) -> bool:
+        record = self.records.get(uid)
+
+        return (
+            record is not None
+            and record.observations > 0
+            and record.consecutive_failures < self.max_consecutive_failures
+        )
+
+    def get_uids_to_probe(self, uids: Iterable[int]) -> List[int]:
+        now = self.clock()
+
+        return [
+            uid
+            for uid in uids
+            if uid not in self.records or self.records[uid].next_probe_at <= now
+        ]
+
+    def get_available_uids(self, uids: Iterable[int]) -> List[int]:
+        return [uid for uid in uids if self.is_alive(uid)]
+
+    async def probe(
+        self, uids: List[int], check: Callable[[int], Awaitable[object]]
+    ) -> None:
+        """Probes UIDs with at most max_concurrency checks at a time.
+        Check succeeds unless it raises an exception or returns a falsy value.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def probe_uid(uid: int):
+            async with semaphore:
+                try:
+                    is_success = bool(await check(uid))
+                except Exception:
+                    is_success = False
+
+            self.observe(uid, is_success)
+
+        self.probes_count += len(uids)
+        await asyncio.gather(*[probe_uid(uid) for uid in uids])
+
+    def get_metrics(self) -> Dict[str, float]:
+        observed = [record for record in self.records.values() if record.observations]
+
+        return {
+            "miners": len(self.records),
+            "alive_miners": sum(1 for uid in self.records if self.is_alive(uid)),
+            "probes": self.probes_count,
+            "mean_success_rate": (
+                sum(record.success_rate for record in observed) / len(observed)
+                if observed
+                else 0
+            ),
+        }
@@ -0,0 +1,225 @@
+import os
+import time
+import heapq
+import asyncio
+import itertools
+from enum import IntEnum
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+LLM_REQUESTS_PER_MINUTE = int(os.environ.get("LLM_REQUESTS_PER_MINUTE", 5000))
+LLM_TOKENS_PER_MINUTE = int(os.environ.get("LLM_TOKENS_PER_MINUTE", 2000000))
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", 200))
+LLM_TARGET_LATENCY = float(os.environ.get("LLM_TARGET_LATENCY", 10))
+
+
+class RequestPriority(IntEnum):
+    ORGANIC = 0
+    SYNTHETIC = 1
+
+
+# Priority of LLM requests issued by the current task, scoring of organic queries sets it to ORGANIC
+llm_request_priority: ContextVar[RequestPriority] = ContextVar(
+    "llm_request_priority", default=RequestPriority.SYNTHETIC
+)
+
+
+def estimate_tokens(messages: List[Dict[str, str]], completion_tokens: int = 50) -> int:
+    """Rough token count of a chat request, around 4 characters per token."""
+    return (
+        sum(len(message.get("content") or "") for message in messages) // 4
+        + completion_tokens
+    )
+
+
+class TokenBucket:
+    """Budget refilled continuously at rate_per_minute, holding at most one minute of budget."""
+
+    def __init__(self, rate_per_minute: float) -> None:
+        self.capacity = rate_per_minute
+        self.rate_per_second = rate_per_minute / 60
+        self.tokens = rate_per_minute
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate_per_second
+        )
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+
+        if self.tokens >= amount:
+            return 0
+
+        return (amount - self.tokens) / self.rate_per_second
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+class LLMScheduler:
+    """Coordinates all LLM requests of the validator.
+    Requests wait in a priority queue until request-per-minute and token-per-minute budgets allow them
+    and the number of requests in flight is below the concurrency limit. The limit grows additively
+    while latency stays below the target and is cut on high latency or rate limit (429) errors.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = LLM_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        min_concurrency: int = 4,
+        target_latency: float = LLM_TARGET_LATENCY,
+        decrease_cooldown: float = 2.0,
+    ) -> None:
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.concurrency_limit = float(max(self.min_concurrency, max_concurrency // 4))
+        self.target_latency = target_latency
+        self.decrease_cooldown = decrease_cooldown
+        self.decreased_at = 0.0
+
+        self.waiting = []
+        self.counter = itertools.count()
+        self.active = 0
+        self.wakeup_handle: Optional[asyncio.TimerHandle] = None
+
+        self.completed_count = 0
+        self.rate_limited_count = 0
+        self.latency_ewma: Optional[float] = None
+        self.queue_time_ewma: Optional[float] = None
+
+    @staticmethod
+    def update_ewma(value: Optional[float], sample: float, alpha: float = 0.1) -> float:
+        return sample if value is None else (1 - alpha) * value + alpha * sample
+
+    async def submit(
+        self,
+        request: Callable[[], Awaitable[Any]],
+        estimated_tokens: int,
+        priority: Optional[RequestPriority] = None,
+    ) -> Any:
+        """Runs request once budgets and concurrency allow it."""
+        if priority is None:
+            priority = llm_request_priority.get()
+
+        queued_at = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self.waiting, (priority, next(self.counter), estimated_tokens, future)
+        )
+        self.dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was granted right before the cancellation
+                self.release()
+            raise
+
+        started_at = time.monotonic()
+        self.queue_time_ewma = self.update_ewma(
+            self.queue_time_ewma, started_at - queued_at
+        )
+
+        try:
+            return await request()
+        finally:
+            self.completed_count += 1
+            self.observe_latency(time.monotonic() - started_at)
+            self.release()
+
+    def dispatch(self) -> None:
+        now = time.monotonic()
+        self.request_bucket.refill(now)
+        self.token_bucket.refill(now)
+
+        while self.waiting and self.active < int(self.concurrency_limit):
+            _, _, estimated_tokens, future = self.waiting[0]
+
+            if future.done():
+                heapq.heappop(self.waiting)
+                continue
+
+            wait_time = max(
+                self.request_bucket.wait_time(1),
+                self.token_bucket.wait_time(estimated_tokens),
+            )
+
+            if wait_time > 0:
+                self.schedule_wakeup(wait_time)
+                break
+
+            heapq.heappop(self.waiting)
+            self.request_bucket.consume(1)
+            self.token_bucket.consume(estimated_tokens)
+            self.active += 1
+            future.set_result(None)
+
+    def schedule_wakeup(self, delay: float) -> None:
+        if self.wakeup_handle is not None and not self.wakeup_handle.cancelled():
+            return
+
+        def wakeup():
+            self.wakeup_handle = None
+            self.dispatch()
+
+        self.wakeup_handle = asyncio.get_running_loop().call_later(delay, wakeup)
+
+    def release(self) -> None:
+        self.active -= 1
+        self.dispatch()
+
+    def observe_latency(self, latency: float) -> None:
+        self.latency_ewma = self.update_ewma(self.latency_ewma, latency)
+
+        if self.latency_ewma > self.target_latency:
+            self.decrease_concurrency(factor=0.9)
+        else:
+            # Additive increase, limit grows by one after a full window of requests
+            self.concurrency_limit = min(
+                self.max_concurrency,
+                self.concurrency_limit + 1 / self.concurrency_limit,
+            )
+
+    def report_rate_limit(self) -> None:
+        """Called when LLM API responds with 429, halves the concurrency limit."""
+        self.rate_limited_count += 1
+        self.decrease_concurrency(factor=0.5)
+
+    def decrease_concurrency(self, factor: float) -> None:
+        now = time.monotonic()
+
+        if now - self.decreased_at < self.decrease_cooldown:
+            return
+
+        self.decreased_at = now
+        self.concurrency_limit = max(
+            self.min_concurrency, self.concurrency_limit * factor
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": len(self.waiting),
+            "organic_queue_depth": sum(
+                1
+                for priority, *_ in self.waiting
+                if priority == RequestPriority.ORGANIC
+            ),
+            "active": self.active,
+            "concurrency_limit": int(self.concurrency_limit),
+            "completed": self.completed_count,
+            "rate_limited": self.rate_limited_count,
+            "latency_ewma": round(self.latency_ewma or 0, 3),
+            "queue_time_ewma": round(self.queue_time_ewma or 0, 3),
+        }
+
+
+llm_scheduler = LLMScheduler()
@@ -0,0 +1,99 @@
+import asyncio
+import bittensor as bt
+from typing import Dict, List
+from datura.utils import scrape_tweets_with_retries
+from neurons.validators.utils.verification_trust import sample_verification_links
+
+
+class SpeculativeTweetVerifier:
+    """Fetches tweets to verify while other miners are still streaming.
+    When a miner finishes, its verification sample is drawn from the completion links of its final
+    synapse, with the same sampler the Twitter content relevance model uses, and kept on the synapse.
+    Samples are fetched in batches in the background, verification then reads them from the cache
+    or awaits them through the in-flight registry.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sample_size: int,
+        batch_delay: float = 2.0,
+        group_size: int = 200,
+        max_attempts: int = 4,
+    ):
+        self.name = name
+        self.sample_size = sample_size
+        self.batch_delay = batch_delay
+        self.group_size = group_size
+        self.max_attempts = max_attempts
+
+        self.samples: Dict[int, List[str]] = {}
+        self.pending_links: List[str] = []
+        self.flush_handle = None
+        self.tasks: List[asyncio.Task] = []
+
+    def on_chunk(self, uid, chunk) -> None:
+        """Called by the stream collector for every chunk of a miner."""
+        if (
+            isinstance(chunk, bt.Synapse)
+            and chunk.dendrite.status_code == 200
+            and chunk.completion_links
+        ):
+            self.sample_links(int(uid), chunk)
+
+    def sample_links(self, uid: int, response) -> None:
+        links = sample_verification_links(
+            response, self.name, list(response.completion_links), self.sample_size
+        )
+        self.samples[uid] = links
+        self.pending_links.extend(links)
+
+        if links and self.flush_handle is None:
+            # Samples of miners finishing at about the same time share actor runs
+            self.flush_handle = asyncio.get_running_loop().call_later(
+                self.batch_delay, self.flush
+            )
+
+    def flush(self) -> None:
+        """Starts fetching of pending samples in the background."""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        links = list(dict.fromkeys(self.pending_links))
+        self.pending_links = []
+
+        if not links:
+            return
+
+        bt.logging.info(f"Speculatively fetching {len(links)} tweets.")
+
+        self.tasks.append(asyncio.create_task(self.fetch(links)))
+
+    async def fetch(self, links: List[str]) -> None:
+        try:
+            await scrape_tweets_with_retries(
+                links, group_size=self.group_size, max_attempts=self.max_attempts
+            )
+        except Exception as e:
+            bt.logging.error(f"Speculative tweet fetching failed: {str(e)}")
+
+    async def close(self) -> None:
+        """Ends the round, fetches still running are cancelled and awaited."""
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        self.pending_links = []
+
+        for task in self.tasks:
+            task.cancel()
+
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            "sampled_miners": len(self.samples),
+            "sampled_tweets": sum(len(links) for links in self.samples.values()),
+            "fetches": len(self.tasks),
+        }
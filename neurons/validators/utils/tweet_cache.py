@@ -0,0 +1,88 @@
+import os
+import math
+from typing import Any, Dict, List, Optional, Tuple
+from datura.protocol import TwitterScraperTweet
+from datura.services.twitter_utils import TwitterUtils
+from neurons.validators.utils.cache import InFlightRequests, TieredCache
+
+
+TWEET_CACHE_PATH = os.environ.get("TWEET_CACHE_PATH", "")
+TWEET_CACHE_TTL = int(os.environ.get("TWEET_CACHE_TTL", 24 * 60 * 60))
+TWEET_CACHE_SIZE = int(os.environ.get("TWEET_CACHE_SIZE", 100000))
+TWEET_CACHE_DISK_SIZE = int(os.environ.get("TWEET_CACHE_DISK_SIZE", 1000000))
+
+
+class TweetCache(TieredCache):
+    """Validator tweets fetched from Apify by tweet ID.
+    Tweet text and created_at do not change, so tweets fetched in previous rounds are reused
+    and only missing tweets start actor runs. Disk persistence is enabled by TWEET_CACHE_PATH.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = TWEET_CACHE_PATH,
+        ttl: int = TWEET_CACHE_TTL,
+        maxsize: int = TWEET_CACHE_SIZE,
+        max_disk_entries: int = TWEET_CACHE_DISK_SIZE,
+    ):
+        super().__init__(
+            name="tweets",
+            path=path,
+            ttl=ttl,
+            maxsize=maxsize,
+            max_disk_entries=max_disk_entries,
+        )
+
+        self.in_flight = InFlightRequests()
+        self.actor_runs_avoided = 0
+        self.seconds_avoided = 0.0
+        self.actor_run_seconds: Optional[float] = None
+
+    async def get_tweets(
+        self, urls: List[str]
+    ) -> Tuple[List[TwitterScraperTweet], List[str]]:
+        """Returns cached tweets of the links and links that must be fetched."""
+        url_to_id = {url: TwitterUtils.extract_tweet_id(url) for url in urls}
+        cached = await self.get_many(
+            list({tweet_id for tweet_id in url_to_id.values() if tweet_id})
+        )
+
+        tweets = [TwitterScraperTweet(**value) for value in cached.values()]
+        missing_urls = [
+            url for url, tweet_id in url_to_id.items() if tweet_id not in cached
+        ]
+
+        return tweets, missing_urls
+
+    async def set_tweets(self, tweets: List[TwitterScraperTweet]) -> None:
+        await self.set_many({tweet.id: tweet.model_dump() for tweet in tweets})
+
+    def observe_actor_run(self, seconds: float) -> None:
+        alpha = 0.2
+        self.actor_run_seconds = (
+            seconds
+            if self.actor_run_seconds is None
+            else (1 - alpha) * self.actor_run_seconds + alpha * seconds
+        )
+
+    def observe_cache_lookup(
+        self, urls_count: int, missing_count: int, group_size: int
+    ) -> None:
+        """Counts actor runs, and their average duration, saved by serving tweets from the cache."""
+        runs_avoided = math.ceil(urls_count / group_size) - math.ceil(
+            missing_count / group_size
+        )
+
+        self.actor_runs_avoided += runs_avoided
+        self.seconds_avoided += runs_avoided * (self.actor_run_seconds or 0)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats.to_dict(),
+            "actor_runs_avoided": self.actor_runs_avoided,
+            "seconds_avoided": round(self.seconds_avoided, 2),
+            "merged_requests": self.in_flight.merged_requests,
+        }
+
+
+tweet_cache = TweetCache()
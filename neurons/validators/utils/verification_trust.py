@@ -0,0 +1,133 @@
+import os
+import math
+import random
+from typing import Dict, List, Optional
+
+
+VERIFICATION_TRUST_SAMPLING = os.environ.get(
+    "VERIFICATION_TRUST_SAMPLING", "false"
+).lower() in ("1", "true", "yes")
+
+
+class TrustRecord:
+    def __init__(self) -> None:
+        self.trust = 0.0
+        self.observations = 0
+        # Verifications in a row that fully matched
+        self.clean_streak = 0
+
+
+class VerificationTrust:
+    """Running trust score of miners built from their verification results.
+    Miners with a long streak of exact matches get smaller verification samples, new and recently
+    failing miners get the full sample. Trusted miners still get a full sample at random with
+    full_check_probability and never less than min_sample_size, so spot checks never disappear.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = VERIFICATION_TRUST_SAMPLING,
+        alpha: float = 0.1,
+        min_observations: int = 10,
+        trust_threshold: float = 0.9,
+        full_check_probability: float = 0.2,
+        min_sample_size: int = 1,
+        seed: Optional[int] = None,
+    ):
+        self.enabled = enabled
+        self.alpha = alpha
+        self.min_observations = min_observations
+        self.trust_threshold = trust_threshold
+        self.full_check_probability = full_check_probability
+        self.min_sample_size = min_sample_size
+        self.random = random.Random(seed)
+
+        self.records: Dict[str, TrustRecord] = {}
+        self.sampled_count = 0
+        self.skipped_count = 0
+
+    def observe(self, hotkey: str, score: float) -> None:
+        """Records result of a verification, score of 1 means every sampled item matched."""
+        record = self.records.setdefault(hotkey, TrustRecord())
+
+        if record.observations == 0:
+            record.trust = score
+        else:
+            record.trust = (1 - self.alpha) * record.trust + self.alpha * score
+
+        record.observations += 1
+        record.clean_streak = record.clean_streak + 1 if score >= 1 else 0
+
+    def is_trusted(self, hotkey: str) -> bool:
+        record = self.records.get(hotkey)
+
+        return (
+            record is not None
+            and record.clean_streak >= self.min_observations
+            and record.trust >= self.trust_threshold
+        )
+
+    def get_sample_size(self, hotkey: str, amount: int) -> int:
+        """Returns how many of the usual amount of items should be verified for the miner."""
+        sample_size = amount
+
+        if (
+            self.enabled
+            and amount > self.min_sample_size
+            and self.is_trusted(hotkey)
+            and self.random.random() >= self.full_check_probability
+        ):
+            # Full sample at the trust threshold, minimal sample at full trust
+            trust = self.records[hotkey].trust
+            share = (1 - trust) / (1 - self.trust_threshold)
+            sample_size = max(self.min_sample_size, math.ceil(amount * share))
+
+        self.sampled_count += sample_size
+        self.skipped_count += amount - sample_size
+
+        return sample_size
+
+    def get_metrics(self) -> Dict[str, float]:
+        return {
+            "miners": len(self.records),
+            "trusted_miners": sum(
+                1 for hotkey in self.records if self.is_trusted(hotkey)
+            ),
+            "sampled_items": self.sampled_count,
+            "skipped_items": self.skipped_count,
+        }
+
+
+def get_sample_average_score(
+    total_score: float, items_count: int, items_expected: int, sample_ratio: float
+) -> float:
+    """Averages scores of verified items so that a reduced sample counts as the full one.
+    Total score is divided by the verified items or by the expected items scaled by the sample
+    ratio, whichever is larger.
+    """
+    return total_score / max(items_count, items_expected * sample_ratio)
+
+
+verification_trust = VerificationTrust()
+
+
+def sample_verification_links(response, name: str, links: List[str], amount: int):
+    """Picks links of the response to verify uniformly at random, fewer for trusted miners.
+    The sample is kept on the response, so links prefetched while miners stream are the ones verified.
+    """
+    sample = response.get_verification_sample(name)
+
+    if sample is not None:
+        return sample
+
+    amount = min(amount, len(links))
+    sample = []
+
+    if amount:
+        sample_size = verification_trust.get_sample_size(response.axon.hotkey, amount)
+        response.set_verification_sample_ratio(name, sample_size / amount)
+        sample = random.sample(links, sample_size)
+
+    response.set_verification_sample(name, sample)
+
+    return sample
@@ -8,7 +8,7 @@ import copy
 import bittensor as bt
 import time
 import sys
-from datura.protocol import IsAlive
+from datura.protocol import IsAlive, ScraperStreamingSynapse, StreamLimits
 from neurons.validators.advanced_scraper_validator import AdvancedScraperValidator
 from neurons.validators.basic_scraper_validator import BasicScraperValidator
 from config import add_args, check_config, config
@@ -23,6 +23,9 @@ from datura.utils import (
     save_logs_in_chunks_for_basic,
 )
 from neurons.validators.proxy.uid_manager import UIDManager
+from neurons.validators.utils.dendrite_pool import DendritePool
+from neurons.validators.utils.liveness import LivenessTracker
+from neurons.validators.reward.response_analysis import count_tokens
 
 
 class Neuron(AbstractNeuron):
@@ -64,6 +67,16 @@ class Neuron(AbstractNeuron):
         print(self.config)
         bt.logging.info("neuron.__init__()")
 
+        ScraperStreamingSynapse.stream_limits = StreamLimits(
+            max_stream_bytes=self.config.neuron.max_stream_bytes,
+            max_event_bytes=self.config.neuron.max_event_bytes,
+            max_chunks_per_role=self.config.neuron.max_chunks_per_role,
+            max_items_per_event=self.config.neuron.max_items_per_event,
+        )
+
+        if self.config.neuron.incremental_token_counting:
+            ScraperStreamingSynapse.token_counter = count_tokens
+
         self.initialize_components()
 
         init_wandb(self)
@@ -82,6 +95,15 @@ class Neuron(AbstractNeuron):
         )
         bt.logging.debug(str(self.moving_averaged_scores))
         self.available_uids = []
+        # Miners are never left unprobed for longer than the sweep interval
+        self.liveness_tracker = LivenessTracker(
+            ttl=min(
+                self.config.neuron.liveness_ttl,
+                self.config.neuron.update_available_uids_interval,
+            ),
+            max_backoff=self.config.neuron.update_available_uids_interval,
+            max_concurrency=self.config.neuron.liveness_probe_concurrency,
+        )
         self.thread_executor = concurrent.futures.ThreadPoolExecutor(
             thread_name_prefix="asyncio"
         )
@@ -99,9 +121,13 @@ class Neuron(AbstractNeuron):
         self.metagraph = self.subtensor.metagraph(self.config.netuid)
         self.hotkeys = copy.deepcopy(self.metagraph.hotkeys)
         self.dendrite = bt.dendrite(wallet=self.wallet)
-        self.dendrite1 = bt.dendrite(wallet=self.wallet)
-        self.dendrite2 = bt.dendrite(wallet=self.wallet)
-        self.dendrite3 = bt.dendrite(wallet=self.wallet)
+        self.dendrite_pool = DendritePool(
+            wallet=self.wallet,
+            max_size=self.config.neuron.dendrite_pool_size,
+            axons_per_dendrite=self.config.neuron.axons_per_dendrite,
+            connection_limit=self.config.neuron.dendrite_connection_limit,
+            keepalive_timeout=self.config.neuron.dendrite_keepalive_timeout,
+        )
         self.uid = self.metagraph.hotkeys.index(self.wallet.hotkey.ss58_address)
         if self.wallet.hotkey.ss58_address not in self.metagraph.hotkeys:
             bt.logging.error(
@@ -162,24 +188,23 @@ class Neuron(AbstractNeuron):
             raise e
 
     async def get_available_uids_is_alive(self):
-        """Get a dictionary of available UIDs and their axons asynchronously."""
-        tasks = {
-            uid.item(): self.check_uid(
-                self.metagraph.axons[uid.item()],
-                uid.item(),
-            )
-            for uid in self.metagraph.uids
-        }
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        """Get available UIDs, probing only miners that are new, stale or failing."""
+        uids = [uid.item() for uid in self.metagraph.uids]
 
-        # Filter out the exceptions and keep the successful results
-        available_uids = [
-            uid
-            for uid, result in zip(tasks.keys(), results)
-            if not isinstance(result, Exception)
-        ]
+        self.liveness_tracker.resync(self.metagraph.hotkeys)
+
+        uids_to_probe = self.liveness_tracker.get_uids_to_probe(uids)
+
+        await self.liveness_tracker.probe(
+            uids_to_probe,
+            lambda uid: self.check_uid(self.metagraph.axons[uid], uid),
+        )
+
+        bt.logging.info(
+            f"Probed {len(uids_to_probe)} of {len(uids)} UIDs, liveness: {self.liveness_tracker.get_metrics()}"
+        )
 
-        return available_uids
+        return self.liveness_tracker.get_available_uids(uids)
 
     async def get_uids(
         self,
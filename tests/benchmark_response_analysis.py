@@ -0,0 +1,158 @@
+import re
+import time
+import pytz
+from datetime import datetime
+from datura.protocol import ScraperStreamingSynapse
+from neurons.validators.reward.response_analysis import (
+    analyze_responses,
+    get_encoding,
+    get_response_analysis,
+)
+
+
+ROUNDS = 3
+
+pattern_to_check = r"<(?:Question|/Question|Answer|/Answer|Score|/Score)>|SM(?:[-_ ]SCS)?[-_ ]?(?:RDD|PNK|BLE|GRY|GRN)"
+
+
+def make_response(index: int) -> ScraperStreamingSynapse:
+    response = ScraperStreamingSynapse(
+        prompt="What is new in AI?",
+        tools=["Twitter Search", "Web Search", "Reddit Search", "Hacker News Search"],
+        start_date="2024-01-01T00:00:00Z",
+        end_date="2024-01-08T00:00:00Z",
+    )
+    response.dendrite.status_code = 200
+    response.completion = f"Summary of miner {index} " * 20
+    response.completion_links = [
+        f"https://x.com/user/status/{index}{i}" for i in range(10)
+    ]
+    response.search_results = {
+        "organic_results": [
+            {"link": f"https://example.com/{index}/{i}", "snippet": "words " * 30}
+            for i in range(10)
+        ]
+    }
+    response.reddit_search_results = [
+        {"link": f"https://www.reddit.com/r/ai/{index}/{i}"} for i in range(10)
+    ]
+    response.hacker_news_search_results = [
+        {"link": f"https://news.ycombinator.com/item?id={index}{i}"}
+        for i in range(10)
+    ]
+
+    for role, link in [
+        ("twitter_summary", "https://x.com/user/status/{}"),
+        ("search_summary", "https://example.com/{}"),
+        ("reddit_summary", "https://www.reddit.com/r/ai/{}"),
+        ("hacker_news_summary", "https://news.ycombinator.com/item?id={}"),
+    ]:
+        response.text_chunks[role] = [
+            f"[Link {i}]({link.format(i)}) some streamed words " for i in range(50)
+        ]
+
+    return response
+
+
+def validate(completion):
+    if completion and not re.search(pattern_to_check, completion, flags=re.IGNORECASE):
+        return completion.strip()
+
+    return None
+
+
+def legacy_successful_completion(response):
+    return validate(response.completion)
+
+
+def legacy_successful_twitter_completion(response):
+    response.clear_cached()
+
+    if response.completion_links:
+        return validate(response.get_twitter_completion().strip())
+
+
+def legacy_successful_search_completion(response):
+    response.clear_cached()
+    search_completion, _ = response.get_search_completion()
+
+    if response.completion:
+        return validate("\n".join(search_completion.values()).strip())
+
+
+def legacy_extraction(response):
+    """Facts each reward and penalty model derived on its own before the shared analysis."""
+    encoding = get_encoding()
+
+    # Twitter content relevance
+    legacy_successful_twitter_completion(response)
+    legacy_successful_twitter_completion(response)
+    for date in [response.start_date, response.end_date]:
+        datetime.strptime(date, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=pytz.utc)
+
+    # Search content relevance
+    legacy_successful_search_completion(response)
+    legacy_successful_search_completion(response)
+    response.clear_cached()
+    _, links_per_summary = response.get_search_links()
+    search_results_text = str(response.search_results)
+    domain_search_results_text = {
+        "reddit.com": str(response.reddit_search_results),
+        "ycombinator.com": str(response.hacker_news_search_results),
+    }
+    for links in links_per_summary.values():
+        for url in links:
+            domain = ".".join(url.split("/")[2].split(".")[-2:])
+            _ = url in search_results_text or url in domain_search_results_text.get(
+                domain, ""
+            )
+    response.clear_cached()
+    response.get_search_completion()
+
+    # Summary relevance
+    legacy_successful_completion(response)
+    response.clear_cached()
+    response.get_all_completions()
+
+    # Streaming penalty
+    for chunks in response.text_chunks.values():
+        for chunk in chunks:
+            len(encoding.encode(chunk))
+
+
+def shared_analysis(responses):
+    for response in responses:
+        response.clear_cached()
+
+    analyze_responses(responses)
+
+    # Every model reads the shared analysis
+    for response in responses:
+        for _ in range(6):
+            get_response_analysis(response)
+
+
+def run(responses_count: int):
+    responses = [make_response(index) for index in range(responses_count)]
+    get_encoding()
+
+    start_time = time.process_time()
+    for _ in range(ROUNDS):
+        for response in responses:
+            legacy_extraction(response)
+    legacy_time = (time.process_time() - start_time) / ROUNDS
+
+    start_time = time.process_time()
+    for _ in range(ROUNDS):
+        shared_analysis(responses)
+    shared_time = (time.process_time() - start_time) / ROUNDS
+
+    print(
+        f"Responses: {responses_count:5d} | per model extraction: {legacy_time:.3f}s CPU | "
+        f"shared analysis: {shared_time:.3f}s CPU | saved: {legacy_time - shared_time:.3f}s"
+    )
+
+
+if __name__ == "__main__":
+    for responses_count in [50, 100, 250, 500, 1000]:
+        run(responses_count)
@@ -0,0 +1,54 @@
+import time
+import random
+import asyncio
+from types import SimpleNamespace
+from neurons.validators.reward.reward import BaseRewardEvent, BaseRewardModel
+
+
+ROUNDS = 20
+
+
+class BenchmarkRewardModel(BaseRewardModel):
+    """Returns precomputed reward events, so only the overhead of apply is measured."""
+
+    def __init__(self, reward_events):
+        super().__init__()
+        self.reward_events = reward_events
+
+    @property
+    def name(self) -> str:
+        return "benchmark"
+
+    async def get_rewards(self, responses, uids):
+        return list(self.reward_events), [{} for _ in responses]
+
+
+def make_response(index: int):
+    # Every tenth miner failed to respond
+    status_code = 408 if index % 10 == 0 else 200
+    return SimpleNamespace(dendrite=SimpleNamespace(status_code=status_code))
+
+
+async def run(responses_count: int):
+    responses = [make_response(index) for index in range(responses_count)]
+    reward_events = [
+        BaseRewardEvent(reward=random.choice([0, random.random()]))
+        for _ in responses
+    ]
+    organic_penalties = [random.random() < 0.1 for _ in responses]
+    model = BenchmarkRewardModel(reward_events)
+
+    start_time = time.perf_counter()
+    for _ in range(ROUNDS):
+        await model.apply(responses, uids=None, organic_penalties=organic_penalties)
+    apply_time = (time.perf_counter() - start_time) / ROUNDS
+
+    print(
+        f"Responses: {responses_count:5d} | apply: {apply_time * 1000:.3f}ms | "
+        f"per response: {apply_time / responses_count * 1e6:.2f}us"
+    )
+
+
+if __name__ == "__main__":
+    for responses_count in [50, 100, 250, 500, 1000]:
+        asyncio.run(run(responses_count))
@@ -0,0 +1,74 @@
+import unittest
+from datura.services.link_extraction import extract_links, get_tweet_id
+
+COMPLETION = """Summary of the discussion:
+- [Elon on rockets](https://x.com/elonmusk/status/123) and https://x.com/nasa/status/456
+- [Launch thread](https://www.reddit.com/r/space/comments/1/launch/)
+- [Falcon 9](https://en.wikipedia.org/wiki/Falcon_9) vs [fake](https://notreddit.com/r/x)
+- [HN](https://news.ycombinator.com/item?id=1) and https://x.com/TwitterSupport/status/789
+"""
+
+
+class LinkExtractionTestCase(unittest.TestCase):
+    def test_markdown_links(self):
+        extracted_links = extract_links(COMPLETION)
+
+        self.assertEqual(len(extracted_links.links), 5)
+        self.assertEqual(
+            extracted_links.links_with_descriptions[0],
+            ("https://x.com/elonmusk/status/123", "Elon on rockets"),
+        )
+        self.assertEqual(
+            extracted_links.links_by_domain("reddit.com"),
+            ["https://www.reddit.com/r/space/comments/1/launch/"],
+        )
+        self.assertEqual(
+            extracted_links.links_by_domain("wikipedia.org"),
+            ["https://en.wikipedia.org/wiki/Falcon_9"],
+        )
+        self.assertEqual(
+            extracted_links.markdown_links[1].two_label_domain, "reddit.com"
+        )
+
+    def test_two_label_domain_is_naive(self):
+        extracted_links = extract_links("[BBC](https://www.bbc.co.uk/news)")
+
+        self.assertEqual(extracted_links.markdown_links[0].host, "www.bbc.co.uk")
+        self.assertEqual(extracted_links.markdown_links[0].two_label_domain, "co.uk")
+        self.assertEqual(
+            extracted_links.links_by_domain("bbc.co.uk"),
+            ["https://www.bbc.co.uk/news"],
+        )
+
+    def test_twitter_links(self):
+        extracted_links = extract_links(COMPLETION)
+
+        self.assertEqual(
+            extracted_links.twitter_urls,
+            ["https://x.com/elonmusk/status/123", "https://x.com/nasa/status/456"],
+        )
+        self.assertEqual(extracted_links.usernames, ["elonmusk", "nasa"])
+        self.assertEqual(
+            extracted_links.tweet_ids["https://x.com/nasa/status/456"], "456"
+        )
+        # Only the first Twitter link of a line gets the line as description
+        self.assertEqual(
+            extracted_links.twitter_link_descriptions,
+            (
+                (
+                    "https://x.com/elonmusk/status/123",
+                    "Elon on rockets and https://x.com/nasa/status/456",
+                ),
+            ),
+        )
+
+    def test_results_are_shared(self):
+        self.assertIs(extract_links(COMPLETION), extract_links(COMPLETION))
+
+    def test_get_tweet_id(self):
+        self.assertEqual(get_tweet_id("https://x.com/user/statuses/42?s=20"), "42")
+        self.assertIsNone(get_tweet_id("https://x.com/user"))
+
+
+if __name__ == "__main__":
+    unittest.main()
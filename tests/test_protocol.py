@@ -0,0 +1,143 @@
+import json
+import unittest
+from datura.protocol import JSONStreamFramer, ScraperStreamingSynapse
+
+
+class JSONStreamFramerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.objects = [
+            {"type": "text", "role": "summary", "content": 'Tricky "{[}]" \\ ✓'},
+            {"type": "search", "content": {"organic_results": [{"link": "}"}]}},
+            {"type": "completion", "content": "done"},
+        ]
+        self.data = "\n".join(
+            json.dumps(obj, ensure_ascii=False) for obj in self.objects
+        ).encode("utf-8")
+
+    def feed_in_chunks(self, framer, chunk_size):
+        json_objects = []
+
+        for i in range(0, len(self.data), chunk_size):
+            json_objects.extend(framer.feed(self.data[i : i + chunk_size]))
+
+        return json_objects
+
+    def test_whole_stream_in_one_chunk(self):
+        framer = JSONStreamFramer()
+        self.assertEqual(framer.feed(self.data), self.objects)
+
+    def test_stream_split_in_small_chunks(self):
+        # Splits strings, escapes and multi-byte characters across chunks
+        for chunk_size in range(1, 8):
+            framer = JSONStreamFramer()
+            self.assertEqual(self.feed_in_chunks(framer, chunk_size), self.objects)
+            self.assertEqual(len(framer.buffer), 0)
+
+    def test_incomplete_object_is_kept_until_completed(self):
+        framer = JSONStreamFramer()
+
+        self.assertEqual(framer.feed(b'{"type": "tweets", "content": [{"id": "1"'), [])
+        self.assertEqual(
+            framer.feed(b"}]}"), [{"type": "tweets", "content": [{"id": "1"}]}]
+        )
+
+    def test_invalid_object_is_skipped(self):
+        framer = JSONStreamFramer()
+
+        self.assertEqual(framer.feed(b'{"content": invalid}{"type": "text"}'), [
+            {"type": "text"}
+        ])
+
+    def test_oversized_frame_stops_parsing(self):
+        framer = JSONStreamFramer(max_frame_bytes=32)
+
+        self.assertEqual(framer.feed(b'{"type": "text"}'), [{"type": "text"}])
+        self.assertEqual(framer.feed(b'{"type": "search", "content": "' + b"x" * 64), [])
+        self.assertIsNotNone(framer.limit_exceeded)
+        self.assertEqual(framer.feed(b'"}{"type": "text"}'), [])
+
+
+class ScraperStreamingSynapseTextsTestCase(unittest.TestCase):
+    def test_completions_are_refreshed_when_chunks_land(self):
+        synapse = ScraperStreamingSynapse(prompt="test", tools=["Web Search"])
+        synapse.text_chunks["search_summary"] = ["[Link](https://example.com/a) "]
+
+        links, _ = synapse.get_search_links()
+        self.assertEqual(links, ["https://example.com/a"])
+
+        # Returned values are copies, mutating them does not affect the cache
+        completions, _ = synapse.get_search_completion()
+        completions["search_summary"] = ""
+        self.assertEqual(
+            synapse.get_all_completions()["search_summary"],
+            "[Link](https://example.com/a)",
+        )
+
+        synapse.text_chunks["search_summary"].append("[Link](https://example.com/b)")
+
+        links, _ = synapse.get_search_links()
+        self.assertEqual(links, ["https://example.com/a", "https://example.com/b"])
+        self.assertEqual(
+            synapse.texts["search_summary"],
+            "[Link](https://example.com/a) [Link](https://example.com/b)",
+        )
+
+    def test_twitter_completion_is_refreshed_when_chunks_land(self):
+        synapse = ScraperStreamingSynapse(prompt="test", tools=["Twitter Search"])
+        synapse.text_chunks["twitter_summary"] = ["First tweet. "]
+
+        self.assertEqual(synapse.get_twitter_completion(), "First tweet. ")
+        self.assertIs(
+            synapse.get_twitter_completion(), synapse.get_twitter_completion()
+        )
+
+        synapse.text_chunks["twitter_summary"].append("Second tweet.")
+
+        self.assertEqual(
+            synapse.get_twitter_completion(), "First tweet. Second tweet."
+        )
+        self.assertEqual(
+            synapse.get_all_completions()["twitter_summary"],
+            "First tweet. Second tweet.",
+        )
+
+    def test_clear_cached_drops_values_of_chunks_edited_in_place(self):
+        synapse = ScraperStreamingSynapse(prompt="test", tools=["Twitter Search"])
+        synapse.text_chunks["twitter_summary"] = ["First tweet."]
+        synapse.get_twitter_completion()
+        synapse.set_response_analysis("analysis")
+
+        # Same number of chunks, the version alone does not notice the edit
+        synapse.text_chunks["twitter_summary"][0] = "Edited tweet."
+        self.assertEqual(synapse.get_twitter_completion(), "First tweet.")
+
+        synapse.clear_cached()
+
+        self.assertEqual(synapse.get_twitter_completion(), "Edited tweet.")
+        self.assertIsNone(synapse.get_response_analysis())
+
+
+class ScraperStreamingSynapseTokenCountsTestCase(unittest.TestCase):
+    def tearDown(self):
+        ScraperStreamingSynapse.token_counter = None
+
+    def test_chunks_counted_while_streaming(self):
+        ScraperStreamingSynapse.token_counter = lambda text: len(text.split())
+        synapse = ScraperStreamingSynapse(prompt="test")
+        synapse.text_chunks = {"twitter_summary": ["a b", ""], "summary": ["c"]}
+
+        for role, chunks in synapse.text_chunks.items():
+            for chunk in chunks:
+                synapse.count_chunk_tokens(role, chunk)
+
+        self.assertEqual(synapse.get_chunk_token_counts(), (2, 0, 1))
+
+    def test_uncounted_chunks_are_reported(self):
+        synapse = ScraperStreamingSynapse(prompt="test")
+        synapse.text_chunks = {"summary": ["a b"]}
+
+        self.assertIsNone(synapse.get_chunk_token_counts())
+
+
+if __name__ == "__main__":
+    unittest.main()
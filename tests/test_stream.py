@@ -0,0 +1,181 @@
+import time
+import json
+import asyncio
+import unittest
+from unittest import mock
+import bittensor as bt
+from datura.stream import (
+    collect_final_synapses,
+    collect_final_synapses_with_quorum,
+    CollectorGauges,
+    HedgedStream,
+)
+
+
+async def miner_stream(duration: float):
+    yield '{"type": "text", "content": "..."}'
+    await asyncio.sleep(duration)
+    yield bt.Synapse()
+
+
+def text_chunk(content: str) -> str:
+    return json.dumps({"type": "text", "role": "summary", "content": content})
+
+
+async def delayed_stream(first_token_delay: float, name: str):
+    await asyncio.sleep(first_token_delay)
+    yield text_chunk(name)
+    yield bt.Synapse()
+
+
+class CollectFinalSynapsesTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_slow_stream_does_not_block_others(self):
+        durations = [0.5] + [0.05] * 8
+        streams = [miner_stream(duration) for duration in durations]
+        gauges = CollectorGauges()
+        finished_uids = []
+
+        def on_chunk(uid, chunk):
+            if isinstance(chunk, bt.Synapse):
+                finished_uids.append(uid)
+
+        # Slow stream starts first
+        with mock.patch("datura.stream.random.shuffle"):
+            final_synapses = await collect_final_synapses(
+                streams,
+                list(range(len(streams))),
+                time.time(),
+                max_execution_time=30,
+                max_concurrency=3,
+                on_chunk=on_chunk,
+                gauges=gauges,
+            )
+
+        # With fixed groups of 3, streams of later groups would wait for the slow one
+        self.assertEqual(finished_uids[-1], 0)
+        self.assertEqual(sorted(finished_uids[:-1]), list(range(1, len(durations))))
+        self.assertEqual(len(final_synapses), len(durations))
+        self.assertTrue(all(isinstance(s, bt.Synapse) for s in final_synapses))
+        self.assertEqual(gauges.max_in_flight, 3)
+        self.assertEqual(gauges.collected, len(durations))
+        self.assertEqual(gauges.queued, 0)
+        self.assertEqual(gauges.in_flight, 0)
+
+    async def test_results_keep_order_of_responses(self):
+        async def empty_stream():
+            yield "no final synapse"
+
+        streams = [miner_stream(0.01), empty_stream(), miner_stream(0.02)]
+
+        final_synapses = await collect_final_synapses(
+            streams, [0, 1, 2], time.time(), max_execution_time=30, max_concurrency=2
+        )
+
+        self.assertIsInstance(final_synapses[0], bt.Synapse)
+        self.assertIsNone(final_synapses[1])
+        self.assertIsInstance(final_synapses[2], bt.Synapse)
+
+
+class CollectFinalSynapsesWithQuorumTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_returns_after_quorum_and_keeps_collecting(self):
+        streams = [miner_stream(duration) for duration in [0.01, 0.02, 0.5, 0.5]]
+        start_time = time.time()
+
+        synapses, collect_task = await collect_final_synapses_with_quorum(
+            streams, [0, 1, 2, 3], start_time, 30, quorum=2, soft_deadline=30
+        )
+
+        self.assertEqual(len(synapses), 2)
+        self.assertLess(time.time() - start_time, 0.2)
+        self.assertFalse(collect_task.done())
+
+        final_synapses = await collect_task
+        self.assertTrue(all(isinstance(s, bt.Synapse) for s in final_synapses))
+
+    async def test_returns_at_soft_deadline(self):
+        streams = [miner_stream(duration) for duration in [0.01, 0.5, 0.5]]
+        start_time = time.time()
+
+        synapses, collect_task = await collect_final_synapses_with_quorum(
+            streams, [0, 1, 2], start_time, 30, quorum=2, soft_deadline=0.1
+        )
+
+        self.assertEqual(len(synapses), 1)
+        self.assertLess(time.time() - start_time, 0.3)
+        await collect_task
+
+
+class HedgedStreamTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_hedge_miner_with_first_tokens_is_streamed(self):
+        async def start_hedge():
+            return delayed_stream(0.01, "hedge")
+
+        hedged_stream = HedgedStream(delayed_stream(0.5, "primary"), start_hedge, 0.05)
+        start_time = time.time()
+
+        chunks = [chunk async for chunk in hedged_stream.stream()]
+
+        self.assertEqual(chunks, [text_chunk("hedge")])
+        self.assertLess(time.time() - start_time, 0.3)
+
+        # Primary miner is still collected for scoring
+        final_synapses = await hedged_stream.get_final_synapses()
+        self.assertEqual(len(final_synapses), 2)
+        self.assertTrue(all(isinstance(s, bt.Synapse) for s in final_synapses))
+
+    async def test_fast_primary_is_not_hedged(self):
+        start_hedge = mock.AsyncMock()
+        hedged_stream = HedgedStream(delayed_stream(0.01, "primary"), start_hedge, 0.2)
+
+        chunks = [chunk async for chunk in hedged_stream.stream()]
+
+        self.assertEqual(chunks, [text_chunk("primary")])
+        start_hedge.assert_not_awaited()
+        self.assertEqual(len(await hedged_stream.get_final_synapses()), 1)
+
+    async def test_events_before_text_are_not_first_tokens(self):
+        search_event = json.dumps({"type": "search", "content": "{}"})
+
+        async def search_first_stream():
+            yield search_event
+            await asyncio.sleep(0.5)
+            yield text_chunk("primary")
+            yield bt.Synapse()
+
+        async def start_hedge():
+            return delayed_stream(0.01, "hedge")
+
+        hedged_stream = HedgedStream(search_first_stream(), start_hedge, 0.05)
+
+        chunks = [chunk async for chunk in hedged_stream.stream()]
+
+        self.assertEqual(chunks, [text_chunk("hedge")])
+        self.assertFalse(hedged_stream.pumps[0].has_chunks)
+        self.assertIsNotNone(hedged_stream.pumps[1].first_text_time)
+        await hedged_stream.get_final_synapses()
+
+    async def test_closed_stream_stops_started_miners(self):
+        closed = []
+
+        async def endless_stream(name):
+            try:
+                yield text_chunk(name)
+                await asyncio.sleep(10)
+                yield bt.Synapse()
+            finally:
+                closed.append(name)
+
+        hedged_stream = HedgedStream(endless_stream("primary"), mock.AsyncMock(), 1)
+        stream = hedged_stream.stream()
+
+        self.assertEqual(await stream.__anext__(), text_chunk("primary"))
+
+        # Client disconnects while the miner is still streaming
+        await hedged_stream.aclose()
+
+        self.assertEqual(closed, ["primary"])
+        self.assertEqual(await hedged_stream.get_final_synapses(), [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
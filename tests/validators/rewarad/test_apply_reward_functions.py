@@ -0,0 +1,117 @@
+import asyncio
+import unittest
+from neurons.validators.reward.config import RewardModelType
+from neurons.validators.reward.reward import BaseRewardModel, apply_reward_functions
+
+
+class MockRewardModel(BaseRewardModel):
+    def __init__(
+        self, name: str, delay: float, calls: list, dependencies=[], error=None
+    ):
+        super().__init__()
+        self.mock_name = name
+        self.delay = delay
+        self.calls = calls
+        self.dependencies = dependencies
+        self.error = error
+
+    @property
+    def name(self) -> str:
+        return self.mock_name
+
+    async def apply(self, responses, uids, organic_penalties=[]):
+        self.calls.append(("start", self.name))
+        await asyncio.sleep(self.delay)
+
+        if self.error:
+            raise self.error
+
+        self.calls.append(("end", self.name))
+        return self.name
+
+
+class ApplyRewardFunctionsTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_reward_functions_run_concurrently_after_dependencies(self):
+        calls = []
+        reward_functions = [
+            MockRewardModel(
+                RewardModelType.twitter_content_relevance.value, 0.05, calls
+            ),
+            MockRewardModel(RewardModelType.search_content_relevance.value, 0.1, calls),
+            MockRewardModel(
+                RewardModelType.summary_relavance_match.value,
+                0.01,
+                calls,
+                dependencies=[
+                    RewardModelType.twitter_content_relevance,
+                    RewardModelType.search_content_relevance,
+                ],
+            ),
+            MockRewardModel(RewardModelType.performance_score.value, 0.01, calls),
+        ]
+
+        results = await apply_reward_functions(reward_functions, [], [])
+
+        # Results keep the order of reward functions
+        self.assertEqual(
+            [result for result, _ in results],
+            [reward_fn.name for reward_fn in reward_functions],
+        )
+
+        # Independent models start together, summary starts when both content models end
+        self.assertEqual(
+            [name for event, name in calls[:3]],
+            [
+                RewardModelType.twitter_content_relevance.value,
+                RewardModelType.search_content_relevance.value,
+                RewardModelType.performance_score.value,
+            ],
+        )
+        summary_start = calls.index(
+            ("start", RewardModelType.summary_relavance_match.value)
+        )
+        self.assertGreater(
+            summary_start,
+            calls.index(("end", RewardModelType.search_content_relevance.value)),
+        )
+
+        for _, execution_time in results:
+            self.assertGreaterEqual(execution_time, 0)
+
+    async def test_unknown_dependency_is_rejected(self):
+        reward_functions = [
+            MockRewardModel(
+                RewardModelType.summary_relavance_match.value,
+                0.01,
+                [],
+                dependencies=[RewardModelType.twitter_content_relevance],
+            ),
+        ]
+
+        with self.assertRaises(ValueError):
+            await apply_reward_functions(reward_functions, [], [])
+
+    async def test_failure_cancels_other_reward_functions(self):
+        calls = []
+        reward_functions = [
+            MockRewardModel(
+                RewardModelType.twitter_content_relevance.value,
+                0.01,
+                calls,
+                error=RuntimeError("Scoring failed"),
+            ),
+            MockRewardModel(RewardModelType.search_content_relevance.value, 0.2, calls),
+        ]
+
+        with self.assertRaises(RuntimeError):
+            await apply_reward_functions(reward_functions, [], [])
+
+        await asyncio.sleep(0.3)
+
+        self.assertNotIn(
+            ("end", RewardModelType.search_content_relevance.value), calls
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from unittest import mock
+from datura.protocol import ScraperStreamingSynapse
+from neurons.validators.reward import response_analysis
+from neurons.validators.reward.response_analysis import collect_urls, contains_url
+
+SEARCH_RESULTS = {
+    "organic_results": [
+        {"link": "https://Example.com/news/ai-2024/?ref=feed#top"},
+        {"snippet": "Read more at https://blog.example.org/post/1. Thanks"},
+    ],
+    "related": ["https://example.com/about/"],
+}
+
+
+class ContainsUrlTestCase(unittest.TestCase):
+    def setUp(self):
+        self.urls = collect_urls(SEARCH_RESULTS)
+
+    def test_urls_are_collected_sorted(self):
+        self.assertEqual(
+            self.urls,
+            (
+                "https://blog.example.org/post/1",
+                "https://example.com/about",
+                "https://example.com/news/ai-2024/?ref=feed",
+            ),
+        )
+
+    def test_url_contained_in_search_result_matches(self):
+        # Same as substring search in the serialized search results
+        self.assertTrue(contains_url(self.urls, "https://example.com/news/ai-2024"))
+        self.assertTrue(contains_url(self.urls, "https://example.com/news/ai"))
+        self.assertTrue(contains_url(self.urls, "https://EXAMPLE.com/about/"))
+        self.assertTrue(contains_url(self.urls, "https://blog.example.org/post/1"))
+
+    def test_url_not_in_search_results_does_not_match(self):
+        self.assertFalse(contains_url(self.urls, "https://example.com/news/ml"))
+        self.assertFalse(contains_url(self.urls, "https://example.com/contact"))
+        self.assertFalse(contains_url(self.urls, "https://other.com"))
+        self.assertFalse(contains_url((), "https://example.com/about"))
+
+
+class AnalyzeResponsesTestCase(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            response_analysis,
+            "analyze_response",
+            side_effect=lambda response: response.get_twitter_completion(),
+        )
+        self.analyze_response = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.response = ScraperStreamingSynapse(prompt="test", tools=["Twitter Search"])
+        self.response.text_chunks["twitter_summary"] = ["Streamed tweet."]
+
+    def test_analysis_is_built_from_the_final_synapse(self):
+        # Derived while streaming, then the final synapse edits the chunk in place
+        self.response.get_twitter_completion()
+        self.response.text_chunks["twitter_summary"][0] = "Final tweet."
+
+        response_analysis.analyze_responses([self.response])
+
+        self.assertEqual(
+            response_analysis.get_response_analysis(self.response), "Final tweet."
+        )
+        self.assertEqual(self.analyze_response.call_count, 1)
+
+    def test_analysis_is_not_stored_outside_of_analyze_responses(self):
+        response_analysis.get_response_analysis(self.response)
+        response_analysis.get_response_analysis(self.response)
+
+        self.assertIsNone(self.response.get_response_analysis())
+        self.assertEqual(self.analyze_response.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+import math
+import unittest
+from types import SimpleNamespace
+import torch
+from neurons.validators.reward.reward import BaseRewardEvent, BaseRewardModel
+
+
+def legacy_normalize_rewards(rewards: torch.FloatTensor) -> torch.FloatTensor:
+    """Normalization before selecting the non-zero rewards once, kept as the reference."""
+    zero_mask = rewards == 0
+
+    min_reward = (
+        torch.min(rewards[~zero_mask]) if rewards[~zero_mask].nelement() > 0 else 0
+    )
+    max_reward = (
+        torch.max(rewards[~zero_mask]) if rewards[~zero_mask].nelement() > 0 else 1
+    )
+
+    if min_reward == max_reward:
+        rewards[~zero_mask] = 1
+    else:
+        epsilon = 1e-10
+        rewards[~zero_mask] = (rewards[~zero_mask] - min_reward) / (
+            max(max_reward - min_reward, epsilon)
+        )
+
+        exaggeration_factor = 4
+        rewards[~zero_mask] = torch.pow(
+            rewards[~zero_mask] * exaggeration_factor, exaggeration_factor
+        )
+
+        if rewards[~zero_mask].nelement() > 0:
+            rewards[~zero_mask] /= torch.max(rewards[~zero_mask])
+
+    rewards[zero_mask] = 0
+
+    return rewards
+
+
+def legacy_fill(rewards, normalized_rewards, successful_indices, responses_count):
+    """Per index filling of apply before scattering, kept as the reference."""
+    filled_rewards = torch.ones(responses_count, dtype=torch.float32) * torch.nan
+    filled_rewards_normalized = torch.zeros(responses_count, dtype=torch.float32)
+
+    for idx in successful_indices:
+        filled_rewards[idx] = rewards[idx]
+        filled_rewards_normalized[idx] = normalized_rewards[idx]
+
+    return filled_rewards, filled_rewards_normalized.nan_to_num_(nan=0.0)
+
+
+REWARDS = [
+    [0.2, 0.0, 0.9, 0.5, 0.0, 0.7],
+    [0.0, 0.0, 0.0],
+    [0.4, 0.4, 0.0, 0.4],
+    [0.3],
+    [],
+    [1e-12, 2e-12, 0.0],
+    [0.5, float("nan"), 0.0, 0.1],
+    [-0.2, 0.0, 0.3, 1.5],
+]
+
+
+class StaticRewardModel(BaseRewardModel):
+    def __init__(self, rewards):
+        super().__init__()
+        self.rewards = rewards
+
+    @property
+    def name(self) -> str:
+        return "static"
+
+    async def get_rewards(self, responses, uids):
+        reward_events = [
+            BaseRewardEvent(reward=reward, normalized_reward=index)
+            for index, reward in enumerate(self.rewards)
+        ]
+        return reward_events, {}
+
+
+def make_responses(status_codes):
+    return [
+        SimpleNamespace(dendrite=SimpleNamespace(status_code=status_code))
+        for status_code in status_codes
+    ]
+
+
+class NormalizeRewardsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.model = StaticRewardModel([])
+
+    def test_matches_legacy_normalization(self):
+        for rewards in REWARDS:
+            expected = legacy_normalize_rewards(torch.tensor(rewards))
+            actual = self.model.normalize_rewards(torch.tensor(rewards))
+
+            self.assertTrue(
+                torch.allclose(actual, expected, equal_nan=True),
+                f"{rewards}: {actual} != {expected}",
+            )
+
+    def test_normalizes_in_place(self):
+        rewards = torch.tensor(REWARDS[0])
+        normalized_rewards = self.model.normalize_rewards(rewards)
+
+        self.assertIs(normalized_rewards, rewards)
+        self.assertEqual(rewards.max().item(), 1)
+
+    def test_zero_and_constant_rewards(self):
+        self.assertEqual(
+            self.model.normalize_rewards(torch.zeros(3)).tolist(), [0, 0, 0]
+        )
+        self.assertEqual(
+            self.model.normalize_rewards(torch.tensor([0.4, 0.0, 0.4])).tolist(),
+            [1, 0, 1],
+        )
+
+    def test_nan_reward_spreads_like_before(self):
+        rewards = self.model.normalize_rewards(
+            torch.tensor([0.5, float("nan"), 0.0])
+        ).tolist()
+
+        self.assertTrue(math.isnan(rewards[0]) and math.isnan(rewards[1]))
+        self.assertEqual(rewards[2], 0)
+
+
+class ApplyTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_matches_legacy_filling(self):
+        status_codes = [200, 408, 200, 200, 503, 200]
+        rewards = [0.2, 0.8, 0.9, 0.5, 0.3, 0.0]
+        organic_penalties = [False, False, False, True, False, False]
+        successful_indices = [0, 2, 3, 5]
+
+        model = StaticRewardModel(rewards)
+        filled_rewards_normalized, reward_events, _, original_rewards = (
+            await model.apply(make_responses(status_codes), None, organic_penalties)
+        )
+
+        penalized_rewards = [0.2, 0.8, 0.9, 0.0, 0.3, 0.0]
+        normalized_rewards = legacy_normalize_rewards(torch.tensor(penalized_rewards))
+        expected_rewards, expected_normalized = legacy_fill(
+            normalized_rewards,
+            normalized_rewards,
+            successful_indices,
+            len(status_codes),
+        )
+
+        self.assertEqual(original_rewards, torch.tensor(penalized_rewards).tolist())
+        self.assertTrue(torch.allclose(filled_rewards_normalized, expected_normalized))
+        self.assertTrue(
+            torch.allclose(
+                torch.tensor(reward_events["static"]), expected_rewards, equal_nan=True
+            )
+        )
+        # Extra fields are assigned to successful calls in order
+        self.assertEqual(
+            reward_events["static_normalized_reward"], [0, None, 1, 2, None, 3]
+        )
+
+    async def test_nan_rewards_are_zeroed(self):
+        model = StaticRewardModel([0.5, float("nan"), 0.1])
+        filled_rewards_normalized, _, _, _ = await model.apply(
+            make_responses([200, 200, 200]), None
+        )
+
+        self.assertEqual(filled_rewards_normalized.tolist(), [0, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import asyncio
+import unittest
+from neurons.validators.reward.verification_pipeline import VerificationPipeline
+
+
+class VerificationPipelineTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_items_are_scored_while_fetching(self):
+        events = []
+
+        async def score(items):
+            events.append(("score", items))
+            return [{item: 1 for item in items if item.startswith("a")}, {}]
+
+        pipeline = VerificationPipeline("test", responses_count=2, score=score)
+
+        async def fetch():
+            pipeline.submit(["a1", "b1"])
+            await asyncio.sleep(0.01)
+            events.append(("fetched", None))
+            pipeline.submit(["a2"])
+            return "done"
+
+        result, scores = await pipeline.run(fetch())
+
+        self.assertEqual(result, "done")
+        self.assertEqual(scores, [{"a1": 1, "a2": 1}, {}])
+        self.assertEqual(events[0], ("score", ["a1", "b1"]))
+        self.assertEqual(pipeline.items_count, 3)
+
+    async def test_items_fetched_before_deadline_are_scored(self):
+        async def score(items):
+            return [{item: 1 for item in items}]
+
+        pipeline = VerificationPipeline(
+            "test", responses_count=1, score=score, deadline=0.05
+        )
+
+        async def fetch():
+            pipeline.submit(["a1"])
+            await asyncio.sleep(10)
+            pipeline.submit(["a2"])
+
+        result, scores = await pipeline.run(fetch())
+
+        self.assertIsNone(result)
+        self.assertEqual(scores, [{"a1": 1}])
+
+
+if __name__ == "__main__":
+    unittest.main()
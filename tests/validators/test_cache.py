@@ -0,0 +1,192 @@
+import os
+import time
+import tempfile
+import asyncio
+import unittest
+from neurons.validators.utils.cache import (
+    CacheStats,
+    InFlightRequests,
+    SQLiteCacheStore,
+    TieredCache,
+    TTLCache,
+)
+from neurons.validators.utils.link_metadata_cache import LinkMetadataCache
+from neurons.validators.reward.llm_score_cache import LLMScoreCache
+
+
+class TTLCacheTestCase(unittest.TestCase):
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_expired_entry_is_not_returned(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1, ttl=-1)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+
+class SQLiteCacheStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_values_are_persisted(self):
+        store = SQLiteCacheStore(self.path, table="scores")
+        store.set_many({"a": "Score: 8", "b": {"score": 2}}, ttl=60)
+        store.close()
+
+        store = SQLiteCacheStore(self.path, table="scores")
+        self.assertEqual(
+            store.get_many(["a", "b", "c"]), {"a": "Score: 8", "b": {"score": 2}}
+        )
+        store.close()
+
+    def test_expired_and_oldest_entries_are_evicted(self):
+        store = SQLiteCacheStore(self.path, table="scores", max_entries=2)
+        store.set_many({"expired": 1}, ttl=-1)
+        store.set_many({"a": 1}, ttl=60)
+        time.sleep(0.01)
+        store.set_many({"b": 2, "c": 3}, ttl=60)
+
+        self.assertEqual(store.get_many(["expired", "a", "b", "c"]), {"b": 2, "c": 3})
+        store.close()
+
+
+class TieredCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_disk_values_are_served_after_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite")
+
+            cache = TieredCache("tweets", path, ttl=60, maxsize=10, max_disk_entries=10)
+            await cache.set_many({"1": {"text": "tweet"}})
+            self.assertEqual(await cache.get_many(["1", "2"]), {"1": {"text": "tweet"}})
+            cache.store.close()
+
+            cache = TieredCache("tweets", path, ttl=60, maxsize=10, max_disk_entries=10)
+            self.assertEqual(await cache.get_many(["1"]), {"1": {"text": "tweet"}})
+            self.assertEqual(await cache.get_many(["1"]), {"1": {"text": "tweet"}})
+            self.assertEqual(cache.stats.to_dict()["disk_hits"], 1)
+            self.assertEqual(cache.stats.to_dict()["memory_hits"], 1)
+            cache.store.close()
+
+    async def test_disabled_cache_returns_nothing(self):
+        cache = TieredCache("tweets", None, ttl=0, maxsize=10, max_disk_entries=10)
+        await cache.set_many({"1": "tweet"})
+
+        self.assertEqual(await cache.get_many(["1"]), {})
+
+
+class LLMScoreCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    def test_memory_only_by_default(self):
+        cache = LLMScoreCache()
+
+        self.assertIsNone(cache.store)
+
+    async def test_scores_are_persisted_when_path_is_set(self):
+        key = LLMScoreCache.make_key([{"role": "user", "content": "a"}], model="m")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "llm_score_cache.sqlite")
+
+            cache = LLMScoreCache(path=path)
+            await cache.set_many({key: "Score: 8"})
+            cache.store.close()
+
+            cache = LLMScoreCache(path=path)
+            self.assertEqual(await cache.get_many([key]), {key: "Score: 8"})
+            cache.store.close()
+
+
+class LinkMetadataCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_links_are_matched_by_normalized_url(self):
+        cache = LinkMetadataCache(path=None)
+        await cache.set_links(
+            [{"url": "https://en.wikipedia.org/wiki/Bittensor/", "title": "Bittensor"}],
+            failed_urls=["https://example.com/404"],
+        )
+
+        links, failed_urls, missing_urls = await cache.get_links(
+            [
+                "HTTPS://en.wikipedia.org/wiki/Bittensor#History",
+                "https://example.com/404/",
+                "https://example.com/new",
+            ]
+        )
+
+        self.assertEqual(
+            links,
+            [
+                {
+                    "url": "HTTPS://en.wikipedia.org/wiki/Bittensor#History",
+                    "title": "Bittensor",
+                }
+            ],
+        )
+        self.assertEqual(failed_urls, ["https://example.com/404/"])
+        self.assertEqual(missing_urls, ["https://example.com/new"])
+
+    def test_ttl_depends_on_domain(self):
+        cache = LinkMetadataCache(
+            path=None, ttl=100, domain_ttls={"wikipedia.org": 50, "arxiv.org": 500}
+        )
+
+        self.assertEqual(cache.get_ttl("https://en.wikipedia.org/wiki/Bittensor"), 50)
+        self.assertEqual(cache.get_ttl("https://arxiv.org/abs/1"), 500)
+        self.assertEqual(cache.get_ttl("https://notwikipedia.org"), 100)
+
+        disabled_cache = LinkMetadataCache(
+            path=None, ttl=0, domain_ttls={"arxiv.org": 500}
+        )
+        self.assertEqual(disabled_cache.get_ttl("https://arxiv.org/abs/1"), 0)
+
+
+class InFlightRequestsTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_callers_share_one_fetch(self):
+        in_flight = InFlightRequests()
+        fetched_keys = []
+
+        async def fetch(keys):
+            claimed_keys, waiting = in_flight.claim(keys)
+            fetched_keys.extend(claimed_keys)
+
+            try:
+                await asyncio.sleep(0.01)
+                values = {key: key.upper() for key in claimed_keys if key != "c"}
+            finally:
+                in_flight.resolve(claimed_keys, values)
+
+            return {**values, **await in_flight.wait(waiting)}
+
+        results = await asyncio.gather(fetch(["a", "b"]), fetch(["b", "c"]))
+
+        self.assertEqual(results, [{"a": "A", "b": "B"}, {"b": "B"}])
+        self.assertEqual(fetched_keys, ["a", "b", "c"])
+        self.assertEqual(in_flight.merged_requests, 1)
+        self.assertEqual(in_flight.futures, {})
+
+
+class CacheStatsTestCase(unittest.TestCase):
+    def test_hit_rate(self):
+        stats = CacheStats()
+        self.assertEqual(stats.hit_rate, 0)
+
+        stats.memory_hits = 2
+        stats.disk_hits = 1
+        stats.misses = 1
+        self.assertEqual(stats.hit_rate, 0.75)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+import bittensor as bt
+from neurons.validators.utils.dendrite_pool import DendritePool, PooledDendrite
+
+
+class FakeDendrite:
+    async def call(self, target_axon, **kwargs):
+        await asyncio.sleep(0.01)
+        return target_axon
+
+    async def call_stream(self, target_axon, **kwargs):
+        await asyncio.sleep(0.01)
+        yield target_axon
+        yield "done"
+
+
+class FakeDendritePool(DendritePool):
+    def create_dendrite(self):
+        return FakeDendrite()
+
+
+class DendritePoolTestCase(unittest.IsolatedAsyncioTestCase):
+    def test_pool_grows_with_axons_up_to_max_size(self):
+        pool = FakeDendritePool(wallet=None, max_size=4, axons_per_dendrite=80)
+        self.assertEqual(len(pool.dendrites), 1)
+
+        pool.resize(120)
+        self.assertEqual(len(pool.dendrites), 2)
+
+        pool.resize(1000)
+        self.assertEqual(len(pool.dendrites), 4)
+
+        # Pool never shrinks while calls may be in flight
+        pool.resize(10)
+        self.assertEqual(len(pool.dendrites), 4)
+
+    async def test_calls_are_balanced_across_dendrites(self):
+        pool = FakeDendritePool(wallet=None, max_size=3, axons_per_dendrite=80)
+        pool.resize(200)
+
+        responses = await asyncio.gather(
+            *[pool.call(target_axon=axon) for axon in range(200)]
+        )
+
+        self.assertEqual(responses, list(range(200)))
+        self.assertLessEqual(max(pool.calls) - min(pool.calls), 1)
+        self.assertEqual(pool.in_flight, [0, 0, 0])
+
+    async def test_stream_releases_dendrite_when_finished(self):
+        pool = FakeDendritePool(wallet=None)
+        stream = pool.call_stream(target_axon="axon")
+
+        # Dendrite is picked when the stream starts
+        self.assertEqual(pool.calls, [0])
+        self.assertEqual([chunk async for chunk in stream], ["axon", "done"])
+        self.assertEqual(pool.calls, [1])
+        self.assertEqual(pool.in_flight, [0])
+
+    async def test_abandoned_stream_releases_dendrite_when_closed(self):
+        pool = FakeDendritePool(wallet=None)
+        stream = pool.call_stream(target_axon="axon")
+
+        self.assertEqual(await stream.__anext__(), "axon")
+        self.assertEqual(pool.in_flight, [1])
+
+        await stream.aclose()
+        self.assertEqual(pool.in_flight, [0])
+
+
+class PooledDendriteTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_session_uses_tuned_connector(self):
+        keypair = bt.Keypair.create_from_mnemonic(bt.Keypair.generate_mnemonic())
+        dendrite = PooledDendrite(
+            wallet=keypair, connection_limit=7, keepalive_timeout=3
+        )
+
+        session = await dendrite.session
+
+        self.assertIs(await dendrite.session, session)
+        self.assertEqual(session.connector.limit, 7)
+        await dendrite.aclose_session()
+
+
+if __name__ == "__main__":
+    unittest.main()
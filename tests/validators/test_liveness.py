@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from neurons.validators.utils.liveness import LivenessTracker
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class LivenessTrackerTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.tracker = LivenessTracker(
+            ttl=600, base_backoff=60, max_backoff=240, clock=self.clock
+        )
+        self.tracker.resync(["a", "b", "c"])
+
+    async def probe(self, alive_uids):
+        async def check(uid):
+            await asyncio.sleep(0)
+
+            if uid not in alive_uids:
+                raise Exception(f"UID {uid} is not active")
+
+            return True
+
+        uids_to_probe = self.tracker.get_uids_to_probe([0, 1, 2])
+        await self.tracker.probe(uids_to_probe, check)
+
+        return uids_to_probe
+
+    async def test_only_stale_and_failing_uids_are_probed(self):
+        self.assertEqual(await self.probe({0, 1}), [0, 1, 2])
+        self.assertEqual(self.tracker.get_available_uids([0, 1, 2]), [0, 1])
+
+        # Failing UID is retried after backoff, alive UIDs after ttl
+        self.clock.now += 60
+        self.assertEqual(await self.probe({0, 1}), [2])
+
+        self.clock.now += 60
+        self.assertEqual(await self.probe({0, 1}), [])
+
+        # A single successful probe makes the UID available again
+        self.clock.now += 60
+        self.assertEqual(await self.probe({0, 1, 2}), [2])
+        self.assertEqual(self.tracker.get_available_uids([0, 1, 2]), [0, 1, 2])
+
+        self.clock.now += 420
+        self.assertEqual(await self.probe({0, 1, 2}), [0, 1])
+
+    def test_backoff_is_capped(self):
+        backoffs = []
+
+        for _ in range(5):
+            self.tracker.observe(2, False)
+            backoffs.append(self.tracker.records[2].next_probe_at - self.clock.now)
+
+        self.assertEqual(backoffs, [60, 120, 240, 240, 240])
+
+    async def test_only_connection_failures_remove_miners(self):
+        await self.probe({0, 1, 2})
+        self.clock.now += 500
+
+        ok = SimpleNamespace(dendrite=SimpleNamespace(status_code=200))
+        timeout = SimpleNamespace(dendrite=SimpleNamespace(status_code=408))
+        unreachable = SimpleNamespace(dendrite=SimpleNamespace(status_code=503))
+
+        # Slow answers are not liveness failures
+        self.tracker.observe_responses([0, 1, 1], [ok, timeout, timeout])
+        self.assertEqual(self.tracker.get_available_uids([0, 1, 2]), [0, 1, 2])
+
+        self.tracker.observe_responses([1, 2], [unreachable, None])
+        self.assertEqual(self.tracker.get_available_uids([0, 1, 2]), [0])
+
+        # Answered queries postpone the next probe
+        self.clock.now += 100
+        self.assertEqual(self.tracker.get_uids_to_probe([0, 1, 2]), [1, 2])
+
+    def test_reregistered_uid_is_forgotten(self):
+        self.tracker.observe(1, True)
+        self.tracker.resync(["a", "d", "c"])
+
+        self.assertFalse(self.tracker.is_alive(1))
+        self.assertEqual(self.tracker.get_uids_to_probe([1]), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
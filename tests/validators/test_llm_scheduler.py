@@ -0,0 +1,75 @@
+import time
+import asyncio
+import unittest
+from neurons.validators.utils.llm_scheduler import (
+    LLMScheduler,
+    RequestPriority,
+    llm_request_priority,
+)
+
+
+class LLMSchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_organic_requests_are_served_before_synthetic(self):
+        scheduler = LLMScheduler(max_concurrency=1, min_concurrency=1)
+        order = []
+
+        async def request(name):
+            order.append(name)
+            await asyncio.sleep(0.01)
+            return name
+
+        async def submit(name, priority):
+            llm_request_priority.set(priority)
+            return await scheduler.submit(lambda: request(name), estimated_tokens=10)
+
+        tasks = [
+            asyncio.create_task(submit("synthetic_1", RequestPriority.SYNTHETIC)),
+            asyncio.create_task(submit("synthetic_2", RequestPriority.SYNTHETIC)),
+            asyncio.create_task(submit("organic", RequestPriority.ORGANIC)),
+        ]
+        results = await asyncio.gather(*tasks)
+
+        self.assertEqual(results, ["synthetic_1", "synthetic_2", "organic"])
+        self.assertEqual(order, ["synthetic_1", "organic", "synthetic_2"])
+        self.assertEqual(scheduler.get_metrics()["completed"], 3)
+        self.assertEqual(scheduler.active, 0)
+
+    async def test_requests_wait_for_request_budget(self):
+        # Budget of one request per 50ms after the first minute budget is spent
+        scheduler = LLMScheduler(requests_per_minute=1200)
+        scheduler.request_bucket.tokens = 0
+
+        async def request():
+            return time.monotonic()
+
+        start_time = time.monotonic()
+        results = await asyncio.gather(
+            *[scheduler.submit(request, estimated_tokens=1) for _ in range(3)]
+        )
+
+        self.assertGreaterEqual(max(results) - start_time, 0.14)
+
+    async def test_concurrency_is_cut_on_rate_limit(self):
+        scheduler = LLMScheduler(max_concurrency=40, min_concurrency=4)
+        limit = scheduler.concurrency_limit
+
+        scheduler.report_rate_limit()
+        self.assertEqual(scheduler.concurrency_limit, limit / 2)
+
+        # Further errors within the cooldown do not cut the limit again
+        scheduler.report_rate_limit()
+        self.assertEqual(scheduler.concurrency_limit, limit / 2)
+        self.assertEqual(scheduler.rate_limited_count, 2)
+
+    async def test_concurrency_grows_while_latency_is_low(self):
+        scheduler = LLMScheduler(max_concurrency=40, target_latency=1)
+        limit = scheduler.concurrency_limit
+
+        for _ in range(100):
+            scheduler.observe_latency(0.1)
+
+        self.assertGreater(scheduler.concurrency_limit, limit)
+
+
+if __name__ == "__main__":
+    unittest.main()
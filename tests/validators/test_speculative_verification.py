@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+from unittest import mock
+from datura.protocol import ScraperStreamingSynapse
+from neurons.validators.utils import speculative_verification
+from neurons.validators.utils.speculative_verification import SpeculativeTweetVerifier
+from neurons.validators.utils.verification_trust import sample_verification_links
+
+NAME = "twitter_content_relevance"
+
+
+def final_synapse(tweet_ids, status_code=200):
+    synapse = ScraperStreamingSynapse(prompt="test", tools=["Twitter Search"])
+    synapse.dendrite.status_code = status_code
+    synapse.completion_links = [
+        f"https://x.com/user/status/{tweet_id}" for tweet_id in tweet_ids
+    ]
+    return synapse
+
+
+class SpeculativeTweetVerifierTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_verification_samples_are_fetched_in_one_batch(self):
+        with mock.patch.object(
+            speculative_verification,
+            "scrape_tweets_with_retries",
+            mock.AsyncMock(return_value=([], [])),
+        ) as scrape_tweets:
+            verifier = SpeculativeTweetVerifier(NAME, sample_size=2, batch_delay=10)
+            first, second = final_synapse(["1", "2", "3"]), final_synapse(["4"])
+
+            verifier.on_chunk(1, '{"type": "text", "content": "..."}')
+            verifier.on_chunk(1, first)
+            verifier.on_chunk(2, second)
+            verifier.flush()
+            await verifier.tasks[0]
+
+            self.assertEqual(len(verifier.samples[1]), 2)
+            self.assertEqual(verifier.samples[2], ["https://x.com/user/status/4"])
+            self.assertEqual(scrape_tweets.await_count, 1)
+            self.assertEqual(len(scrape_tweets.await_args.args[0]), 3)
+
+        # Verification checks the prefetched sample instead of drawing another one
+        self.assertEqual(
+            sample_verification_links(first, NAME, first.completion_links, 2),
+            verifier.samples[1],
+        )
+
+    async def test_failed_and_linkless_responses_are_not_sampled(self):
+        verifier = SpeculativeTweetVerifier(NAME, sample_size=2)
+
+        verifier.on_chunk(1, final_synapse(["1"], status_code=408))
+        verifier.on_chunk(2, final_synapse([]))
+
+        self.assertEqual(verifier.samples, {})
+        self.assertIsNone(verifier.flush_handle)
+
+    async def test_close_cancels_running_fetches(self):
+        async def scrape_forever(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        with mock.patch.object(
+            speculative_verification, "scrape_tweets_with_retries", scrape_forever
+        ):
+            verifier = SpeculativeTweetVerifier(NAME, sample_size=1, batch_delay=10)
+            verifier.on_chunk(1, final_synapse(["1"]))
+            verifier.flush()
+
+            await verifier.close()
+
+        self.assertTrue(verifier.tasks[0].cancelled())
+        self.assertIsNone(verifier.flush_handle)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import json
+import random
+import unittest
+from neurons.validators.utils.verification_trust import (
+    VerificationTrust,
+    get_sample_average_score,
+)
+
+# Synthetic verification results of 60 rounds per miner: an honest miner, a miner that
+# starts faking tweets after 30 rounds and a miner that fails every fifth round
+SYNTHETIC_HONEST_ROUNDS = [1.0] * 60
+SYNTHETIC_TURNING_ROUNDS = [1.0] * 30 + [1.0, 0.0, 1.0, 0.33] * 7 + [0.0, 1.0]
+SYNTHETIC_FLAKY_ROUNDS = ([1.0] * 4 + [0.66]) * 12
+
+# Per tweet outcomes of miners over 40 rounds, hand-written in the shape of round logs
+ROUNDS_FIXTURE_PATH = os.path.join(
+    os.path.dirname(__file__), "fixtures", "verification_rounds.json"
+)
+
+
+def replay(trust: VerificationTrust, hotkey: str, rounds, amount: int = 3):
+    sample_sizes = []
+
+    for score in rounds:
+        sample_sizes.append(trust.get_sample_size(hotkey, amount))
+        trust.observe(hotkey, score)
+
+    return sample_sizes
+
+
+class VerificationTrustTestCase(unittest.TestCase):
+    def setUp(self):
+        self.trust = VerificationTrust(enabled=True, seed=42)
+
+    def test_new_miners_get_full_sample(self):
+        sample_sizes = replay(self.trust, "honest", SYNTHETIC_HONEST_ROUNDS)
+
+        self.assertEqual(sample_sizes[: self.trust.min_observations], [3] * 10)
+
+    def test_trusted_miner_is_sampled_less_but_never_skipped(self):
+        sample_sizes = replay(self.trust, "honest", SYNTHETIC_HONEST_ROUNDS)
+        trusted_sizes = sample_sizes[30:]
+
+        self.assertLess(sum(trusted_sizes), 3 * len(trusted_sizes) * 0.6)
+        self.assertGreaterEqual(min(sample_sizes), 1)
+        # Random full checks keep happening for trusted miners
+        self.assertIn(3, trusted_sizes)
+
+    def test_failing_miner_returns_to_full_sample(self):
+        sample_sizes = replay(self.trust, "turning", SYNTHETIC_TURNING_ROUNDS)
+
+        self.assertFalse(self.trust.is_trusted("turning"))
+        self.assertEqual(sample_sizes[33:], [3] * len(sample_sizes[33:]))
+
+    def test_flaky_miner_is_never_trusted(self):
+        sample_sizes = replay(self.trust, "flaky", SYNTHETIC_FLAKY_ROUNDS)
+
+        self.assertEqual(sample_sizes, [3] * len(SYNTHETIC_FLAKY_ROUNDS))
+
+    def test_disabled_policy_keeps_full_sample(self):
+        trust = VerificationTrust(enabled=False)
+
+        self.assertEqual(replay(trust, "honest", SYNTHETIC_HONEST_ROUNDS), [3] * 60)
+
+
+class VerificationRoundsTestCase(unittest.TestCase):
+    """Compares scores of the drawn samples with scores of the full samples."""
+
+    def setUp(self):
+        with open(ROUNDS_FIXTURE_PATH) as f:
+            fixture = json.load(f)
+
+        self.amount = fixture["amount"]
+        self.rounds = fixture["rounds"]
+        self.trust = VerificationTrust(enabled=True, seed=42)
+        self.random = random.Random(7)
+
+    def replay(self):
+        errors = {hotkey: [] for hotkey in self.rounds[0]}
+        sample_sizes = {hotkey: [] for hotkey in self.rounds[0]}
+
+        for miners in self.rounds:
+            for hotkey, outcomes in miners.items():
+                items = [int(outcome) for outcome in outcomes]
+                sample_size = self.trust.get_sample_size(hotkey, self.amount)
+                sample = self.random.sample(items, sample_size)
+
+                score = get_sample_average_score(
+                    sum(sample), len(sample), self.amount, sample_size / self.amount
+                )
+                errors[hotkey].append(abs(score - sum(items) / len(items)))
+                sample_sizes[hotkey].append(sample_size)
+                self.trust.observe(hotkey, sum(sample) / len(sample))
+
+        return errors, sample_sizes
+
+    def test_score_error_of_reduced_samples_is_bounded(self):
+        errors, sample_sizes = self.replay()
+        all_errors = [
+            error for miner_errors in errors.values() for error in miner_errors
+        ]
+
+        # Reduced samples are actually drawn, otherwise the bound says nothing
+        self.assertLess(sum(sample_sizes["honest"]), self.amount * len(self.rounds))
+        self.assertEqual(errors["honest"], [0] * len(self.rounds))
+        self.assertLessEqual(sum(all_errors) / len(all_errors), 0.02)
+        for hotkey, miner_errors in errors.items():
+            self.assertLessEqual(sum(miner_errors) / len(miner_errors), 0.05, hotkey)
+
+    def test_faking_miners_return_to_full_sample(self):
+        _, sample_sizes = self.replay()
+
+        self.assertFalse(self.trust.is_trusted("turning"))
+        self.assertEqual(sample_sizes["turning"][27:], [3] * 13)
+        self.assertEqual(sample_sizes["flaky"], [3] * len(self.rounds))
+
+
+class SampleAverageScoreTestCase(unittest.TestCase):
+    def test_full_sample(self):
+        self.assertEqual(get_sample_average_score(6, 3, 10, 1.0), 0.6)
+        self.assertEqual(get_sample_average_score(6, 12, 10, 1.0), 0.5)
+
+    def test_reduced_sample_counts_as_full_sample(self):
+        # Twitter and search models scale the same way
+        self.assertAlmostEqual(get_sample_average_score(1.5, 2, 10, 0.2), 0.75)
+        self.assertAlmostEqual(get_sample_average_score(1.5, 1, 10, 0.2), 0.75)
+        self.assertAlmostEqual(get_sample_average_score(3, 4, 10, 0.2), 0.75)
+
+
+if __name__ == "__main__":
+    unittest.main()